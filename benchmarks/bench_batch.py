@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+배치(time x symbol) 지표 계산 벤치마크 (합성 OHLCV, 파일/네트워크 없음)
+
+- 합성 랜덤워크 1s OHLCV 를 심볼 N 개 x 행 R 개 생성 (--gap-symbols 개는 임의 행을 빼서 공백 생성)
+- 비교 대상
+  1) 심볼별 경로: 심볼마다 run_pandasta_on_polars(전체 스펙)
+  2) 배치 경로 : verify_kernels(1회) + run_batched_on_polars(전 심볼)
+- 출력: 스펙 커버리지(커널 가능 / 검증 통과 / pandas-ta 경로), 경로별 시간(min/median, 초)과 속도비,
+  커널 kind 별 1회 계산 시간(배치 경로에서 아직 비싼 부분 확인용), 두 경로 결과 일치 여부
+
+사용 예)
+  python benchmarks/bench_batch.py --symbols 14 --rows 90000 --repeat 3
+  python benchmarks/bench_batch.py --symbols 4 --rows 20000 --gap-symbols 1 --repeat 1
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np   # noqa: E402
+import polars as pl  # noqa: E402
+
+from features.strategies_all import full_ohlcv_specs  # noqa: E402
+from features.ta_bridge import run_pandasta_on_polars  # noqa: E402
+from features.batch_bridge import (  # noqa: E402
+    KERNELS, kernel_for, verify_kernels, run_batched_on_polars, time_groups, stack_frames,
+)
+
+
+def synth_ohlcv(rows: int, seed: int, drop: float = 0.0) -> pl.DataFrame:
+    """랜덤워크 1s OHLCV. drop > 0 이면 그 비율만큼 행을 빼서 시간 공백 생성"""
+    rng = np.random.default_rng(seed)
+    t = 1_700_000_000_000 + np.arange(rows, dtype=np.int64) * 1000
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 2e-4, rows)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 1e-4, rows)) * close
+    df = pl.DataFrame({
+        "open_time": t,
+        "open": open_, "high": np.maximum(open_, close) + spread, "low": np.minimum(open_, close) - spread,
+        "close": close, "volume": rng.gamma(2.0, 5.0, rows),
+    })
+    if drop > 0:
+        df = df.filter(pl.Series(rng.random(rows) >= drop))
+    return df
+
+
+def timed(fn, repeat: int):
+    out, res = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = fn()
+        out.append(time.perf_counter() - t0)
+    return out, res
+
+
+def kind_times(frames: dict, ta_list: list, kernel_ok: set) -> dict:
+    """커널 kind 별 1회 계산 시간(초) 합계"""
+    out = {}
+    for syms in time_groups(frames):
+        stacked = stack_frames({s: frames[s] for s in syms})
+        for i in sorted(kernel_ok):
+            spec = ta_list[i]
+            t0 = time.perf_counter()
+            kernel_for(spec)(stacked, spec)
+            out[spec["kind"]] = out.get(spec["kind"], 0.0) + time.perf_counter() - t0
+    return out
+
+
+def max_abs_diff(a: dict, b: dict) -> float:
+    worst = 0.0
+    for s in a:
+        if a[s].columns != b[s].columns:
+            return float("inf")
+        for c in a[s].columns:
+            if not a[s][c].dtype.is_numeric():
+                continue
+            x = a[s][c].cast(pl.Float64).to_numpy()
+            y = b[s][c].cast(pl.Float64).to_numpy()
+            if not np.array_equal(np.isnan(x), np.isnan(y)):
+                return float("inf")
+            m = ~np.isnan(x)
+            if m.any():
+                worst = max(worst, float(np.max(np.abs(x[m] - y[m]) / np.maximum(1.0, np.abs(x[m])))))
+    return worst
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Per-symbol vs batched (time x symbol) indicator benchmark")
+    ap.add_argument("--symbols", type=int, default=14, help="합성 심볼 수")
+    ap.add_argument("--rows", type=int, default=90000, help="심볼당 행 수(1일 86400 + 워밍업 정도)")
+    ap.add_argument("--gap-symbols", type=int, default=0, help="행 일부를 빼서 공백을 만들 심볼 수")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--skip-single", action="store_true", help="심볼별 경로 측정 생략(커버리지/커널 시간만)")
+    args = ap.parse_args(argv)
+
+    name, ta_list = full_ohlcv_specs()
+    frames = {f"SYM{j:02d}": synth_ohlcv(args.rows, seed=j, drop=(0.001 if j < args.gap_symbols else 0.0))
+              for j in range(args.symbols)}
+
+    t0 = time.perf_counter()
+    kernel_ok = verify_kernels(next(iter(frames.values())), ta_list)
+    t_verify = time.perf_counter() - t0
+    n_kernel = sum(1 for s in ta_list if kernel_for(s) is not None)
+    rejected = sorted({ta_list[i]["kind"] for i, s in enumerate(ta_list)
+                       if kernel_for(s) is not None and i not in kernel_ok})
+    print(f"specs={len(ta_list)}  kernel kinds={len(KERNELS)}  kernel-capable specs={n_kernel}  "
+          f"verified={len(kernel_ok)}  per-symbol pandas-ta={len(ta_list) - len(kernel_ok)}  "
+          f"verify={t_verify:.2f}s")
+    if rejected:
+        print(f"  kernels rejected by verification (pandas-ta path): {','.join(rejected)}")
+    print(f"symbols={args.symbols} rows={args.rows} time groups={len(time_groups(frames))}")
+
+    bt, batched = timed(lambda: run_batched_on_polars(frames, ta_list, name=name, kernel_ok=kernel_ok), args.repeat)
+    print(f"batched     min={min(bt):8.2f}s  median={statistics.median(bt):8.2f}s")
+
+    kt = kind_times(frames, ta_list, kernel_ok)
+    top = sorted(kt.items(), key=lambda kv: -kv[1])[:10]
+    print("  kernel time by kind: " + "  ".join(f"{k}={v:.2f}s" for k, v in top))
+
+    if args.skip_single:
+        return 0
+    st, single = timed(lambda: {s: run_pandasta_on_polars(df, ta_list=ta_list, name=name)
+                                for s, df in frames.items()}, args.repeat)
+    print(f"per-symbol  min={min(st):8.2f}s  median={statistics.median(st):8.2f}s  "
+          f"speedup={statistics.median(st) / statistics.median(bt):.2f}x")
+
+    diff = max_abs_diff(single, batched)
+    print(f"max rel diff batched vs per-symbol: {diff:.3g}" + ("  (MISMATCH)" if diff > 1e-9 else ""))
+    return 0 if diff <= 1e-9 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
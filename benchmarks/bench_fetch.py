@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+fetch 처리량 부하 벤치마크 (로컬 mock 서버 사용, 실제 API 호출 없음)
+
+- benchmarks/mock_binance.py 서버를 이 프로세스 안에서 띄우고
+- python -m quant_pipeline fetch 를 동시성 N 개의 프로세스로 실행(심볼을 N 묶음으로 분할,
+  같은 --weight-state 파일로 weight 예산 공유)
+- 동시성 설정마다: wall time, 요청 수/초, 행 수/초, 429/418/500, 재시도, rate-limit 대기 시간 출력
+  (클라이언트 수치는 각 프로세스의 --metrics-jsonl summary 이벤트, 서버 수치는 mock 통계)
+
+사용 예)
+  python benchmarks/bench_fetch.py --symbols 4 --days 2 --concurrency 1,2,4
+  python benchmarks/bench_fetch.py --symbols 8 --days 1 --concurrency 4 --p429 0.02 --latency-ms 30 ^
+    --weight-limit 1200 --weight 1000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from datetime import date, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_binance import MockBinance, add_fault_args, config_from_args  # noqa: E402
+
+FAVORITES = ["BTCUSDT", "ETHUSDT", "XRPUSDT", "SOLUSDT", "BNBUSDT", "DOGEUSDT", "TRXUSDT",
+             "ADAUSDT", "LINKUSDT", "AVAXUSDT", "XLMUSDT", "BCHUSDT", "LTCUSDT", "DOTUSDT"]
+
+
+def read_summaries(paths: list) -> dict:
+    """각 jsonl의 summary 이벤트 카운터 합산 → {counter: 합계}"""
+    tot = {}
+    for p in paths:
+        if not os.path.exists(p):
+            continue
+        with open(p, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec.get("event") != "summary":
+                    continue
+                for name, series in rec.get("counters", {}).items():
+                    for labels, v in series.items():
+                        key = name
+                        if name == "klines_requests_total":
+                            st = dict(kv.split("=", 1) for kv in labels.split(",") if "=" in kv).get("status", "?")
+                            key = f"{name}[{st}]"
+                        tot[key] = tot.get(key, 0) + v
+    return tot
+
+
+def run_case(url: str, symbols: list, start: date, end: date, conc: int, args, base: str) -> dict:
+    out_root = os.path.join(base, f"ohlcv_c{conc}")
+    state = os.path.join(base, f"weight_c{conc}.json")
+    groups = [symbols[i::conc] for i in range(conc)]
+    groups = [g for g in groups if g]
+    now = (end + timedelta(days=1)).isoformat() + "T12:00:00Z"
+
+    procs, metrics = [], []
+    t0 = time.perf_counter()
+    for i, g in enumerate(groups):
+        m = os.path.join(base, f"metrics_c{conc}_{i}.jsonl")
+        metrics.append(m)
+        cmd = [sys.executable, "-m", "quant_pipeline", "fetch",
+               "--symbols", ",".join(g), "--interval", args.interval,
+               "--start", start.isoformat(), "--end", end.isoformat(), "--now", now,
+               "--out", out_root, "--granularity", args.interval, "--limit", str(args.limit),
+               "--weight", str(args.weight), "--weight-state", state,
+               "--api-base", url, "--metrics-jsonl", m]
+        procs.append(subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL,
+                                      stderr=(None if args.verbose else subprocess.DEVNULL)))
+    rcs = [p.wait() for p in procs]
+    wall = time.perf_counter() - t0
+
+    c = read_summaries(metrics)
+    reqs = sum(v for k, v in c.items() if k.startswith("klines_requests_total["))
+    rows = c.get("klines_rows_total", 0)
+    return {
+        "conc": conc, "wall": wall, "rc": max(rcs) if rcs else 0,
+        "requests": reqs, "req_s": reqs / wall if wall else 0.0,
+        "rows": rows, "rows_s": rows / wall if wall else 0.0,
+        "r429": c.get("klines_requests_total[429]", 0), "r418": c.get("klines_requests_total[418]", 0),
+        "r500": c.get("klines_requests_total[500]", 0), "retries": c.get("klines_retries_total", 0),
+        "wait_s": c.get("rate_limit_wait_seconds_total", 0.0) + c.get("rate_limit_pause_seconds_total", 0.0),
+        "days": c.get("fetch_days_total", 0),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fetch throughput benchmark against a local mock Binance server")
+    ap.add_argument("--symbols", type=str, default="4", help="심볼 수(즐겨찾기 앞에서부터) 또는 콤마 구분 목록")
+    ap.add_argument("--days", type=int, default=1, help="심볼당 날짜 수")
+    ap.add_argument("--start", type=str, default="2024-10-01", help="시작일 YYYY-MM-DD")
+    ap.add_argument("--interval", type=str, default="1s")
+    ap.add_argument("--limit", type=int, default=1000, help="klines page size")
+    ap.add_argument("--weight", type=int, default=5000, help="클라이언트 분당 weight 목표")
+    ap.add_argument("--concurrency", type=str, default="1,2,4", help="동시 프로세스 수 목록")
+    ap.add_argument("--verbose", action="store_true", help="fetch 프로세스 stderr 표시")
+    add_fault_args(ap)
+    args = ap.parse_args(argv)
+
+    if args.symbols.isdigit():
+        symbols = FAVORITES[:max(1, int(args.symbols))]
+    else:
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    start = date.fromisoformat(args.start)
+    end = start + timedelta(days=max(1, args.days) - 1)
+    concs = [int(x) for x in args.concurrency.split(",") if x.strip()]
+
+    print(f"[bench] symbols={len(symbols)} days={args.days} interval={args.interval} "
+          f"server_weight_limit={args.weight_limit} client_weight={args.weight} "
+          f"faults(p429={args.p429}, p418={args.p418}, p500={args.p500}, latency={args.latency_ms}ms)")
+    hdr = f"{'conc':>4} {'wall_s':>8} {'reqs':>7} {'req/s':>8} {'rows/s':>10} {'429':>5} {'418':>5} {'500':>5} {'retry':>6} {'wait_s':>7} {'rc':>3}"
+    print(hdr)
+    with tempfile.TemporaryDirectory(prefix="qp-bench-fetch-") as base:
+        for conc in concs:
+            srv = MockBinance(config_from_args(args))
+            url = srv.start()
+            try:
+                r = run_case(url, symbols, start, end, conc, args, base)
+            finally:
+                srv.stop()
+            s = srv.stats()
+            print(f"{r['conc']:>4} {r['wall']:>8.2f} {r['requests']:>7} {r['req_s']:>8.1f} {r['rows_s']:>10.0f} "
+                  f"{r['r429']:>5} {r['r418']:>5} {r['r500']:>5} {r['retries']:>6} {r['wait_s']:>7.1f} {r['rc']:>3}"
+                  f"   server={s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CLI 기동 시간 벤치마크 (python -m quant_pipeline ...)
+
+- 임시 폴더에 즐겨찾기 14종 x N일의 입력/출력 자리표시 파일 생성
+  (스킵 판단은 파일 존재만 보므로 내용은 비어 있어도 됨)
+- 측정 대상
+  1) --help
+  2) features : 모든 결과가 있는 "할 일 없음" 실행
+  3) fetch    : 모든 날짜 파일이 있는 "할 일 없음" 실행
+- 각 케이스를 새 인터프리터로 --repeat 회 실행, min/median(ms) 출력
+- 할 일 없는 실행에서 polars/pandas/pandas_ta 가 import 되었는지도 확인
+
+사용 예)
+  python benchmarks/bench_startup.py --days 30 --repeat 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import date, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+FAVORITES = ["BTCUSDT", "ETHUSDT", "XRPUSDT", "SOLUSDT", "BNBUSDT", "DOGEUSDT", "TRXUSDT",
+             "ADAUSDT", "LINKUSDT", "AVAXUSDT", "XLMUSDT", "BCHUSDT", "LTCUSDT", "DOTUSDT"]
+HEAVY = ("polars", "pandas", "pandas_ta", "requests")
+
+
+def make_tree(base: str, days: int, start: date):
+    in_root = os.path.join(base, "ohlcv")
+    out_root = os.path.join(base, "features_all")
+    for sym in FAVORITES:
+        for root in (in_root, out_root):
+            d = os.path.join(root, sym, "1s")
+            os.makedirs(d, exist_ok=True)
+            for i in range(days):
+                open(os.path.join(d, f"{(start + timedelta(days=i)).isoformat()}.parquet"), "wb").close()
+    return in_root, out_root
+
+
+def time_cmd(argv: list, repeat: int):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "quant_pipeline", *argv], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        out.append((time.perf_counter() - t0) * 1000.0)
+    return out
+
+
+def heavy_imports(argv: list):
+    """같은 argv로 in-process 실행 후 로드된 무거운 모듈 목록"""
+    code = (
+        "import sys, io, contextlib\n"
+        "from quant_pipeline.cli import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        f"    main({argv!r})\n"
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))\n"
+    )
+    r = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    return r.stdout.strip().splitlines()[-1] if r.stdout.strip() else ""
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark quant-pipeline CLI startup / no-op runs")
+    ap.add_argument("--days", type=int, default=30, help="자리표시 파일 날짜 수(심볼당)")
+    ap.add_argument("--repeat", type=int, default=5, help="케이스별 반복 횟수")
+    args = ap.parse_args(argv)
+
+    start = date(2024, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+    symbols = ",".join(FAVORITES)
+    with tempfile.TemporaryDirectory(prefix="qp-bench-") as base:
+        in_root, out_root = make_tree(base, args.days, start)
+        cases = {
+            "help": ["--help"],
+            "features (no-op)": ["features", "--symbols", symbols, "--granularity", "1s",
+                                 "--in-root", in_root, "--out-root", out_root, "--with-custom"],
+            "fetch (no-op)": ["fetch", "--symbols", symbols, "--start", start.isoformat(),
+                              "--end", end.isoformat(), "--out", in_root, "--granularity", "1s",
+                              "--weight-state", ""],
+        }
+        print(f"[bench] symbols={len(FAVORITES)} days={args.days} repeat={args.repeat}")
+        for name, cmd in cases.items():
+            ts = time_cmd(cmd, args.repeat)
+            line = f"[bench] {name:<18s} min={min(ts):8.1f}ms  median={statistics.median(ts):8.1f}ms"
+            if name != "help":
+                line += f"  heavy_imports=[{heavy_imports(cmd)}]"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+로컬 Binance /api/v3/klines 대역 서버 (벤치마크/회귀 테스트용, 표준 라이브러리만 사용)
+
+- 페이징: startTime / endTime / limit(기본 500, 최대 1000) 를 Binance와 같은 규칙으로 처리
+  * startTime 있음 → openTime >= startTime 부터 오름차순 limit 개 (endTime 이 있으면 openTime <= endTime)
+  * endTime 만 있음 → endTime 이하의 마지막 limit 개
+  * 둘 다 없음 → 현재 시각 기준 마지막 limit 개
+- 데이터: 심볼/시각으로 결정되는 합성 캔들(재실행해도 동일) 또는 --data-root 의 기록된 일자 parquet
+- 상장일: --listing SYMBOL=YYYY-MM-DD 이전 구간은 빈 응답. --data-root 모드에서는 기록된 첫 봉이 상장 시점
+  (startTime=0 → 첫 기록 봉부터, 첫 기록 봉 이전만 덮는 구간 → 빈 응답: 수집기의 상장일 보정 경로가 실제로 동작)
+- weight: 요청마다 weight(기본 2)를 분 단위 창으로 누적해 X-MBX-USED-WEIGHT-1M 헤더로 응답,
+  한도(--weight-limit) 초과 시 429 + Retry-After, 429 이후에도 계속 요청하면 418(ban) + Retry-After
+- 장애 주입: --p429 / --p418 / --p500 확률, --latency-ms / --jitter-ms 지연
+
+단독 실행:
+  python benchmarks/mock_binance.py --port 8765 --p429 0.01 --latency-ms 20
+  python -m quant_pipeline fetch --symbols BTCUSDT --start 2024-10-01 --end 2024-10-02 ^
+    --api-base http://127.0.0.1:8765 --out tmp\\ohlcv --weight-state ""
+
+코드에서:
+  srv = MockBinance(MockConfig(p429=0.01)); url = srv.start(); ...; srv.stop(); srv.stats()
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import random
+import argparse
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+KLINES_PATH = "/api/v3/klines"
+STATS_PATH = "/__stats"
+EARLIEST_MS = 1500000000000  # 2017-07-14, 합성 데이터의 기본 시작점
+
+_INTERVAL_UNITS = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 7 * 86_400_000}
+
+
+def interval_to_ms(interval: str) -> int:
+    iv = interval.strip().lower()
+    if not iv or iv[-1] not in _INTERVAL_UNITS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(iv[:-1]) * _INTERVAL_UNITS[iv[-1]]
+
+
+def _mix(x: int) -> int:
+    """splitmix64 계열 정수 해시 (결정적 의사난수)"""
+    x = (x + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return x ^ (x >> 31)
+
+
+def _u01(x: int) -> float:
+    return (_mix(x) >> 11) / float(1 << 53)
+
+
+@dataclass
+class MockConfig:
+    weight_limit: int = 6000          # 분당 used-weight 한도
+    request_weight: int = 2           # klines 요청당 weight
+    ban_after: int = 5                # 429 상태에서 이 횟수 넘게 요청하면 418
+    ban_seconds: float = 10.0         # 418 Retry-After
+    p429: float = 0.0                 # 무작위 429 확률 (Retry-After 1초)
+    p418: float = 0.0                 # 무작위 418 확률
+    p500: float = 0.0                 # 무작위 500 확률
+    latency_ms: float = 0.0           # 고정 지연
+    jitter_ms: float = 0.0            # 추가 지연(0~jitter 균등)
+    gap_rate: float = 0.0             # 거래 없는(응답에서 빠지는) 봉 비율
+    listing: dict = field(default_factory=dict)   # {SYMBOL: listing ms}
+    data_root: str = None             # 기록된 parquet 루트 (data/ohlcv/binance-spot)
+    granularity: str = "1s"
+    seed: int = 7
+
+
+class _State:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.window = None      # 현재 분(epoch // 60)
+        self.used = 0
+        self.over_count = 0     # 한도 초과 후 들어온 요청 수
+        self.banned_until = 0.0
+        self.counts = {"requests": 0, "ok": 0, "rows": 0, "429": 0, "418": 0, "500": 0}
+
+
+class MockBinance:
+    def __init__(self, cfg: MockConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.cfg = cfg or MockConfig()
+        self.state = _State()
+        self.rng = random.Random(self.cfg.seed)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    # --- lifecycle ---
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-binance", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> dict:
+        with self.state.lock:
+            return dict(self.state.counts)
+
+    # --- data ---
+    def _listing_ms(self, symbol: str) -> int:
+        first = int(self.cfg.listing.get(symbol, EARLIEST_MS))
+        if self.cfg.data_root:
+            # 기록된 첫 봉 = 상장 시점. 기록이 없으면 모든 구간이 빈 응답이 되도록 먼 미래
+            recorded = 1 << 62
+            for d in self._recorded_days(symbol):
+                rows = self._recorded_day(symbol, d)
+                if rows:
+                    recorded = rows[0][0]
+                    break
+            first = max(first, recorded)
+        return first
+
+    def _recorded_days(self, symbol: str) -> list:
+        """--data-root 에 기록된 일자(UTC 자정 ms) 오름차순 (심볼별 캐시)"""
+        key = (symbol, "days")
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+        d = os.path.join(self.cfg.data_root, symbol, self.cfg.granularity)
+        days = []
+        for fn in (os.listdir(d) if os.path.isdir(d) else []):
+            name, ext = os.path.splitext(fn)
+            if ext != ".parquet":
+                continue
+            try:
+                dt = datetime.strptime(name, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            days.append(int(dt.timestamp() * 1000))
+        days.sort()
+        with self._cache_lock:
+            self._cache[key] = days
+        return days
+
+    def _synthetic_row(self, symbol: str, ot: int, iv: int):
+        sid = sum(ord(c) * 131 ** i for i, c in enumerate(symbol)) & 0xFFFFFFFF
+        step = ot // iv
+        if self.cfg.gap_rate > 0 and _u01(step * 1_000_003 + sid) < self.cfg.gap_rate:
+            return None
+        base = 10.0 + (sid % 50000)
+        # 완만한 추세 + 결정적 잡음
+        mid = base * (1.0 + 0.05 * math.sin(ot / 86_400_000.0 * 2 * math.pi)) * (1.0 + 0.001 * (_u01(step ^ sid) - 0.5))
+        o = mid * (1.0 + 0.0002 * (_u01(step * 3 + sid) - 0.5))
+        c = mid * (1.0 + 0.0002 * (_u01(step * 5 + sid) - 0.5))
+        h = max(o, c) * (1.0 + 0.0001 * _u01(step * 7 + sid))
+        lo = min(o, c) * (1.0 - 0.0001 * _u01(step * 11 + sid))
+        vol = 0.001 + 5.0 * _u01(step * 13 + sid) ** 3
+        tb = vol * _u01(step * 17 + sid)
+        n = 1 + int(50 * _u01(step * 19 + sid))
+        return [ot, f"{o:.8f}", f"{h:.8f}", f"{lo:.8f}", f"{c:.8f}", f"{vol:.8f}", ot + iv - 1,
+                f"{vol * mid:.8f}", n, f"{tb:.8f}", f"{tb * mid:.8f}", "0"]
+
+    def _recorded_day(self, symbol: str, day_ms: int):
+        """기록된 일자 parquet → kline 리스트 (심볼/일자별 캐시)"""
+        key = (symbol, day_ms)
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+        import polars as pl
+        ymd = datetime.fromtimestamp(day_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        path = os.path.join(self.cfg.data_root, symbol, self.cfg.granularity, f"{ymd}.parquet")
+        rows = []
+        if os.path.exists(path):
+            df = pl.read_parquet(path).sort("open_time")
+            for r in df.iter_rows(named=True):
+                rows.append([int(r["open_time"]), str(r["open"]), str(r["high"]), str(r["low"]),
+                             str(r["close"]), str(r["volume"]), int(r["close_time"]),
+                             str(r["quote_volume"]), int(r["num_trades"]), str(r["taker_buy_base"]),
+                             str(r["taker_buy_quote"]), "0"])
+        with self._cache_lock:
+            self._cache[key] = rows
+        return rows
+
+    def klines(self, symbol: str, interval: str, start_ms, end_ms, limit: int):
+        iv = interval_to_ms(interval)
+        limit = max(1, min(int(limit), 1000))
+        first = self._listing_ms(symbol)
+        now_ms = int(time.time() * 1000)
+        last_open = (now_ms // iv) * iv
+        if end_ms is not None:
+            last_open = min(last_open, (int(end_ms) // iv) * iv)
+
+        if start_ms is None:
+            # 끝에서부터 limit 개
+            lo = max(first, last_open - (limit - 1) * iv)
+            lo = ((lo + iv - 1) // iv) * iv
+            cands = range(lo, last_open + 1, iv)
+        else:
+            lo = max(int(start_ms), first)
+            lo = ((lo + iv - 1) // iv) * iv
+            cands = range(lo, last_open + 1, iv)
+
+        out = []
+        if self.cfg.data_root:
+            # 기록된 날짜만 순회 (첫 기록 이전/기록 사이 공백 날짜는 건너뜀)
+            d0 = (cands.start // 86_400_000) * 86_400_000
+            for d in (self._recorded_days(symbol) if len(cands) else []):
+                if d < d0:
+                    continue
+                if d > last_open or len(out) >= limit:
+                    break
+                for r in self._recorded_day(symbol, d):
+                    if r[0] >= cands.start and r[0] <= last_open:
+                        out.append(r)
+                        if len(out) >= limit:
+                            break
+            return out[-limit:] if start_ms is None else out
+
+        for ot in cands:
+            r = self._synthetic_row(symbol, ot, iv)
+            if r is not None:
+                out.append(r)
+                if start_ms is not None and len(out) >= limit:
+                    break
+        return out[-limit:]
+
+    # --- rate limit / faults ---
+    def _admit(self):
+        """반환: (status, headers). status=200 이면 정상 처리"""
+        cfg, st = self.cfg, self.state
+        now = time.time()
+        with st.lock:
+            st.counts["requests"] += 1
+            w = int(now // 60)
+            if st.window != w:
+                st.window, st.used, st.over_count = w, 0, 0
+            st.used += cfg.request_weight
+            used = st.used
+            hdr = {"X-MBX-USED-WEIGHT-1M": str(used)}
+            retry_next_min = str(max(1, int(math.ceil((w + 1) * 60 - now))))
+
+            if st.banned_until > now:
+                st.counts["418"] += 1
+                return 418, {**hdr, "Retry-After": str(int(math.ceil(st.banned_until - now)))}
+            if used > cfg.weight_limit:
+                st.over_count += 1
+                if st.over_count > cfg.ban_after:
+                    st.banned_until = now + cfg.ban_seconds
+                    st.counts["418"] += 1
+                    return 418, {**hdr, "Retry-After": str(int(math.ceil(cfg.ban_seconds)))}
+                st.counts["429"] += 1
+                return 429, {**hdr, "Retry-After": retry_next_min}
+
+            x = self.rng.random()
+            if x < cfg.p418:
+                st.counts["418"] += 1
+                return 418, {**hdr, "Retry-After": str(int(math.ceil(cfg.ban_seconds)))}
+            if x < cfg.p418 + cfg.p429:
+                st.counts["429"] += 1
+                return 429, {**hdr, "Retry-After": "1"}
+            if x < cfg.p418 + cfg.p429 + cfg.p500:
+                st.counts["500"] += 1
+                return 500, hdr
+            return 200, hdr
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, fmt, *args):  # 조용히
+                pass
+
+            def _send(self, status: int, body: bytes, headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                if u.path == STATS_PATH:
+                    self._send(200, json.dumps(mock.stats()).encode())
+                    return
+                if u.path != KLINES_PATH:
+                    self._send(404, b'{"code":-1,"msg":"not found"}')
+                    return
+
+                cfg = mock.cfg
+                delay = cfg.latency_ms + (mock.rng.random() * cfg.jitter_ms if cfg.jitter_ms else 0.0)
+                if delay > 0:
+                    time.sleep(delay / 1000.0)
+
+                status, headers = mock._admit()
+                if status != 200:
+                    self._send(status, json.dumps({"code": -1003, "msg": f"mock {status}"}).encode(), headers)
+                    return
+
+                q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+                try:
+                    symbol = q["symbol"].upper()
+                    rows = mock.klines(symbol, q.get("interval", "1m"),
+                                       int(q["startTime"]) if "startTime" in q else None,
+                                       int(q["endTime"]) if "endTime" in q else None,
+                                       int(q.get("limit", 500)))
+                except (KeyError, ValueError) as e:
+                    self._send(400, json.dumps({"code": -1100, "msg": str(e)}).encode(), headers)
+                    return
+                with mock.state.lock:
+                    mock.state.counts["ok"] += 1
+                    mock.state.counts["rows"] += len(rows)
+                self._send(200, json.dumps(rows, separators=(",", ":")).encode(), headers)
+
+        return Handler
+
+
+def parse_listing(items) -> dict:
+    """['BTCUSDT=2019-01-01', ...] -> {symbol: ms}"""
+    out = {}
+    for it in items or []:
+        sym, _, ymd = it.partition("=")
+        d = datetime.strptime(ymd.strip(), "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        out[sym.strip().upper()] = int(d.timestamp() * 1000)
+    return out
+
+
+def add_fault_args(ap: argparse.ArgumentParser):
+    ap.add_argument("--weight-limit", type=int, default=6000, help="서버 분당 weight 한도")
+    ap.add_argument("--ban-after", type=int, default=5, help="429 이후 추가 요청 허용 수(초과 시 418)")
+    ap.add_argument("--ban-seconds", type=float, default=10.0, help="418 Retry-After(초)")
+    ap.add_argument("--p429", type=float, default=0.0, help="무작위 429 확률")
+    ap.add_argument("--p418", type=float, default=0.0, help="무작위 418 확률")
+    ap.add_argument("--p500", type=float, default=0.0, help="무작위 500 확률")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="응답 고정 지연(ms)")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="응답 추가 지연 상한(ms)")
+    ap.add_argument("--gap-rate", type=float, default=0.0, help="합성 데이터의 빈 봉 비율")
+    ap.add_argument("--listing", action="append", default=[], help="SYMBOL=YYYY-MM-DD 상장일 (반복 가능)")
+    ap.add_argument("--data-root", type=str, default=None, help="기록된 parquet 루트(미지정 시 합성 데이터)")
+    ap.add_argument("--granularity", type=str, default="1s", help="--data-root 하위 폴더명")
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(weight_limit=args.weight_limit, ban_after=args.ban_after, ban_seconds=args.ban_seconds,
+                      p429=args.p429, p418=args.p418, p500=args.p500,
+                      latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, gap_rate=args.gap_rate,
+                      listing=parse_listing(args.listing), data_root=args.data_root,
+                      granularity=args.granularity)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local mock of Binance /api/v3/klines with weight headers and fault injection")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_fault_args(ap)
+    args = ap.parse_args(argv)
+
+    srv = MockBinance(config_from_args(args), host=args.host, port=args.port)
+    print(f"[mock] serving {srv.url}{KLINES_PATH}  (stats: {srv.url}{STATS_PATH})")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[mock] stats={srv.stats()}")
+    finally:
+        srv.httpd.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
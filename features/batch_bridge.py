@@ -0,0 +1,533 @@
+# features/batch_bridge.py
+"""
+여러 심볼의 같은 날짜를 (time x symbol) 2-D 로 쌓아 지표를 한 번에 계산
+
+- open_time 열이 같은 심볼끼리 한 행렬로 묶음(행 = 같은 시각). 공백/상장 시점이 달라 시각이 다른
+  심볼은 따로 묶음 → 패딩 없이 단일 심볼 경로와 같은 행 의미
+- 2-D 커널이 있는 kind: 열=심볼인 pandas DataFrame 의 rolling/ewm/산술, 창 함수형 지표
+  (WMA/HMA/LINREG/CTI/CG/MAD/CCI: pandas-ta 의 rolling.apply)는 sliding window 행렬 연산으로 계산
+- 나머지 kind(상태형/복합: PSAR, QQE, SUPERTREND, ICHIMOKU, KC, STOCH 등): 심볼별 pandas-ta
+  (run_pandasta_on_polars). 커버리지/처리량은 benchmarks/bench_batch.py 로 측정
+- 커널 결과는 실행 초기에 pandas-ta 결과와 한 번 비교(verify_kernels)
+  → 컬럼명/값이 다르면(예: TA-Lib 사용, 버전 차이) 그 스펙은 pandas-ta 경로로 처리
+- 심볼별 결과 컬럼 순서/값은 단일 심볼 경로(run_pandasta_on_polars)와 동일
+"""
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from features.ta_bridge import run_pandasta_on_polars
+
+try:  # pandas-ta 내부 커널(버전에 따라 없을 수 있음 → rolling.mean, 차이는 verify_kernels 가 걸러냄)
+    from pandas_ta.overlap.sma import nb_sma as _nb_sma
+except ImportError:
+    _nb_sma = None
+
+BASE_FIELDS = ("open", "high", "low", "close", "volume")
+_CHUNK_ELEMS = 1 << 24  # sliding window 청크 원소 수 상한(float64 128MB)
+
+
+# ---------- 2-D kernels: (frames, spec) -> [(컬럼명, 2-D ndarray)] ----------
+# frames: {"open"/"high"/"low"/"close"/"volume": DataFrame(행=시간 위치, 열=심볼)}
+
+def _sma(x: pd.DataFrame, n: int) -> pd.DataFrame:
+    """
+    pandas-ta sma 와 비트 단위로 같은 값: 열마다 pandas-ta 의 numba 컨볼루션 커널(nb_sma) 사용
+    (rolling.mean 은 마지막 자리가 달라 평평한 구간의 ZS 처럼 상쇄가 큰 식에서 결과가 갈림)
+    """
+    if _nb_sma is None or len(x) < n:
+        return x.rolling(n, min_periods=n).mean()
+    a = x.to_numpy(dtype=np.float64)
+    out = np.column_stack([_nb_sma(np.ascontiguousarray(a[:, j]), n) for j in range(a.shape[1])]) \
+        if a.shape[1] else np.empty(a.shape)
+    return pd.DataFrame(out, index=x.index, columns=x.columns)
+
+
+def _rma(x: pd.DataFrame, n: int) -> pd.DataFrame:
+    """pandas-ta rma: ewm(alpha=1/n, adjust=False), min_periods 없음 (첫 유효 행부터 값)"""
+    return x.ewm(alpha=1.0 / n, adjust=False).mean()
+
+
+def _ema(x: pd.DataFrame, n: int, from_first_valid: bool = False) -> pd.DataFrame:
+    """
+    pandas-ta ema(presma=True, adjust=False): 첫 n 행 평균을 seed 로 한 ewm(span=n)
+    from_first_valid: 열마다 첫 유효값부터 계산(macd signal 처럼 앞쪽 NaN 이 있는 입력)
+    """
+    a = x.to_numpy(dtype=np.float64)
+    out = np.full(a.shape, np.nan)
+    if from_first_valid:
+        valid = ~np.isnan(a)
+        first = np.where(valid.any(axis=0), valid.argmax(axis=0), -1)
+    else:
+        first = np.zeros(a.shape[1], dtype=np.int64)
+    for off in np.unique(first[first >= 0]):
+        cols = np.flatnonzero(first == off)
+        c = pd.DataFrame(a[off:, cols])
+        if len(c) < n:
+            continue
+        seed = c.iloc[:n].mean()
+        c.iloc[:n - 1] = np.nan
+        c.iloc[n - 1] = seed
+        out[off:, cols] = c.ewm(span=n, adjust=False).mean().to_numpy()
+    return pd.DataFrame(out, index=x.index, columns=x.columns)
+
+
+def _non_zero_range(x: pd.DataFrame, y: pd.DataFrame) -> pd.DataFrame:
+    """pandas-ta non_zero_range 의 열별 버전: 열에 0 이 하나라도 있으면 그 열 전체에 epsilon 을 더함"""
+    d = x - y
+    return d + np.where(d.eq(0).any(axis=0), np.finfo(float).eps, 0.0)
+
+
+def _true_range(f) -> pd.DataFrame:
+    """pandas-ta true_range(prenan=False): max(|h-l|, |h-pc|, |pc-l|), NaN 무시 → 첫 행은 |h-l|"""
+    h, l, pc = f["high"], f["low"], f["close"].shift(1)
+    a = _non_zero_range(h, l).abs().to_numpy()
+    b, c = (h - pc).abs().to_numpy(), (pc - l).abs().to_numpy()
+    tr = np.fmax(np.fmax(a, b), c)
+    return pd.DataFrame(tr, index=h.index, columns=h.columns)
+
+
+def _presma(x: pd.DataFrame, n: int) -> pd.DataFrame:
+    """pandas-ta presma: 첫 n 행 평균을 n-1 행에 두고 그 앞은 NaN"""
+    x = x.copy()
+    seed = x.iloc[:n].mean()
+    x.iloc[:n - 1] = np.nan
+    x.iloc[n - 1] = seed
+    return x
+
+
+def _windows_apply(x: pd.DataFrame, n: int, fn) -> pd.DataFrame:
+    """
+    rolling(n, min_periods=n).apply(raw=True) 의 벡터화: fn(windows (rows, S, n)) -> (rows, S)
+    창에 NaN 이 있으면 결과 NaN(fn 이 NaN 을 전파). 메모리 상한을 위해 시간 방향 청크로 나눠 계산
+    """
+    a = x.to_numpy(dtype=np.float64)
+    out = np.full(a.shape, np.nan)
+    if len(a) >= n:
+        w = np.lib.stride_tricks.sliding_window_view(a, n, axis=0)  # (T-n+1, S, n)
+        step = max(1, _CHUNK_ELEMS // max(1, a.shape[1] * n))
+        for i in range(0, len(w), step):
+            # 창 축을 연속 메모리로 → 창별 합이 1-D rolling.apply 와 같은 순서(pairwise)로 더해짐
+            chunk = np.ascontiguousarray(w[i:i + step])
+            out[n - 1 + i:n - 1 + i + len(chunk)] = fn(chunk)
+    return pd.DataFrame(out, index=x.index, columns=x.columns)
+
+
+def _wma(x: pd.DataFrame, n: int) -> pd.DataFrame:
+    w = np.arange(1, n + 1, dtype=np.float64)
+    return _windows_apply(x, n, lambda win: win @ w / (0.5 * n * (n + 1)))
+
+
+def _mad(x: pd.DataFrame, n: int) -> pd.DataFrame:
+    return _windows_apply(x, n, lambda win: np.abs(win - win.mean(axis=-1, keepdims=True)).mean(axis=-1))
+
+
+def _linreg_parts(n: int):
+    x = np.arange(1, n + 1, dtype=np.float64)
+    x_sum = 0.5 * n * (n + 1)
+    x2_sum = x_sum * (2 * n + 1) / 3
+    return x, x_sum, x2_sum, n * x2_sum - x_sum * x_sum
+
+
+def _k_sma(f, spec):
+    n = spec["length"]
+    return [(f"SMA_{n}", _sma(f["close"], n))]
+
+
+def _k_ema(f, spec):
+    n = spec["length"]
+    return [(f"EMA_{n}", _ema(f["close"], n))]
+
+
+def _k_rma(f, spec):
+    n = spec["length"]
+    return [(f"RMA_{n}", _rma(f["close"], n))]
+
+
+def _k_roc(f, spec):
+    n = spec["length"]
+    c = f["close"]
+    return [(f"ROC_{n}", 100 * c.diff(n) / c.shift(n))]
+
+
+def _k_mom(f, spec):
+    n = spec["length"]
+    return [(f"MOM_{n}", f["close"].diff(n))]
+
+
+def _k_variance(f, spec):
+    n = spec["length"]
+    return [(f"VAR_{n}", f["close"].rolling(n, min_periods=n).var(ddof=1))]
+
+
+def _k_stdev(f, spec):
+    n = spec["length"]
+    return [(f"STDEV_{n}", np.sqrt(f["close"].rolling(n, min_periods=n).var(ddof=1)))]
+
+
+def _k_zscore(f, spec):
+    n = spec["length"]
+    c = f["close"]
+    std = np.sqrt(c.rolling(n, min_periods=n).var(ddof=1))
+    return [(f"ZS_{n}", (c - _sma(c, n)) / std)]
+
+
+def _k_midpoint(f, spec):
+    n = spec["length"]
+    c = f["close"]
+    lo = c.rolling(n, min_periods=n).min()
+    hi = c.rolling(n, min_periods=n).max()
+    return [(f"MIDPOINT_{n}", 0.5 * (lo + hi))]
+
+
+def _k_midprice(f, spec):
+    n = spec["length"]
+    lo = f["low"].rolling(n, min_periods=n).min()
+    hi = f["high"].rolling(n, min_periods=n).max()
+    return [(f"MIDPRICE_{n}", 0.5 * (lo + hi))]
+
+
+def _k_log_return(f, spec):
+    c = f["close"]
+    return [("LOGRET_1", np.log(c / c.shift(1)))]
+
+
+def _k_percent_return(f, spec):
+    return [("PCTRET_1", f["close"].pct_change(1, fill_method=None))]
+
+
+def _k_true_range(f, spec):
+    return [("TRUERANGE_1", _true_range(f))]
+
+
+def _k_hl2(f, spec):
+    return [("HL2", 0.5 * (f["high"] + f["low"]))]
+
+
+def _k_hlc3(f, spec):
+    return [("HLC3", (f["high"] + f["low"] + f["close"]) / 3.0)]
+
+
+def _k_ohlc4(f, spec):
+    return [("OHLC4", 0.25 * (f["open"] + f["high"] + f["low"] + f["close"]))]
+
+
+def _k_rsi(f, spec):
+    n = spec["length"]
+    d = f["close"].diff(1)
+    up, down = _rma(d.clip(lower=0), n), _rma(d.clip(upper=0), n)
+    return [(f"RSI_{n}", 100 * up / (up + down.abs()))]
+
+
+def _k_atr(f, spec):
+    n = spec["length"]
+    return [(f"ATRr_{n}", _rma(_presma(_true_range(f), n), n))]
+
+
+def _k_natr(f, spec):
+    # pandas-ta natr 의 기본 mamode 는 ema → presma 된 TR 에 ema(presma 재적용은 값 불변)
+    n = spec["length"]
+    return [(f"NATR_{n}", (100 / f["close"]) * _ema(_presma(_true_range(f), n), n))]
+
+
+def _k_macd(f, spec):
+    fast, slow, sig = spec["fast"], spec["slow"], spec["signal"]
+    if slow < fast:
+        fast, slow = slow, fast
+    c = f["close"]
+    m = _ema(c, fast) - _ema(c, slow)
+    s = _ema(m, sig, from_first_valid=True)
+    tag = f"{fast}_{slow}_{sig}"
+    return [(f"MACD_{tag}", m), (f"MACDh_{tag}", m - s), (f"MACDs_{tag}", s)]
+
+
+def _k_willr(f, spec):
+    n = spec["length"]
+    lo = f["low"].rolling(n, min_periods=n).min()
+    hi = f["high"].rolling(n, min_periods=n).max()
+    return [(f"WILLR_{n}", 100 * ((f["close"] - lo) / (hi - lo) - 1))]
+
+
+def _k_donchian(f, spec):
+    lo_n, hi_n = spec["lower_length"], spec["upper_length"]
+    lo = f["low"].rolling(lo_n, min_periods=lo_n).min()
+    hi = f["high"].rolling(hi_n, min_periods=hi_n).max()
+    tag = f"{lo_n}_{hi_n}"
+    return [(f"DCL_{tag}", lo), (f"DCM_{tag}", 0.5 * (lo + hi)), (f"DCU_{tag}", hi)]
+
+
+def _k_bbands(f, spec):
+    # pandas-ta 0.4.71b0 bbands 에는 std 인자가 없음(lower_std/upper_std 기본 2.0) → std 는 무시됨.
+    # ddof 미지정 시 1
+    n, k = spec["length"], 2.0
+    c = f["close"]
+    mid = _sma(c, n)
+    sd = np.sqrt(c.rolling(n, min_periods=n).var(ddof=1))
+    lo, up = mid - k * sd, mid + k * sd
+    ulr = _non_zero_range(up, lo)
+    tag = f"{n}_{k}_{k}"
+    return [(f"BBL_{tag}", lo), (f"BBM_{tag}", mid), (f"BBU_{tag}", up),
+            (f"BBB_{tag}", 100 * ulr / mid), (f"BBP_{tag}", _non_zero_range(c, lo) / ulr)]
+
+
+def _k_wma(f, spec):
+    n = spec["length"]
+    return [(f"WMA_{n}", _wma(f["close"], n))]
+
+
+def _k_hma(f, spec):
+    n = spec["length"]
+    c = f["close"]
+    return [(f"HMA_{n}", _wma(2 * _wma(c, int(n / 2)) - _wma(c, n), int(np.sqrt(n))))]
+
+
+def _k_linreg(f, spec):
+    n = spec["length"]
+    x, x_sum, x2_sum, div = _linreg_parts(n)
+
+    def line(win):
+        # pandas-ta linreg(tsf=False) 는 m * n + b (창 다음 위치의 직선 값)
+        y_sum, xy_sum = win.sum(axis=-1), (win * x).sum(axis=-1)
+        m = (n * xy_sum - x_sum * y_sum) / div
+        b = (y_sum * x2_sum - x_sum * xy_sum) / div
+        return m * n + b
+    return [(f"LINREG_{n}", _windows_apply(f["close"], n, line))]
+
+
+def _k_cti(f, spec):
+    n = spec["length"]
+    x, x_sum, _, div = _linreg_parts(n)
+
+    def corr(win):
+        y_sum, xy_sum, y2_sum = win.sum(axis=-1), (win * x).sum(axis=-1), (win * win).sum(axis=-1)
+        with np.errstate(invalid="ignore"):
+            rd = np.sqrt(div * (n * y2_sum - y_sum * y_sum))
+        rd = np.where(rd == 0, np.finfo(float).eps, rd)  # pandas-ta: 분모 0 → epsilon
+        return (n * xy_sum - x_sum * y_sum) / rd
+    return [(f"CTI_{n}", _windows_apply(f["close"], n, corr))]
+
+
+def _k_cg(f, spec):
+    n = spec["length"]
+    coef = np.arange(1, n + 1, dtype=np.float64)  # pandas-ta: 가장 오래된 행 가중치 1
+    c = f["close"]
+    num = -_windows_apply(c, n, lambda win: (win * coef).sum(axis=-1))
+    return [(f"CG_{n}", num / c.rolling(n).sum())]
+
+
+def _k_mad(f, spec):
+    n = spec["length"]
+    return [(f"MAD_{n}", _mad(f["close"], n))]
+
+
+def _k_cci(f, spec):
+    n, k = spec["length"], 0.015
+    tp = (f["high"] + f["low"] + f["close"]) / 3.0
+    # pandas-ta 0.4.71b0 그대로: tp - sma / (c * mad) (괄호 없는 식 — 교과서 CCI 와 다름)
+    return [(f"CCI_{n}_{k}", tp - _sma(tp, n) / (k * _mad(tp, n)))]
+
+
+def _k_skew(f, spec):
+    n = spec["length"]
+    return [(f"SKEW_{n}", f["close"].rolling(n, min_periods=n).skew())]
+
+
+def _k_kurtosis(f, spec):
+    n = spec["length"]
+    return [(f"KURT_{n}", f["close"].rolling(n, min_periods=n).kurt())]
+
+
+# kind -> (커널, 허용 파라미터 집합). 그 외 파라미터가 있으면 pandas-ta 경로
+# (cumulative 외의 허용 파라미터는 필수: 양의 정수, std 는 양수)
+KERNELS = {
+    "sma":            (_k_sma,            {"length"}),
+    "ema":            (_k_ema,            {"length"}),
+    "rma":            (_k_rma,            {"length"}),
+    "roc":            (_k_roc,            {"length"}),
+    "mom":            (_k_mom,            {"length"}),
+    "variance":       (_k_variance,       {"length"}),
+    "stdev":          (_k_stdev,          {"length"}),
+    "zscore":         (_k_zscore,         {"length"}),
+    "midpoint":       (_k_midpoint,       {"length"}),
+    "midprice":       (_k_midprice,       {"length"}),
+    "log_return":     (_k_log_return,     {"cumulative"}),
+    "percent_return": (_k_percent_return, {"cumulative"}),
+    "true_range":     (_k_true_range,     set()),
+    "hl2":            (_k_hl2,            set()),
+    "hlc3":           (_k_hlc3,           set()),
+    "ohlc4":          (_k_ohlc4,          set()),
+    "rsi":            (_k_rsi,            {"length"}),
+    "atr":            (_k_atr,            {"length"}),
+    "natr":           (_k_natr,           {"length"}),
+    "macd":           (_k_macd,           {"fast", "slow", "signal"}),
+    "willr":          (_k_willr,          {"length"}),
+    "donchian":       (_k_donchian,       {"lower_length", "upper_length"}),
+    "bbands":         (_k_bbands,         {"length", "std"}),
+    "wma":            (_k_wma,            {"length"}),
+    "hma":            (_k_hma,            {"length"}),
+    "linreg":         (_k_linreg,         {"length"}),
+    "cti":            (_k_cti,            {"length"}),
+    "cg":             (_k_cg,             {"length"}),
+    "mad":            (_k_mad,            {"length"}),
+    "cci":            (_k_cci,            {"length"}),
+    "skew":           (_k_skew,           {"length"}),
+    "kurtosis":       (_k_kurtosis,       {"length"}),
+}
+
+
+def kernel_for(spec):
+    """스펙에 맞는 2-D 커널(없으면 None)"""
+    if not isinstance(spec, dict) or spec.get("kind") not in KERNELS:
+        return None
+    fn, allowed = KERNELS[spec["kind"]]
+    params = {k: v for k, v in spec.items() if k != "kind"}
+    if set(params) - allowed:
+        return None
+    if params.get("cumulative", False):
+        return None
+    for k in allowed - {"cumulative"}:
+        v = params.get(k)
+        if k == "std":
+            if not (isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0):
+                return None
+        elif not (isinstance(v, int) and not isinstance(v, bool) and v > 0):
+            return None
+    if spec["kind"] == "hma" and params["length"] < 2:
+        return None  # 내부 창 길이 int(n/2) 가 0 → pandas-ta 경로
+    return fn
+
+
+def _min_rows(spec) -> int:
+    """pandas-ta 는 행 수가 길이(들)보다 짧으면 결과를 추가하지 않음 → 같은 조건으로 생략"""
+    return max([v for k, v in spec.items() if k != "kind" and isinstance(v, int) and not isinstance(v, bool)] or [1])
+
+
+def time_groups(frames: dict) -> list:
+    """
+    open_time 열이 완전히 같은 심볼끼리 묶음 → [[symbol...]]
+    묶음 안에서는 행 위치 = 시각이라 2-D 행렬에 패딩/정렬 오차가 없음
+    (공백이 있거나 상장 시점이 다른 심볼은 별도 묶음 → 단일 심볼 경로와 같은 행 의미)
+    """
+    groups = []  # [(open_time, [symbol...])]
+    for s, df in frames.items():
+        t = df["open_time"].to_numpy()
+        for gt, syms in groups:
+            if len(gt) == len(t) and np.array_equal(gt, t):
+                syms.append(s)
+                break
+        else:
+            groups.append((t, [s]))
+    return [syms for _, syms in groups]
+
+
+def stack_frames(frames: dict) -> dict:
+    """같은 open_time 을 가진 {symbol: Polars DF} -> {field: DataFrame(행=시각, 열=심볼)}"""
+    syms = list(frames)
+    idx = pd.Index(frames[syms[0]]["open_time"].to_numpy(), name="open_time") if syms else None
+    out = {}
+    for field in BASE_FIELDS:
+        arr = np.column_stack([frames[s][field].cast(pl.Float64).to_numpy() for s in syms]) \
+            if syms else np.empty((0, 0))
+        out[field] = pd.DataFrame(arr, index=idx, columns=syms)
+    return out
+
+
+def _run_kernels(frames: dict, ta_list: list, idxs: list):
+    """{symbol: {spec idx: [(컬럼명, 1-D ndarray)]}}"""
+    res = {s: {} for s in frames}
+    for syms in time_groups(frames):
+        stacked = stack_frames({s: frames[s] for s in syms})
+        height = frames[syms[0]].height
+        for i in idxs:
+            spec = ta_list[i]
+            if height < _min_rows(spec):
+                for s in syms:
+                    res[s][i] = []
+                continue
+            outs = kernel_for(spec)(stacked, spec)
+            for s in syms:
+                res[s][i] = [(col, np.asarray(df2[s].to_numpy(), dtype=np.float64)) for col, df2 in outs]
+    return res
+
+
+def verify_kernels(df_pl: pl.DataFrame, ta_list: list, sample_rows: int = 5000,
+                   rtol: float = 1e-9, atol: float = 1e-12) -> set:
+    """
+    df_pl(한 심볼) 꼬리 sample_rows 행으로 커널 vs pandas-ta 비교.
+    반환: 커널을 써도 되는 스펙 인덱스 집합 (컬럼명/NaN 위치/값 모두 일치)
+    """
+    idxs = [i for i, spec in enumerate(ta_list) if kernel_for(spec) is not None]
+    if not idxs:
+        return set()
+    sample = df_pl.sort("open_time").tail(sample_rows)
+    sub = [ta_list[i] for i in idxs]
+    col_map = {}
+    ref = run_pandasta_on_polars(sample, ta_list=sub, col_map=col_map)
+    got = _run_kernels({"_": sample}, ta_list, idxs)["_"]
+
+    ok = set()
+    for j, i in enumerate(idxs):
+        ref_cols = col_map.get(j, [])
+        mine = got.get(i, [])
+        if not ref_cols or [c for c, _ in mine] != ref_cols:
+            continue
+        same = True
+        for col, arr in mine:
+            exp = ref[col].cast(pl.Float64).to_numpy()
+            if exp.shape != arr.shape or not np.array_equal(np.isnan(exp), np.isnan(arr)) \
+                    or not np.allclose(exp, arr, rtol=rtol, atol=atol, equal_nan=True):
+                same = False
+                break
+        if same:
+            ok.add(i)
+    return ok
+
+
+def run_batched_on_polars(frames: dict, ta_list: list, name: str = "FULL_SET",
+                          kernel_ok: set = None, col_maps: dict = None) -> dict:
+    """
+    frames: {symbol: Polars DF(OHLCV, open_time(ms), 워밍업 포함)}
+    kernel_ok: 2-D 커널을 쓸 스펙 인덱스 (verify_kernels 결과). None이면 커널 가능한 전부
+    col_maps: 주어지면 {symbol: {스펙 인덱스: [컬럼...]}} 기록 (ta_bridge 의 col_map 과 같은 형식)
+    반환: {symbol: 지표가 추가된 Polars DF} (단일 심볼 경로와 같은 컬럼 순서)
+    """
+    need_cols = {"open_time", *BASE_FIELDS}
+    for s, df in frames.items():
+        missing = need_cols - set(df.columns)
+        if missing:
+            raise ValueError(f"[{s}] Missing columns: {missing}")
+    frames = {s: df.sort("open_time") for s, df in frames.items()}
+
+    valid = [i for i, spec in enumerate(ta_list) if isinstance(spec, dict) and "kind" in spec]
+    k_idx = [i for i in valid if kernel_for(ta_list[i]) is not None
+             and (kernel_ok is None or i in kernel_ok)]
+    k_set = set(k_idx)
+    rest = [i for i in range(len(ta_list)) if i not in k_set]
+
+    kern = _run_kernels(frames, ta_list, k_idx) if k_idx else {s: {} for s in frames}
+
+    out = {}
+    for s, df in frames.items():
+        cm = {}
+        df_s = df
+        if rest:
+            sub_map = {}
+            df_s = run_pandasta_on_polars(df, ta_list=[ta_list[i] for i in rest], name=name, col_map=sub_map)
+            cm = {rest[j]: cols for j, cols in sub_map.items()}
+        if kern[s]:
+            # from_pandas 와 같게 NaN → null
+            df_s = df_s.with_columns([pl.Series(col, arr, nan_to_null=True)
+                                      for i in k_idx for col, arr in kern[s][i]])
+            for i in k_idx:
+                cm[i] = [col for col, _ in kern[s][i]]
+
+        # 단일 심볼 경로와 같은 순서: 원본 컬럼 + 스펙 순서대로 생성 컬럼
+        order, seen = [], set()
+        for c in [*df.columns, *(c for i in range(len(ta_list)) for c in cm.get(i, []))]:
+            if c not in seen and c in df_s.columns:
+                order.append(c)
+                seen.add(c)
+        out[s] = df_s.select(order)
+        if col_maps is not None:
+            col_maps[s] = cm
+    return out
@@ -1,29 +1,208 @@
 # features/custom.py
+"""
+바이낸스 전용 필드 기반 확장 피처 (오더플로/실현변동성 등)
+
+- 피처는 이름 → Polars 식 빌더 레지스트리로 선언 (@register)
+  windowed=True 인 빌더는 윈도우 w 를 받아 "{name}_{w}" 컬럼을 만듦
+- add_binance_custom 은 선택된 식 전부를 하나의 lazy plan(with_columns 1회)으로 실행
+  → 공통 부분식(r1, high-low, signed volume 등)은 CSE 로 한 번만 계산, 식들은 병렬 실행
+- 새 피처 추가 = 빌더 하나 등록. default=False 면 names 로 지정할 때만 계산
+- 구현 해시(impl_hash): 빌더 + 빌더가 이름으로 참조하는 함수들의 소스 + version
+  → 결과 파일의 스펙 기록에 들어가 구현이 바뀌면 --recompute 대상. 소스로 잡히지 않는 변경
+  (getattr 로 부르는 함수, 외부 라이브러리 동작 등)은 @register(..., version=) 을 올려서 표시
+"""
+import hashlib
+import inspect
+
 import polars as pl
 
-def add_binance_custom(df: pl.DataFrame, windows=(60, 300, 900)) -> pl.DataFrame:
+# name -> (builder, windowed, default)
+REGISTRY = {}
+VERSIONS = {}   # name -> register(version=)
+_IMPL = {}      # name -> 구현 해시 (첫 조회 시 계산)
+
+
+def register(name: str, windowed: bool = False, default: bool = True, version: int = 1):
+    def deco(fn):
+        REGISTRY[name] = (fn, windowed, default)
+        VERSIONS[name] = version
+        _IMPL.pop(name, None)
+        return fn
+    return deco
+
+
+def default_features() -> list:
+    return [n for n, (_, _, d) in REGISTRY.items() if d]
+
+
+# ---------- 공통 부분식 (여러 빌더가 재사용 → CSE 대상) ----------
+
+def _safe_div(num: pl.Expr, den: pl.Expr) -> pl.Expr:
+    return num / pl.when(den == 0).then(1).otherwise(den)
+
+
+def _tbb_ratio() -> pl.Expr:
+    return _safe_div(pl.col("taker_buy_base"), pl.col("volume"))
+
+
+def _r1() -> pl.Expr:
+    return pl.col("close").log() - pl.col("close").shift(1).log()
+
+
+def _signed_volume() -> pl.Expr:
+    return (_tbb_ratio() * 2 - 1) * pl.col("volume")
+
+
+def _signed_quote() -> pl.Expr:
+    return pl.col("taker_buy_quote") * 2 - pl.col("quote_volume")
+
+
+# ---------- 행 단위 피처 ----------
+
+@register("tbb_ratio")
+def _f_tbb_ratio():
+    return _tbb_ratio()
+
+
+@register("tbq_ratio")
+def _f_tbq_ratio():
+    return _safe_div(pl.col("taker_buy_quote"), pl.col("quote_volume"))
+
+
+@register("intensity")
+def _f_intensity():
+    return pl.col("num_trades")
+
+
+@register("r1")
+def _f_r1():
+    return _r1()
+
+
+@register("signed_volume")
+def _f_signed_volume():
+    return _signed_volume()
+
+
+# ---------- 윈도우 피처 ----------
+
+@register("rv", windowed=True)
+def _f_rv(w: int):
+    return _r1().pow(2).rolling_sum(window_size=w)
+
+
+@register("intensity_mean", windowed=True)
+def _f_intensity_mean(w: int):
+    return pl.col("num_trades").rolling_mean(window_size=w)
+
+
+@register("vol_mean", windowed=True)
+def _f_vol_mean(w: int):
+    return pl.col("volume").rolling_mean(window_size=w)
+
+
+@register("sv_mean", windowed=True)
+def _f_sv_mean(w: int):
+    return _signed_volume().rolling_mean(window_size=w)
+
+
+@register("hl_mean", windowed=True)
+def _f_hl_mean(w: int):
+    return (pl.col("high") - pl.col("low")).rolling_mean(window_size=w)
+
+
+@register("vpin", windowed=True, default=False)
+def _f_vpin(w: int):
+    """VPIN 근사: Σ|매수-매도 체결량| / Σ체결량 (w 행)"""
+    imb = (pl.col("taker_buy_base") * 2 - pl.col("volume")).abs()
+    den = pl.col("volume").rolling_sum(window_size=w)
+    return pl.when(den > 0).then(imb.rolling_sum(window_size=w) / den)
+
+
+@register("kyle_lambda", windowed=True, default=False)
+def _f_kyle_lambda(w: int):
+    """
+    Kyle λ 근사: r1 을 부호 있는 거래대금에 회귀한 기울기 cov(r, q) / var(q) (w 행)
+    q 는 값이 커서 E[q²]-E[q]² 꼴은 상쇄 오차가 큼 → 전 구간 평균(상수)으로 먼저 중심화(값 불변),
+    분산은 rolling_var(안정 알고리즘), 공분산은 중심화된 값으로 계산
+    """
+    r, q = _r1(), _signed_quote()
+    r, q = r - r.mean(), q - q.mean()
+    cov = (r * q).rolling_mean(window_size=w) - r.rolling_mean(window_size=w) * q.rolling_mean(window_size=w)
+    var = q.rolling_var(window_size=w, ddof=0)
+    return pl.when(var > 0).then(cov / var)
+
+
+# ---------- 실행 ----------
+
+def resolve_names(names=None) -> list:
+    """None → 기본 세트. 레지스트리 순서로 정렬, 모르는 이름은 ValueError"""
+    if names is None:
+        return default_features()
+    unknown = [n for n in names if n not in REGISTRY]
+    if unknown:
+        raise ValueError(f"unknown custom features: {unknown} (available: {list(REGISTRY)})")
+    want = set(names)
+    return [n for n in REGISTRY if n in want]
+
+
+def _referenced_functions(fn) -> list:
+    """fn 이 (재귀적으로) 이름으로 참조하는 함수들 (별칭/다른 모듈에서 import 한 함수 포함, 람다 안 포함)"""
+    seen, stack = [], [fn]
+    while stack:
+        f = stack.pop()
+        if f in seen:
+            continue
+        seen.append(f)
+        codes = [f.__code__]
+        while codes:
+            code = codes.pop()
+            codes += [c for c in code.co_consts if inspect.iscode(c)]
+            for n in code.co_names:
+                g = f.__globals__.get(n)
+                if inspect.isfunction(g) and g not in seen:
+                    stack.append(g)
+    return seen
+
+
+def feature_hash(name: str) -> str:
+    """피처 하나의 구현 해시 (빌더 + 참조 함수 소스 + version)"""
+    h = _IMPL.get(name)
+    if h is None:
+        fn = REGISTRY[name][0]
+        d = hashlib.sha1(f"{name}:{VERSIONS[name]}:{REGISTRY[name][1]}".encode("utf-8"))
+        for f in sorted(_referenced_functions(fn), key=lambda f: (f.__module__, f.__qualname__)):
+            d.update(inspect.getsource(f).encode("utf-8"))
+        h = _IMPL[name] = d.hexdigest()[:12]
+    return h
+
+
+def impl_hash(names=None) -> str:
+    """선택된 피처들의 구현 해시 → 선택 밖 피처만 고친 경우엔 바뀌지 않음"""
+    d = hashlib.sha1()
+    for n in resolve_names(names):
+        d.update(f"{n}={feature_hash(n)};".encode("utf-8"))
+    return d.hexdigest()[:12]
+
+
+def custom_exprs(names=None, windows=(60, 300, 900)) -> list:
+    """선택된 피처의 식 목록 (행 단위 피처 → 윈도우별 피처 순)"""
+    sel = resolve_names(names)
+    exprs = [REGISTRY[n][0]().alias(n) for n in sel if not REGISTRY[n][1]]
+    for w in windows:
+        exprs += [REGISTRY[n][0](w).alias(f"{n}_{w}") for n in sel if REGISTRY[n][1]]
+    return exprs
+
+
+def add_binance_custom(df: pl.DataFrame, windows=(60, 300, 900), names=None) -> pl.DataFrame:
     """
     바이낸스 전용 필드 기반 확장 피처 (오더플로/실현변동성 등)
+    names: 계산할 피처 이름(레지스트리 키). None 이면 기본 세트
     """
     need = {"volume", "quote_volume", "taker_buy_base", "taker_buy_quote", "num_trades"}
     if not need.issubset(set(df.columns)):
         return df
-
-    out = df.with_columns([
-        (pl.col("taker_buy_base") / pl.when(pl.col("volume") == 0).then(1).otherwise(pl.col("volume"))).alias("tbb_ratio"),
-        (pl.col("taker_buy_quote") / pl.when(pl.col("quote_volume") == 0).then(1).otherwise(pl.col("quote_volume"))).alias("tbq_ratio"),
-        pl.col("num_trades").alias("intensity"),
-        (pl.col("close").log() - pl.col("close").shift(1).log()).alias("r1"),
-    ]).with_columns([
-        ((pl.col("tbb_ratio") * 2 - 1) * pl.col("volume")).alias("signed_volume")
-    ])
-
-    for w in windows:
-        out = out.with_columns([
-            pl.col("r1").pow(2).rolling_sum(window_size=w).alias(f"rv_{w}"),
-            pl.col("intensity").rolling_mean(window_size=w).alias(f"intensity_mean_{w}"),
-            pl.col("volume").rolling_mean(window_size=w).alias(f"vol_mean_{w}"),
-            pl.col("signed_volume").rolling_mean(window_size=w).alias(f"sv_mean_{w}"),
-            (pl.col("high") - pl.col("low")).rolling_mean(window_size=w).alias(f"hl_mean_{w}"),
-        ])
-    return out
+    exprs = custom_exprs(names, windows)
+    if not exprs:
+        return df
+    return df.lazy().with_columns(exprs).collect(comm_subexpr_elim=True)
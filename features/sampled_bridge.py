@@ -0,0 +1,212 @@
+# features/sampled_bridge.py
+"""
+샘플 시점에서만 지표 평가 (고정 간격 stride / 이벤트 시각 목록)
+
+- 시각 T 의 샘플 행 = close_time <= T 인 마지막 바 (T 이후 데이터를 쓰지 않음)
+- 상태형/재귀형 지표(EMA·RMA 기반, 누적형 등): 전체 시계열로 계산 후 샘플 행만 선택
+- 유한 lookback 지표(rolling 창 기반): 샘플 행마다 "직전 lookback 행" 구간만 계산
+  겹치거나 맞닿는 구간은 한 연속 구간으로 합쳐(행 중복 없음) 이어붙인 프레임에서 pandas-ta 한 번
+  → 계산량 = 구간 합집합 행 수. lookback 이 같은 스펙끼리 묶고, 합집합이 전체의 _SEGMENT_MAX_FRACTION
+  이상이면 그 묶음은 전체 경로
+- 한계: 샘플 간격(행)이 lookback 보다 짧으면 구간들이 이어져 합집합 ≈ 전체 → 비용이 샘플 수에 비례하지 않음
+  (예: 1s 바 + 60초 stride 면 lookback 60 행 이하 스펙만 절약). 실제 분할은 stats 인자/텔레메트리로 확인
+- 어느 스펙이 구간 경로를 써도 되는지는 실행 초기에 한 번 전체 경로와 비교(verify_window_specs)
+  → 이름만 보고 분류하지 않음. 값/NaN 위치/컬럼명이 다르면 전체 경로
+- 결과 컬럼 순서는 단일 경로(run_pandasta_on_polars)와 동일
+"""
+import numpy as np
+import polars as pl
+
+from features.ta_bridge import run_pandasta_on_polars
+
+# 유한 lookback 후보 (최종 판단은 verify_window_specs)
+WINDOW_KINDS = {
+    "sma", "wma", "hma", "vwma", "roc", "mom", "cmo", "cci", "er", "willr", "cfo", "cg", "cti",
+    "aroon", "chop", "dpo", "qstick", "vhf", "vortex", "donchian", "linreg", "midpoint", "midprice",
+    "true_range", "stdev", "variance", "zscore", "mad", "entropy", "kurtosis", "skew", "bbands",
+    "accbands", "log_return", "percent_return", "ohlc4", "hl2", "hlc3", "bop", "cmf", "mfi", "uo",
+    "stoch", "kst", "inertia",
+}
+_DEFAULT_LOOKBACK = 30  # 길이 파라미터가 없는 스펙(pandas-ta 기본값 사용)
+_SEGMENT_MAX_FRACTION = 0.8  # 구간 합집합이 전체 행의 이 비율 이상이면 전체 경로
+
+
+def spec_lookback(spec: dict) -> int:
+    """구간 길이(행): 정수 파라미터 합 + 여유 (합성 지표의 창 길이 상한)"""
+    ints = [v for k, v in spec.items() if k != "kind" and isinstance(v, int) and not isinstance(v, bool)]
+    return (sum(ints) if ints else _DEFAULT_LOOKBACK) + 5
+
+
+def bar_close_times(df: pl.DataFrame) -> np.ndarray:
+    """바 마감 시각(ms). close_time 컬럼이 없으면 open_time + (중앙값 간격) - 1"""
+    if "close_time" in df.columns:
+        return df["close_time"].to_numpy()
+    ot = df["open_time"].to_numpy()
+    step = int(np.median(np.diff(ot))) if len(ot) > 1 else 1000
+    return ot + step - 1
+
+
+def sample_positions(close_time: np.ndarray, lo_ms: int, hi_ms: int,
+                     stride_ms: int = None, times=None):
+    """
+    [lo_ms, hi_ms] 구간의 샘플 시각 → (행 위치, 샘플 시각). 시각 T 의 행 = close_time <= T 인 마지막 행
+    (T 에 아직 열려 있는 바는 쓰지 않음 → look-ahead 없음)
+    stride_ms: lo_ms 부터 stride 간격 격자, times: 이벤트 시각(ms) 배열
+    같은 행에 여러 시각이 매칭되면 마지막 시각만 유지. 반환 위치는 오름차순
+    """
+    if times is not None:
+        ts = np.asarray(times, dtype=np.int64)
+        ts = np.sort(ts[(ts >= lo_ms) & (ts <= hi_ms)])
+    else:
+        first = lo_ms + (-lo_ms) % stride_ms
+        ts = np.arange(first, hi_ms + 1, stride_ms, dtype=np.int64)
+    pos = np.searchsorted(close_time, ts, side="right") - 1
+    keep = pos >= 0
+    pos, ts = pos[keep], ts[keep]
+    if len(pos):
+        last = np.r_[pos[1:] != pos[:-1], True]
+        pos, ts = pos[last], ts[last]
+    return pos.astype(np.int64), ts
+
+
+def _runs(pos: np.ndarray, seg_len: int):
+    """
+    오름차순 샘플 위치별 구간 [pos-seg_len+1, pos] (0 에서 자름)을 겹침/맞닿음 기준으로 합친 연속 구간
+    반환: (구간 시작 배열, 구간 끝 배열, 각 샘플의 구간 번호)
+    """
+    st = np.maximum(pos - seg_len + 1, 0)
+    new = np.r_[True, st[1:] > pos[:-1] + 1]
+    run_id = np.cumsum(new) - 1
+    heads = np.flatnonzero(new)
+    ends = pos[np.r_[heads[1:] - 1, len(pos) - 1]]
+    return st[heads], ends, run_id
+
+
+def segment_rows(pos: np.ndarray, seg_len: int) -> int:
+    """구간 경로로 계산할 행 수(합집합)"""
+    if not len(pos):
+        return 0
+    starts, ends, _ = _runs(pos, seg_len)
+    return int((ends - starts + 1).sum())
+
+
+def _segments(df: pl.DataFrame, pos: np.ndarray, seg_len: int):
+    """
+    합친 연속 구간들을 이어붙인 프레임(합성 open_time) + 각 샘플의 행 인덱스
+    각 구간의 첫 샘플 앞에는 seg_len-1 행(또는 시계열 시작부터 전부)이 있어 창이 구간 안에서 닫힘
+    """
+    if not len(pos):
+        return df[:0], np.empty(0, dtype=np.int64)
+    starts, ends, run_id = _runs(pos, seg_len)
+    lens = ends - starts + 1
+    off = np.r_[0, np.cumsum(lens)[:-1]]
+    idx = np.concatenate([np.arange(a, b + 1) for a, b in zip(starts, ends)])
+    take = off[run_id] + pos - starts[run_id]
+    seg = df[idx].with_columns(pl.Series("open_time", np.arange(len(idx), dtype=np.int64) * 1000))
+    return seg, take.astype(np.int64)
+
+
+def _run_full(df: pl.DataFrame, ta_list: list, idxs: list, pos: np.ndarray, name: str) -> dict:
+    """{spec idx: [(컬럼명, 샘플 위치 값 Series)]} — 전체 시계열 계산 후 선택"""
+    if not idxs:
+        return {}
+    cm = {}
+    out = run_pandasta_on_polars(df, ta_list=[ta_list[i] for i in idxs], name=name, col_map=cm)
+    picked = out[pos]
+    return {idxs[j]: [(c, picked[c]) for c in cols] for j, cols in cm.items()}
+
+
+def _run_segments(df: pl.DataFrame, ta_list: list, idxs: list, pos: np.ndarray,
+                  seg_len: int, name: str) -> dict:
+    if not idxs:
+        return {}
+    seg, take = _segments(df, pos, seg_len)
+    cm = {}
+    out = run_pandasta_on_polars(seg, ta_list=[ta_list[i] for i in idxs], name=name, col_map=cm)
+    picked = out[take]
+    return {idxs[j]: [(c, picked[c]) for c in cols] for j, cols in cm.items()}
+
+
+def verify_window_specs(df_pl: pl.DataFrame, ta_list: list, sample_rows: int = 5000, n_pos: int = 48,
+                        rtol: float = 1e-9, atol: float = 1e-12) -> set:
+    """
+    df_pl 꼬리 sample_rows 행에서 구간 경로 vs 전체 경로 비교.
+    반환: 구간 경로를 써도 되는 스펙 인덱스 집합 (컬럼명/NaN 위치/값 모두 일치)
+    """
+    cand = [i for i, s in enumerate(ta_list) if isinstance(s, dict) and s.get("kind") in WINDOW_KINDS]
+    if not cand:
+        return set()
+    sample = df_pl.sort("open_time").tail(sample_rows)
+    pos = np.unique(np.linspace(0, sample.height - 1, n_pos).astype(np.int64))
+    ref = _run_full(sample, ta_list, cand, pos, "VERIFY")
+
+    ok = set()
+    by_len = {}
+    for i in cand:
+        by_len.setdefault(spec_lookback(ta_list[i]), []).append(i)
+    for seg_len, idxs in by_len.items():
+        if sample.height < seg_len:
+            continue
+        got = _run_segments(sample, ta_list, idxs, pos, seg_len, "VERIFY")
+        for i in idxs:
+            a, b = ref.get(i, []), got.get(i, [])
+            if not a or [c for c, _ in a] != [c for c, _ in b]:
+                continue
+            same = True
+            for (_, sa), (_, sb) in zip(a, b):
+                x = sa.cast(pl.Float64).to_numpy()
+                y = sb.cast(pl.Float64).to_numpy()
+                if not np.array_equal(np.isnan(x), np.isnan(y)) \
+                        or not np.allclose(x, y, rtol=rtol, atol=atol, equal_nan=True):
+                    same = False
+                    break
+            if same:
+                ok.add(i)
+    return ok
+
+
+def run_sampled_on_polars(df_pl: pl.DataFrame, ta_list: list, pos: np.ndarray, name: str = "FULL_SET",
+                          window_ok: set = None, col_map: dict = None, stats: dict = None) -> pl.DataFrame:
+    """
+    df_pl: OHLCV(open_time 정렬, 워밍업 포함), pos: 샘플 행 위치(오름차순)
+    window_ok: 구간 경로를 쓸 스펙 인덱스(verify_window_specs 결과). None 이면 WINDOW_KINDS 전부
+    col_map: 주어지면 {스펙 인덱스: [컬럼...]} 기록
+    stats: 주어지면 {"segment_specs", "segment_rows", "full_specs", "full_rows"} 기록(경로별 스펙 수 / 계산 행 수)
+    반환: 샘플 행만의 DF (원본 컬럼 + 지표, 단일 경로와 같은 컬럼 순서)
+    """
+    valid = [i for i, s in enumerate(ta_list) if isinstance(s, dict) and "kind" in s]
+    win = [i for i in valid if ta_list[i].get("kind") in WINDOW_KINDS and (window_ok is None or i in window_ok)]
+
+    groups = {}
+    for i in win:
+        groups.setdefault(spec_lookback(ta_list[i]), []).append(i)
+    seg_idx, full_idx = [], [i for i in valid if i not in set(win)]
+    seg_total = 0
+    for seg_len, idxs in sorted(groups.items()):
+        rows = segment_rows(pos, seg_len)
+        # 구간 합집합이 전체와 비슷하면 전체 경로가 더 쌈(한 번에 같이 계산)
+        if df_pl.height >= seg_len and rows < _SEGMENT_MAX_FRACTION * df_pl.height:
+            seg_idx.append((seg_len, idxs))
+            seg_total += rows
+        else:
+            full_idx += idxs
+    full_idx.sort()
+
+    res = _run_full(df_pl, ta_list, full_idx, pos, name)
+    for seg_len, idxs in seg_idx:
+        res.update(_run_segments(df_pl, ta_list, idxs, pos, seg_len, name))
+    if stats is not None:
+        stats.update({"segment_specs": sum(len(x) for _, x in seg_idx), "segment_rows": seg_total,
+                      "full_specs": len(full_idx), "full_rows": df_pl.height if full_idx else 0})
+
+    out = df_pl[pos]
+    seen = set(out.columns)
+    cols = []
+    for i in range(len(ta_list)):
+        for c, s in res.get(i, []):
+            if c not in seen:
+                cols.append(s.alias(c))
+                seen.add(c)
+    if col_map is not None:
+        col_map.update({i: [c for c, _ in res[i]] for i in res})
+    return out.with_columns(cols) if cols else out
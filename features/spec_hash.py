@@ -0,0 +1,64 @@
+# features/spec_hash.py
+"""
+피처 파일 ↔ 스펙 매핑 (parquet 메타데이터)
+
+- 지표 스펙(dict)마다 정규화 JSON의 해시를 키로 사용
+- 파일 메타데이터에 {hash: {"spec": spec, "cols": [생성 컬럼...]}} 저장
+- 재계산 시 현재 스펙과 diff → 추가/변경분만 계산, 삭제분은 컬럼 drop
+"""
+import hashlib
+import json
+
+META_KEY = b"quant_pipeline.feature_specs"
+
+
+def spec_hash(spec: dict) -> str:
+    """키 순서/공백에 무관한 스펙 해시"""
+    blob = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def specs_by_hash(specs: list) -> dict:
+    """스펙 리스트 -> {hash: spec} (순서 유지, 중복 스펙은 하나로)"""
+    out = {}
+    for spec in specs:
+        if isinstance(spec, dict) and "kind" in spec:
+            out.setdefault(spec_hash(spec), spec)
+    return out
+
+
+def diff_specs(stored: dict, current: dict):
+    """
+    stored: 파일 메타의 {hash: {"spec", "cols"}}
+    current: {hash: spec}
+    반환: (추가할 hash 리스트, 제거할 hash 리스트)
+    """
+    added = [h for h in current if h not in stored]
+    removed = [h for h in stored if h not in current]
+    return added, removed
+
+
+def read_spec_meta(path: str):
+    """parquet 스키마 메타데이터에서 스펙 기록을 읽음. 없으면(구버전 파일) None"""
+    import pyarrow.parquet as pq
+    try:
+        md = pq.read_schema(path).metadata or {}
+    except Exception:
+        return None
+    raw = md.get(META_KEY)
+    if not raw:
+        return None
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def write_parquet_with_specs(df, path: str, spec_meta: dict, compression: str = "zstd"):
+    """Polars DF를 스펙 기록과 함께 parquet으로 저장"""
+    import pyarrow.parquet as pq
+    tbl = df.to_arrow()
+    md = dict(tbl.schema.metadata or {})
+    md[META_KEY] = json.dumps(spec_meta, ensure_ascii=False, default=str).encode("utf-8")
+    tbl = tbl.replace_schema_metadata(md)
+    pq.write_table(tbl, path, compression=compression)
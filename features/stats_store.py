@@ -0,0 +1,241 @@
+# features/stats_store.py
+"""
+일자별 피처 통계 저장소 (정규화 / drift 점검 / 결측률을 피처 파일 재스캔 없이)
+
+- day_stats: 하루치 피처 DF → 컬럼별 병합 가능한 요약
+  count(유효값), null_count(null+NaN), mean, m2(편차제곱합), min, max, q(분위수 스케치: 등간격 65점)
+- 저장: {stats_root}/{SYMBOL}/{GRAN}/{YYYY-MM-DD}.parquet (일자 파일)
+        compact_stats 로 {stats_root}/{SYMBOL}/{GRAN}.parquet (date 컬럼 포함) 하나로 병합
+        (일자 파일 기록과 병합은 심볼/GRAN 별 잠금 파일로 직렬화 → 동시 실행에서 일자 파일 유실 없음)
+- 조회: query_stats(stats_root, symbols, start, end) → 컬럼별 count/null_rate/mean/std/min/max/분위수
+  mean/std 는 Chan 병렬 공식으로 정확히 병합, 분위수는 일자 스케치의 가중 병합(근사)
+"""
+import os
+import glob
+
+import numpy as np
+import polars as pl
+
+from quant_pipeline.filelock import FileLock
+
+SKETCH_POINTS = 65                      # 0, 1/64, ..., 1
+COMPACT_MIN_SHARDS = 30                 # 피처 생성 실행 끝 자동 병합: 일자 파일이 이 수 이상일 때만
+EXCLUDE_COLS = {"open_time", "close_time", "sample_time"}
+_CHUNK_COLS = 64                        # 분위수 계산 시 한 번에 정렬할 컬럼 수(메모리 상한)
+
+STATS_SCHEMA = {
+    "column": pl.Utf8, "count": pl.Int64, "null_count": pl.Int64,
+    "mean": pl.Float64, "m2": pl.Float64, "min": pl.Float64, "max": pl.Float64,
+    "q": pl.List(pl.Float64),
+}
+
+
+def numeric_columns(df: pl.DataFrame) -> list:
+    return [c for c, t in zip(df.columns, df.dtypes) if t.is_numeric() and c not in EXCLUDE_COLS]
+
+
+def day_stats(df: pl.DataFrame, columns: list = None) -> pl.DataFrame:
+    """하루치 DF → 컬럼별 요약 1행씩 (STATS_SCHEMA)"""
+    cols = columns if columns is not None else numeric_columns(df)
+    if not cols:
+        return pl.DataFrame(schema=STATS_SCHEMA)
+    levels = np.linspace(0.0, 1.0, SKETCH_POINTS)
+    out = {k: [] for k in STATS_SCHEMA}
+    for i in range(0, len(cols), _CHUNK_COLS):
+        chunk = cols[i:i + _CHUNK_COLS]
+        x = df.select([pl.col(c).cast(pl.Float64) for c in chunk]).to_numpy()
+        x = np.where(np.isfinite(x), x, np.nan)
+        valid = ~np.isnan(x)
+        n = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            s = np.nansum(x, axis=0)
+            mean = np.where(n > 0, s / np.maximum(n, 1), np.nan)
+            m2 = np.nansum((x - mean) ** 2, axis=0)
+        xs = np.sort(x, axis=0)  # NaN 은 뒤로
+        for j, c in enumerate(chunk):
+            nj = int(n[j])
+            out["column"].append(c)
+            out["count"].append(nj)
+            out["null_count"].append(int(x.shape[0] - nj))
+            if nj == 0:
+                out["mean"].append(None); out["m2"].append(None)
+                out["min"].append(None); out["max"].append(None); out["q"].append(None)
+                continue
+            v = xs[:nj, j]
+            out["mean"].append(float(mean[j]))
+            out["m2"].append(float(m2[j]))
+            out["min"].append(float(v[0]))
+            out["max"].append(float(v[-1]))
+            out["q"].append(np.interp(levels * (nj - 1), np.arange(nj), v).tolist())
+    return pl.DataFrame(out, schema=STATS_SCHEMA)
+
+
+# ---------- storage ----------
+
+def day_path(stats_root: str, symbol: str, gran: str, ymd: str) -> str:
+    return os.path.join(stats_root, symbol, gran, f"{ymd}.parquet") if gran else os.path.join(stats_root, symbol, f"{ymd}.parquet")
+
+
+def compact_path(stats_root: str, symbol: str, gran: str) -> str:
+    return os.path.join(stats_root, symbol, f"{gran}.parquet") if gran else os.path.join(stats_root, f"{symbol}.parquet")
+
+
+def _lock(stats_root: str, symbol: str, gran: str) -> FileLock:
+    p = compact_path(stats_root, symbol, gran) + ".lock"
+    os.makedirs(os.path.dirname(p), exist_ok=True)
+    return FileLock(p)
+
+
+def _daily_files(stats_root: str, symbol: str, gran: str) -> list:
+    return sorted(glob.glob(os.path.join(os.path.dirname(day_path(stats_root, symbol, gran, "x")), "*.parquet")))
+
+
+def write_day_stats(stats_root: str, symbol: str, gran: str, ymd: str, df_day: pl.DataFrame) -> str:
+    path = day_path(stats_root, symbol, gran, ymd)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stats = day_stats(df_day)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with _lock(stats_root, symbol, gran):
+        stats.write_parquet(tmp, compression="zstd")
+        os.replace(tmp, path)
+    return path
+
+
+def compact_stats(stats_root: str, symbol: str, gran: str, min_shards: int = 0) -> int:
+    """
+    일자 파일들을 심볼별 파일 하나로 병합(같은 날짜는 일자 파일 우선) 후 일자 파일 삭제. 반환: 병합한 일자 수
+    min_shards: 일자 파일이 이보다 적으면 병합하지 않음(0 이면 항상)
+    """
+    if len(_daily_files(stats_root, symbol, gran)) < max(1, min_shards):
+        return 0
+    with _lock(stats_root, symbol, gran):
+        return _compact_locked(stats_root, symbol, gran)
+
+
+def _compact_locked(stats_root: str, symbol: str, gran: str) -> int:
+    daily = _daily_files(stats_root, symbol, gran)
+    if not daily:
+        return 0
+    new = pl.concat([pl.read_parquet(p).with_columns(pl.lit(os.path.basename(p)[:-8]).alias("date"))
+                     for p in daily], how="vertical")
+    cpath = compact_path(stats_root, symbol, gran)
+    if os.path.exists(cpath):
+        old = pl.read_parquet(cpath)
+        old = old.filter(~pl.col("date").is_in(new["date"].unique().to_list()))
+        new = pl.concat([old, new.select(old.columns)], how="vertical")
+    new = new.sort(["date", "column"])
+    tmp = cpath + ".tmp"
+    new.write_parquet(tmp, compression="zstd")
+    os.replace(tmp, cpath)
+    for p in daily:
+        os.remove(p)
+    return len(daily)
+
+
+def load_stats(stats_root: str, symbols: list, start: str = "", end: str = "",
+               gran: str = "1s", columns: list = None) -> pl.DataFrame:
+    """심볼/날짜 범위의 일자 요약 행들 (symbol, date 컬럼 추가)"""
+    frames = []
+    for sym in symbols:
+        parts = []
+        cpath = compact_path(stats_root, sym, gran)
+        daily = _daily_files(stats_root, sym, gran)
+        daily_dates = [os.path.basename(p)[:-8] for p in daily]
+        if start:
+            daily = [p for p, d in zip(daily, daily_dates) if d >= start]
+            daily_dates = [d for d in daily_dates if d >= start]
+        if end:
+            daily = [p for p, d in zip(daily, daily_dates) if d <= end]
+            daily_dates = [d for d in daily_dates if d <= end]
+        if os.path.exists(cpath):
+            lf = pl.scan_parquet(cpath)
+            if start:
+                lf = lf.filter(pl.col("date") >= start)
+            if end:
+                lf = lf.filter(pl.col("date") <= end)
+            if daily_dates:
+                lf = lf.filter(~pl.col("date").is_in(daily_dates))
+            if columns:
+                lf = lf.filter(pl.col("column").is_in(list(columns)))
+            parts.append(lf.collect())
+        for p, d in zip(daily, daily_dates):
+            df = pl.read_parquet(p).with_columns(pl.lit(d).alias("date"))
+            if columns:
+                df = df.filter(pl.col("column").is_in(list(columns)))
+            parts.append(df)
+        if parts:
+            frames.append(pl.concat([x.select(["date", *STATS_SCHEMA]) for x in parts], how="vertical")
+                          .with_columns(pl.lit(sym).alias("symbol")))
+    if not frames:
+        return pl.DataFrame(schema={"date": pl.Utf8, **STATS_SCHEMA, "symbol": pl.Utf8})
+    return pl.concat(frames, how="vertical")
+
+
+def _merge_quantiles(qs: list, ns: np.ndarray, probs: list) -> list:
+    """일자 스케치(각 SKETCH_POINTS 점, 가중치 n/점수)를 합친 가중 분위수"""
+    pts = np.concatenate([np.asarray(q, dtype=np.float64) for q in qs])
+    w = np.repeat(ns / SKETCH_POINTS, SKETCH_POINTS)
+    order = np.argsort(pts, kind="stable")
+    pts, w = pts[order], w[order]
+    cw = np.cumsum(w) - 0.5 * w
+    cw /= w.sum()
+    return np.interp(probs, cw, pts).tolist()
+
+
+def combine_stats(rows: pl.DataFrame, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)) -> pl.DataFrame:
+    """
+    load_stats 결과 → 컬럼별 병합 요약
+    count, null_count, null_rate, mean, std(표본, ddof=1), min, max, q{p}
+    """
+    valid = rows.filter(pl.col("count") > 0)
+    agg = (
+        rows.group_by("column").agg(pl.col("count").sum(), pl.col("null_count").sum())
+        .join(
+            valid.with_columns((pl.col("count") * pl.col("mean")).alias("_s"))
+            .group_by("column").agg(
+                (pl.col("_s").sum() / pl.col("count").sum()).alias("mean"),
+                pl.col("min").min(), pl.col("max").max(),
+            ),
+            on="column", how="left",
+        )
+    )
+    # Chan: M2 = Σ m2_i + Σ n_i (mean_i - mean)^2
+    m2 = (
+        valid.join(agg.select(["column", pl.col("mean").alias("_gm")]), on="column")
+        .group_by("column").agg(
+            (pl.col("m2").sum() + (pl.col("count") * (pl.col("mean") - pl.col("_gm")) ** 2).sum()).alias("_m2")
+        )
+    )
+    out = agg.join(m2, on="column", how="left").with_columns(
+        (pl.col("null_count") / (pl.col("count") + pl.col("null_count"))).alias("null_rate"),
+        pl.when(pl.col("count") > 1).then((pl.col("_m2") / (pl.col("count") - 1)).sqrt()).alias("std"),
+    ).drop("_m2")
+
+    if quantiles:
+        probs = list(quantiles)
+        qcols = {f"q{p:g}": [] for p in probs}
+        names = []
+        for (name,), g in valid.group_by(["column"]):
+            names.append(name)
+            vals = _merge_quantiles(g["q"].to_list(), g["count"].to_numpy().astype(np.float64), probs)
+            for p, v in zip(probs, vals):
+                qcols[f"q{p:g}"].append(v)
+        qdf = pl.DataFrame({"column": names, **qcols},
+                           schema={"column": pl.Utf8, **{k: pl.Float64 for k in qcols}})
+        out = out.join(qdf, on="column", how="left")
+
+    lead = ["column", "count", "null_count", "null_rate", "mean", "std", "min", "max"]
+    return out.select([*lead, *[c for c in out.columns if c not in lead]]).sort("column")
+
+
+def query_stats(stats_root: str, symbols: list, start: str = "", end: str = "", gran: str = "1s",
+                columns: list = None, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99),
+                per_symbol: bool = False) -> pl.DataFrame:
+    """심볼/날짜 범위 병합 통계 (per_symbol=True 면 심볼별로 따로 병합)"""
+    rows = load_stats(stats_root, symbols, start=start, end=end, gran=gran, columns=columns)
+    if not per_symbol:
+        return combine_stats(rows, quantiles=quantiles)
+    outs = [combine_stats(rows.filter(pl.col("symbol") == s), quantiles=quantiles)
+            .with_columns(pl.lit(s).alias("symbol")) for s in symbols]
+    outs = [o for o in outs if o.height]
+    return pl.concat(outs, how="vertical") if outs else combine_stats(rows, quantiles=quantiles)
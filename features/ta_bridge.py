@@ -3,8 +3,12 @@ import pandas as pd
 import polars as pl
 import pandas_ta as ta  # noqa: F401  # 일부 내부 참조
 
-def _apply_indicators_inplace(df_pd: pd.DataFrame, ta_list: list, name: str = "FULL_SET") -> pd.DataFrame:
-    """pandas-ta 0.4.x: Strategy 없이 dict 리스트로 개별 호출"""
+def _apply_indicators_inplace(df_pd: pd.DataFrame, ta_list: list, name: str = "FULL_SET",
+                              col_map: dict = None) -> pd.DataFrame:
+    """
+    pandas-ta 0.4.x: Strategy 없이 dict 리스트로 개별 호출
+    col_map이 주어지면 {스펙 인덱스(0-base): [추가된 컬럼...]} 기록
+    """
     for i, spec in enumerate(ta_list, 1):
         if not isinstance(spec, dict) or "kind" not in spec:
             print(f"[WARN] skip invalid spec at #{i}: {spec}")
@@ -18,6 +22,7 @@ def _apply_indicators_inplace(df_pd: pd.DataFrame, ta_list: list, name: str = "F
             print(f"[WARN] pandas-ta: indicator '{kind}' not found → skip")
             continue
 
+        before = set(df_pd.columns)
         try:
             _ = func(**params)
         except TypeError as e:
@@ -31,13 +36,17 @@ def _apply_indicators_inplace(df_pd: pd.DataFrame, ta_list: list, name: str = "F
                 print(f"[WARN] indicator '{kind}' failed: {e} → skip")
         except Exception as e:
             print(f"[WARN] indicator '{kind}' error: {e} → skip")
+        if col_map is not None:
+            col_map[i - 1] = [c for c in df_pd.columns if c not in before]
     return df_pd
 
 
-def run_pandasta_on_polars(df_pl: pl.DataFrame, ta_list: list, name: str = "FULL_SET") -> pl.DataFrame:
+def run_pandasta_on_polars(df_pl: pl.DataFrame, ta_list: list, name: str = "FULL_SET",
+                           col_map: dict = None) -> pl.DataFrame:
     """
     Polars DF(OHLCV, open_time(ms)) -> pandas-ta 지표 일괄 추가 -> Polars DF로
     (df_pl에 워밍업 구간이 포함되어 있어도 그대로 계산)
+    col_map: _apply_indicators_inplace 참고 (스펙별 생성 컬럼 기록)
     """
     need_cols = {"open_time", "open", "high", "low", "close", "volume"}
     missing = need_cols - set(df_pl.columns)
@@ -53,7 +62,7 @@ def run_pandasta_on_polars(df_pl: pl.DataFrame, ta_list: list, name: str = "FULL
     df_pd = df_pd.set_index("ts").drop(columns=["ts_ms"]).sort_index()
 
     # 지표 계산
-    df_pd = _apply_indicators_inplace(df_pd, ta_list=ta_list, name=name)
+    df_pd = _apply_indicators_inplace(df_pd, ta_list=ta_list, name=name, col_map=col_map)
 
     # Pandas -> Polars
     df_pd = df_pd.reset_index()
@@ -0,0 +1,207 @@
+# features/window_store.py
+"""
+학습용 고정 길이 윈도우 저장소 (메모리 맵)
+
+- export_windows: 피처 일자 파일들 → 한 디렉터리
+    X.npy          (rows, K) float32, 행 우선 → 윈도우 X[s:s+W] 가 연속 메모리
+    open_time.npy  (rows,) int64
+    starts.npy     (n,) int64  유효 윈도우 시작 행 (시간 공백 / NaN·inf 행이 포함된 윈도우 제외)
+    meta.json      컬럼, 윈도우, 기간, 행 수 등
+  입력은 하루씩 선택 컬럼만 읽어 memmap 에 바로 씀, 유효 시작도 memmap 위에서 청크로 계산
+  → 전체 기간을 메모리에 올리지 않음
+- WindowDataset: np.load(mmap_mode="r") 로 열고 윈도우를 복사 없는 view 로 반환
+  → 여러 학습 프로세스가 같은 page cache 를 공유, epoch 마다 parquet 디코딩 없음
+"""
+import os
+import json
+import glob
+from datetime import datetime, timezone
+
+import numpy as np
+
+FILES = {"x": "X.npy", "t": "open_time.npy", "starts": "starts.npy", "meta": "meta.json"}
+_CHUNK_ROWS = 1 << 20  # 유효 시작 계산 청크(행)
+
+
+def _day_files(features_root: str, symbol: str, gran: str, start: str, end: str) -> list:
+    pattern = os.path.join(features_root, symbol, gran, "*.parquet") if gran else os.path.join(features_root, symbol, "*.parquet")
+    files = sorted(glob.glob(pattern))
+    ymd = lambda fp: os.path.basename(fp).replace(".parquet", "")
+    if start:
+        files = [fp for fp in files if ymd(fp) >= start]
+    if end:
+        files = [fp for fp in files if ymd(fp) <= end]
+    return files
+
+
+def _col_numpy(col) -> np.ndarray:
+    """pyarrow ChunkedArray → ndarray (null → NaN). 청크별 Array.to_numpy 라 오래된 pyarrow 에서도 동작"""
+    if col.num_chunks == 0:
+        return np.empty(0)
+    return np.concatenate([np.asarray(ch.to_numpy(zero_copy_only=False)) for ch in col.chunks])
+
+
+def _iter_valid_starts(bad, t, window: int, step_ms: int, stride: int = 1, chunk: int = _CHUNK_ROWS):
+    """
+    유효 윈도우 시작 행을 청크별로 yield (memmap 입력도 청크 크기 메모리로 처리)
+    행 i 까지 이어진 "유효 행 연속 길이"(bad 가 아니고 직전 행과 간격이 step_ms) >= window 이면
+    [i-window+1, i] 가 유효 윈도우. open_time 이 증가하지 않으면 ValueError
+    """
+    n = len(t)
+    last = -1        # 마지막 끊김 위치(전역 행 번호): 이 행까지는 윈도우에 못 들어감
+    prev_t = None
+    for a in range(0, n, chunk):
+        b = min(n, a + chunk)
+        tc = np.asarray(t[a:b], dtype=np.int64)
+        bc = np.asarray(bad[a:b], dtype=bool)
+        dt = np.diff(np.r_[tc[0] - step_ms if prev_t is None else prev_t, tc])
+        if np.any(dt <= 0):
+            raise ValueError("open_time is not strictly increasing across files")
+        i = np.arange(a, b, dtype=np.int64)
+        brk = np.where(bc, i, np.where(dt != step_ms, i - 1, -1))
+        lastc = np.maximum.accumulate(np.r_[last, brk])[1:]
+        ends = i[i - lastc >= window]
+        s = ends - (window - 1)
+        if stride > 1:
+            # 윈도우 안은 간격이 step_ms 로 일정 → 시작 시각 = 끝 시각 - (window-1)*step
+            ts = tc[ends - a] - (window - 1) * step_ms
+            s = s[(ts // step_ms) % stride == 0]  # 절대 시간 기준 → 구간을 바꿔 export 해도 같은 표본
+        last, prev_t = int(lastc[-1]), int(tc[-1])
+        yield s
+
+
+def valid_starts(bad: np.ndarray, t: np.ndarray, window: int, step_ms: int, stride: int = 1) -> np.ndarray:
+    """
+    bad: (rows,) NaN/inf 가 있는 행, t: (rows,) open_time(ms)
+    윈도우 [s, s+window) 안에 bad 행이 없고 인접 시간 간격이 모두 step_ms 인 s 들
+    """
+    parts = list(_iter_valid_starts(bad, t, window, step_ms, stride))
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+def export_windows(features_root: str, symbol: str, gran: str, columns: list, window: int,
+                   out_dir: str, start: str = "", end: str = "", step_ms: int = 1000,
+                   stride: int = 1, dtype: str = "float32") -> dict:
+    """피처 일자 파일 → out_dir 의 memmap 배열 + 유효 시작 인덱스. 반환: meta"""
+    import pyarrow.parquet as pq
+
+    files = _day_files(features_root, symbol, gran, start, end)
+    if not files:
+        raise FileNotFoundError(f"[{symbol}] no feature files under {features_root} for {start or '-'}..{end or '-'}")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    rows = 0
+    for fp in files:
+        names = set(pq.read_schema(fp).names)
+        missing = [c for c in ["open_time", *columns] if c not in names]
+        if missing:
+            raise ValueError(f"{fp}: missing columns {missing}")
+        rows += pq.ParquetFile(fp).metadata.num_rows
+    if rows == 0:
+        raise ValueError(f"[{symbol}] feature files have no rows")
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = {k: os.path.join(out_dir, v + ".tmp") for k, v in FILES.items()}
+    bad_path = os.path.join(out_dir, "bad.tmp")
+    # X / open_time / bad 모두 디스크 memmap → 메모리 = 하루치 + 청크
+    x = np.lib.format.open_memmap(tmp["x"], mode="w+", dtype=np.dtype(dtype), shape=(rows, len(columns)))
+    t = np.lib.format.open_memmap(tmp["t"], mode="w+", dtype=np.int64, shape=(rows,))
+    bad = np.memmap(bad_path, mode="w+", dtype=bool, shape=(rows,))
+    try:
+        pos = 0
+        for fp in files:
+            tbl = pq.read_table(fp, columns=["open_time", *columns])
+            n = tbl.num_rows
+            t[pos:pos + n] = _col_numpy(tbl.column("open_time"))
+            for j, c in enumerate(columns):
+                # null → NaN
+                x[pos:pos + n, j] = _col_numpy(tbl.column(c)).astype(x.dtype, copy=False)
+            bad[pos:pos + n] = ~np.isfinite(x[pos:pos + n]).all(axis=1)
+            pos += n
+        x.flush()
+        t.flush()
+        bad.flush()
+        del x
+
+        try:
+            # 1차: 개수(+ open_time 증가 검사), 2차: memmap 에 기록
+            n_win = sum(len(s) for s in _iter_valid_starts(bad, t, window, step_ms, stride))
+        except ValueError as e:
+            raise ValueError(f"[{symbol}] {e}") from None
+        if n_win:
+            starts = np.lib.format.open_memmap(tmp["starts"], mode="w+", dtype=np.int64, shape=(n_win,))
+            k = 0
+            for s in _iter_valid_starts(bad, t, window, step_ms, stride):
+                starts[k:k + len(s)] = s
+                k += len(s)
+            starts.flush()
+            del starts
+        else:
+            with open(tmp["starts"], "wb") as f:
+                np.save(f, np.empty(0, dtype=np.int64))
+        bad_rows = int(bad.sum())
+        del t, bad
+    finally:
+        if os.path.exists(bad_path):
+            try:
+                os.remove(bad_path)
+            except OSError:
+                pass  # Windows: 아직 열린 memmap → 다음 export 에서 덮어씀
+
+    meta = {
+        "symbol": symbol, "granularity": gran, "start": start, "end": end,
+        "columns": list(columns), "window": int(window), "stride": int(stride), "step_ms": int(step_ms),
+        "dtype": np.dtype(dtype).name, "rows": int(rows), "bad_rows": bad_rows,
+        "n_windows": int(n_win),
+        "files": [os.path.basename(fp) for fp in files],
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    with open(tmp["meta"], "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    for k, v in FILES.items():
+        os.replace(tmp[k], os.path.join(out_dir, v))
+    return meta
+
+
+class WindowDataset:
+    """
+    export_windows 결과를 읽기 전용 memmap 으로 열어 윈도우 view 제공
+      ds = WindowDataset("data/windows/BTCUSDT")
+      w = ds[i]            # (window, K) view (복사 없음)
+      t0 = ds.start_time(i)
+      batch = ds.batch(idx) # (B, window, K) — 여기서만 복사
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, FILES["meta"]), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.x = np.load(os.path.join(path, FILES["x"]), mmap_mode="r")
+        self.t = np.load(os.path.join(path, FILES["t"]), mmap_mode="r")
+        self.starts = np.load(os.path.join(path, FILES["starts"]))
+        self.window = int(self.meta["window"])
+        self.columns = list(self.meta["columns"])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        s = int(self.starts[i])
+        return self.x[s:s + self.window]
+
+    def start_time(self, i: int) -> int:
+        return int(self.t[self.starts[i]])
+
+    def end_time(self, i: int) -> int:
+        """윈도우 마지막 행의 open_time (라벨 정렬용)"""
+        return int(self.t[self.starts[i] + self.window - 1])
+
+    @property
+    def windows(self) -> np.ndarray:
+        """(rows - window + 1, window, K) strided view — windows[starts] 로 유효 윈도우 선택"""
+        return np.lib.stride_tricks.sliding_window_view(self.x, self.window, axis=0).transpose(0, 2, 1)
+
+    def batch(self, idx) -> np.ndarray:
+        """여러 윈도우를 (B, window, K) 연속 배열로 모음 (모델 입력용 복사)"""
+        return self.windows[self.starts[np.asarray(idx)]]
@@ -0,0 +1,74 @@
+# quant_pipeline/cli.py
+"""
+단일 진입점: python -m quant_pipeline <subcommand> [options...]
+
+- 각 서브커맨드는 scripts/ 의 해당 스크립트 main(argv)를 같은 인터프리터에서 호출
+- 스크립트 모듈은 서브커맨드가 선택된 뒤에만 로드 → --help / 할 일 없는 실행이 빠름
+"""
+import os
+import sys
+import argparse
+import importlib.util
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(ROOT, "scripts")
+
+# subcommand -> (script file, 설명)
+COMMANDS = {
+    "fetch":              ("01_fetch_ohlcv.py",               "Binance 1s klines per-day fetch"),
+    "fetch-favorites":    ("01_2_fetch_favorites.py",         "favorites bundle fetch"),
+    "bars":               ("01_3_build_bars.py",              "volume / dollar / tick bars from 1s klines"),
+    "features":           ("02_make_features_all.py",         "indicators per day (warmup across days)"),
+    "features-favorites": ("02_3_make_features_favorites.py", "favorites bundle features"),
+    "validate":           ("02_2_validate_features.py",       "feature file sanity report"),
+    "stats":              ("02_4_feature_stats.py",           "feature statistics store query / backfill"),
+    "export-windows":     ("05_export_windows.py",            "training windows to memory-mapped arrays"),
+}
+
+
+def load_script(filename: str):
+    """scripts/<filename> 을 모듈로 로드(파일명이 숫자로 시작해도 가능). 한 번만 로드"""
+    mod_name = "qp_scripts." + os.path.splitext(filename)[0]
+    mod = sys.modules.get(mod_name)
+    if mod is not None:
+        return mod
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location(mod_name, os.path.join(SCRIPTS_DIR, filename))
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[mod_name] = mod
+    try:
+        spec.loader.exec_module(mod)
+    except BaseException:
+        sys.modules.pop(mod_name, None)
+        raise
+    return mod
+
+
+def run_script(filename: str, argv: list):
+    """스크립트 main(argv) 실행. 반환: 종료 코드"""
+    try:
+        rc = load_script(filename).main(list(argv))
+    except SystemExit as e:
+        rc = e.code
+    if rc is None:
+        return 0
+    if isinstance(rc, int):
+        return rc
+    # sys.exit("message") 와 같게: 메시지를 stderr 로 출력 후 1
+    print(rc, file=sys.stderr)
+    return 1
+
+
+def main(argv=None):
+    epilog = "\n".join(f"  {name:<20s}{desc}" for name, (_, desc) in COMMANDS.items())
+    ap = argparse.ArgumentParser(
+        prog="quant-pipeline",
+        description="quant-pipeline unified CLI. '<subcommand> -h' shows the options of each stage.",
+        epilog="subcommands:\n" + epilog,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("command", choices=sorted(COMMANDS), metavar="subcommand")
+    ap.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    return run_script(COMMANDS[args.command][0], args.args)
@@ -0,0 +1,47 @@
+# quant_pipeline/filelock.py
+"""
+프로세스 간 배타 잠금 (표준 라이브러리만 사용, POSIX: fcntl.flock, Windows: msvcrt.locking)
+
+사용:
+    from quant_pipeline.filelock import FileLock
+    with FileLock("state.json.lock"):
+        ...
+"""
+import os
+import time
+
+
+class FileLock:
+    """잠금 파일(없으면 생성)에 대한 배타 잠금. with 블록 동안 유지"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fh = None
+
+    def __enter__(self):
+        self.fh = open(self.path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    self.fh.seek(0)
+                    msvcrt.locking(self.fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        else:
+            import fcntl
+            fcntl.flock(self.fh.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self.fh.seek(0)
+                msvcrt.locking(self.fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self.fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.fh.close()
@@ -0,0 +1,204 @@
+# quant_pipeline/telemetry.py
+"""
+파이프라인 텔레메트리 (표준 라이브러리만 사용)
+
+- 구조화 이벤트: JSON-lines 파일에 한 줄씩 ({"ts", "stage", "event", ...})
+- 카운터 / 게이지 / 히스토그램: 라벨별 집계, (옵션) Prometheus textfile 로 내보내기
+- 비활성(기본) 상태에서는 모든 호출이 즉시 반환 → 오버헤드 무시 가능
+
+사용:
+    from quant_pipeline import telemetry
+    telemetry.configure(jsonl_path="metrics.jsonl", prom_path="qp.prom", stage="fetch")
+    tm = telemetry.get()
+    tm.inc("klines_requests_total", symbol="BTCUSDT", status=200)
+    with tm.timer("features_stage_seconds", stage="compute"):
+        ...
+    tm.event("fetch_day", symbol="BTCUSDT", date="2024-10-01", rows=86400)
+    tm.close()
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+PREFIX = "qp_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+PROM_EXPORT_INTERVAL = 15.0  # seconds
+
+
+def _key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Telemetry:
+    def __init__(self, jsonl_path: str = None, prom_path: str = None, stage: str = "",
+                 buckets=DEFAULT_BUCKETS):
+        self.jsonl_path = jsonl_path or None
+        self.prom_path = prom_path or None
+        self.stage = stage
+        self.buckets = tuple(buckets)
+        self.enabled = bool(self.jsonl_path or self.prom_path)
+        self.counters = {}    # name -> {label key: value}
+        self.gauges = {}      # name -> {label key: value}
+        self.hists = {}       # name -> {label key: [bucket counts..., sum, count]}
+        self._lock = threading.Lock()          # 집계값 / 이벤트 파일
+        self._export_lock = threading.Lock()   # Prometheus 파일 쓰기 (render 가 _lock 을 잡으므로 분리)
+        self._fh = None
+        self._last_export = time.time()
+        if self.jsonl_path:
+            d = os.path.dirname(os.path.abspath(self.jsonl_path))
+            os.makedirs(d, exist_ok=True)
+            self._fh = open(self.jsonl_path, "a", encoding="utf-8", buffering=1)
+
+    # --- metrics ---
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            m = self.counters.setdefault(name, {})
+            k = _key(labels)
+            m[k] = m.get(k, 0) + value
+        self._maybe_export()
+
+    def set(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges.setdefault(name, {})[_key(labels)] = value
+        self._maybe_export()
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            m = self.hists.setdefault(name, {})
+            k = _key(labels)
+            h = m.get(k)
+            if h is None:
+                h = m[k] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    h[i] += 1
+            h[-2] += value
+            h[-1] += 1
+        self._maybe_export()
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """블록 소요 시간(초)을 히스토그램 name 에 기록"""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    # --- events ---
+    def event(self, name: str, **fields):
+        if not self.enabled:
+            return
+        if self._fh is not None:
+            rec = {"ts": round(time.time(), 3), "stage": self.stage, "pid": os.getpid(), "event": name}
+            rec.update(fields)
+            line = json.dumps(rec, ensure_ascii=False, default=str)
+            with self._lock:
+                self._fh.write(line + "\n")
+        self._maybe_export()
+
+    # --- export ---
+    def _fmt_labels(self, k: tuple, extra: tuple = ()) -> str:
+        items = list(k) + list(extra)
+        if self.stage:
+            items = [("stage", self.stage)] + items
+        if not items:
+            return ""
+        esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{a}="{esc(b)}"' for a, b in items) + "}"
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, m in sorted(self.counters.items()):
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                lines += [f"{PREFIX}{name}{self._fmt_labels(k)} {v}" for k, v in sorted(m.items())]
+            for name, m in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {PREFIX}{name} gauge")
+                lines += [f"{PREFIX}{name}{self._fmt_labels(k)} {v}" for k, v in sorted(m.items())]
+            for name, m in sorted(self.hists.items()):
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for k, h in sorted(m.items()):
+                    for b, c in zip(self.buckets, h):
+                        lines.append(f"{PREFIX}{name}_bucket{self._fmt_labels(k, (('le', b),))} {c}")
+                    lines.append(f"{PREFIX}{name}_bucket{self._fmt_labels(k, (('le', '+Inf'),))} {h[-1]}")
+                    lines.append(f"{PREFIX}{name}_sum{self._fmt_labels(k)} {h[-2]}")
+                    lines.append(f"{PREFIX}{name}_count{self._fmt_labels(k)} {h[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def _maybe_export(self):
+        """
+        마지막 내보내기 후 PROM_EXPORT_INTERVAL 이 지났으면 내보내기 (이벤트 없이 카운터만 쌓이는 구간도 반영)
+        _lock 을 놓은 뒤에 호출해야 함. 다른 스레드가 내보내는 중이면 기다리지 않고 건너뜀
+        """
+        if not self.prom_path or time.time() - self._last_export < PROM_EXPORT_INTERVAL:
+            return
+        if not self._export_lock.acquire(blocking=False):
+            return
+        try:
+            if time.time() - self._last_export >= PROM_EXPORT_INTERVAL:
+                self._write_prometheus()
+        finally:
+            self._export_lock.release()
+
+    def export_prometheus(self):
+        """node_exporter textfile collector 형식으로 원자적 저장"""
+        if not self.prom_path:
+            return
+        with self._export_lock:
+            self._write_prometheus()
+
+    def _write_prometheus(self):
+        self._last_export = time.time()
+        d = os.path.dirname(os.path.abspath(self.prom_path))
+        os.makedirs(d, exist_ok=True)
+        tmp = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, self.prom_path)
+
+    def snapshot(self) -> dict:
+        """현재 집계값(카운터/게이지, 히스토그램 sum/count)"""
+        with self._lock:
+            flat = lambda m: {",".join(f"{a}={b}" for a, b in k): v for k, v in m.items()}
+            return {
+                "counters": {n: flat(m) for n, m in self.counters.items()},
+                "gauges": {n: flat(m) for n, m in self.gauges.items()},
+                "histograms": {n: {",".join(f"{a}={b}" for a, b in k): {"sum": h[-2], "count": h[-1]}
+                                   for k, h in m.items()} for n, m in self.hists.items()},
+            }
+
+    def close(self):
+        if not self.enabled:
+            return
+        if self._fh is not None:
+            self.event("summary", **self.snapshot())
+            self._fh.close()
+            self._fh = None
+        self.export_prometheus()
+
+
+_current = Telemetry()
+
+
+def configure(jsonl_path: str = None, prom_path: str = None, stage: str = "") -> Telemetry:
+    """프로세스 전역 텔레메트리 설정(이전 인스턴스는 닫음)"""
+    global _current
+    _current.close()
+    _current = Telemetry(jsonl_path=jsonl_path, prom_path=prom_path, stage=stage)
+    return _current
+
+
+def get() -> Telemetry:
+    return _current
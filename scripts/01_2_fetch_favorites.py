@@ -1,9 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import sys, subprocess
+import os, sys
 from datetime import datetime, timezone, timedelta
-from pathlib import Path
+
+# ===== 프로젝트 루트 경로 주입 =====
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from quant_pipeline.cli import run_script  # noqa: E402
 
 # 1) 즐겨찾기(기본 자산) — SUI 제외
 FAVORITES = [
@@ -16,29 +22,34 @@ symbols = ",".join([f"{c.upper()}USDT" for c in FAVORITES])
 
 # 3) 기간: 2023-01-01 ~ 어제(UTC)
 start_date = "2023-01-01"
-yesterday_utc = (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
 
-# 4) 출력 루트 및 호출 스크립트 경로
+# 4) 출력 루트 및 호출 스크립트
 out_root = "data/ohlcv/binance-spot"
 granularity = "1s"
-fetch_script = Path(__file__).parent / "01_fetch_ohlcv.py"
-
-# 5) 실행 커맨드 구성
-cmd = [
-    sys.executable, str(fetch_script),
-    "--symbols", symbols,
-    "--interval", granularity,
-    "--start", start_date,
-    "--end", yesterday_utc,      # 내부에서 어제-캡이 또 걸림
-    "--out", out_root,
-    "--granularity", granularity
-]
+fetch_script = "01_fetch_ohlcv.py"
+
+
+def main(argv=None):
+    yesterday_utc = (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
+
+    # 5) 인자 구성 (추가 인자는 그대로 01_fetch_ohlcv.py 로 전달)
+    args = [
+        "--symbols", symbols,
+        "--interval", granularity,
+        "--start", start_date,
+        "--end", yesterday_utc,      # 내부에서 어제-캡이 또 걸림
+        "--out", out_root,
+        "--granularity", granularity
+    ] + list(argv if argv is not None else sys.argv[1:])
+
+    print("[favorites] Running:", fetch_script, " ".join(args))
+    print(f"[favorites] Effective: symbols={symbols}")
+    print(f"[favorites] Range(UTC): {start_date} .. {yesterday_utc} (inclusive)")
+    print(f"[favorites] Output to: {out_root}/<SYMBOL>/{granularity}/YYYY-MM-DD.parquet")
+
+    # 6) 같은 프로세스에서 실행
+    return run_script(fetch_script, args)
 
-print("[favorites] Running:", " ".join(cmd))
-print(f"[favorites] Effective: symbols={symbols}")
-print(f"[favorites] Range(UTC): {start_date} .. {yesterday_utc} (inclusive)")
-print(f"[favorites] Output to: {out_root}/<SYMBOL>/{granularity}/YYYY-MM-DD.parquet")
 
-# 6) 실행
-completed = subprocess.run(cmd)
-sys.exit(completed.returncode)
+if __name__ == "__main__":
+    sys.exit(main())
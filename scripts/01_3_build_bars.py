@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+data/ohlcv/binance-spot/{SYMBOL}/1s/YYYY-MM-DD.parquet  ->  정보 기반 바(volume / dollar / tick)
+data/ohlcv/binance-spot/{SYMBOL}/{GRAN}/YYYY-MM-DD.parquet   (GRAN 예: volume-100, dollar-5000000)
+
+- 바 경계: 누적합(volume | quote_volume | num_trades)을 임계값으로 나눈 floor 로 벡터화 계산
+  (한 바에서 넘친 양은 다음 바로 이어짐 → 바 크기 평균이 임계값)
+- 출력 스키마는 1s 와 같음(open_time=바 첫 행, close_time=바 마지막 행, 합계 컬럼은 합) + n_klines
+  → 02_make_features_all.py --granularity {GRAN} 로 그대로 사용 (날짜 슬라이스는 close_time 기준)
+- 바는 마감된 날짜 파일에 기록. 날짜 끝의 미완성 바는 다음 날짜로 이월:
+  연속 실행 중에는 메모리로, 재시작 시에는 직전 결과 파일 메타데이터(이월 시작 open_time, 잔여 누적량)를
+  보고 입력 1s 파일에서 그 행들만 다시 읽음 → 중간부터 다시 돌려도 결과 동일
+- 입력 날짜가 끊기면(파일 없음) 스트림도 끊김: 미완성 바는 버리고 다음 날짜부터 새로 시작
+- 임계값은 {GRAN}/bar_spec.json 에 고정(--bars-per-day 로 자동 산출 가능)
+
+사용 예)
+  python scripts/01_3_build_bars.py --symbols XLMUSDT,BTCUSDT --kind dollar --bars-per-day 2000 ^
+    --start 2024-01-01 --end 2024-06-30
+  python scripts/02_make_features_all.py --symbols XLMUSDT --granularity dollar-bpd2000 ^
+    --out-root data/features_all/binance-spot
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import glob
+import argparse
+from datetime import datetime, timezone, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# polars / numpy / pyarrow 는 실제로 만들 날짜가 있을 때 로드
+pl = None
+np = None
+
+
+def _load_heavy():
+    global pl, np
+    if pl is not None:
+        return
+    import polars as _pl
+    import numpy as _np
+    pl, np = _pl, _np
+
+
+BAR_METRICS = {"volume": "volume", "dollar": "quote_volume", "tick": "num_trades"}
+SUM_COLS = ("volume", "quote_volume", "num_trades", "taker_buy_base", "taker_buy_quote")
+STATE_KEY = b"quant_pipeline.bar_state"
+SPEC_FILE = "bar_spec.json"
+
+
+def day_path(root: str, symbol: str, gran: str, ymd: str) -> str:
+    return os.path.join(root, symbol, gran, f"{ymd}.parquet")
+
+
+def ymd_from_fp(fp: str) -> str:
+    return os.path.basename(fp).replace(".parquet", "")
+
+
+def prev_ymd(ymd: str) -> str:
+    d = datetime.strptime(ymd, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return (d - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def ymd_of_ms(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def fmt_threshold(x: float) -> str:
+    return str(int(x)) if float(x).is_integer() else f"{x:g}"
+
+
+def default_granularity(kind: str, threshold: float, bars_per_day: int) -> str:
+    return f"{kind}-bpd{bars_per_day}" if bars_per_day else f"{kind}-{fmt_threshold(threshold)}"
+
+
+# ---------- spec / state ----------
+
+def read_spec(out_dir: str):
+    p = os.path.join(out_dir, SPEC_FILE)
+    if not os.path.exists(p):
+        return None
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_spec(out_dir: str, spec: dict):
+    os.makedirs(out_dir, exist_ok=True)
+    p = os.path.join(out_dir, SPEC_FILE)
+    tmp = p + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(spec, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, p)
+
+
+def read_state(path: str):
+    """결과 파일 메타데이터의 이월 상태 {"carry_from", "offset", ...} (없으면 None)"""
+    import pyarrow.parquet as pq
+    md = pq.read_schema(path).metadata or {}
+    raw = md.get(STATE_KEY)
+    return json.loads(raw.decode("utf-8")) if raw else None
+
+
+def write_bars(df: pl.DataFrame, path: str, state: dict):
+    import pyarrow.parquet as pq
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tbl = df.to_arrow()
+    md = dict(tbl.schema.metadata or {})
+    md[STATE_KEY] = json.dumps(state, ensure_ascii=False).encode("utf-8")
+    tmp = path + ".tmp"
+    pq.write_table(tbl.replace_schema_metadata(md), tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+# ---------- bar construction ----------
+
+def build_bars(df: pl.DataFrame, metric: str, threshold: float, offset: float):
+    """
+    df: 이월 행 + 당일 1s 행 (open_time 정렬), offset: 첫 행 직전까지의 잔여 누적량(0 <= offset < threshold)
+    반환: (완성된 바 DF, 이월 행 DF, 이월 행 기준 offset)
+    """
+    x = df[metric].cast(pl.Float64).fill_null(0.0).to_numpy()
+    cs = offset + np.cumsum(x)
+    cs_excl = np.concatenate([[offset], cs[:-1]]) if len(x) else cs
+    bar = np.floor(cs_excl / threshold).astype(np.int64)
+    open_id = int(np.floor(cs[-1] / threshold)) if len(x) else 0
+    done = bar < open_id
+
+    if done.all():
+        carry_offset = float(cs[-1] - open_id * threshold) if len(x) else offset
+    else:
+        carry_offset = float(cs_excl[int(np.argmin(done))] - open_id * threshold)
+
+    done_s = pl.Series(done)
+    bars = (
+        df.filter(done_s)
+        .with_columns(pl.Series("_bar", bar[done]))
+        .group_by("_bar", maintain_order=True)
+        .agg([
+            pl.col("open_time").first(),
+            pl.col("open").first(),
+            pl.col("high").max(),
+            pl.col("low").min(),
+            pl.col("close").last(),
+            pl.col("close_time").last(),
+            *[pl.col(c).sum() for c in SUM_COLS if c in df.columns],
+            *[pl.col(c).first() for c in ("exchange", "symbol") if c in df.columns],
+            pl.len().cast(pl.Int64).alias("n_klines"),
+        ])
+        .drop("_bar")
+    )
+    order = [c for c in df.columns if c in bars.columns] + ["n_klines"]
+    return bars.select(order), df.filter(~done_s), carry_offset
+
+
+def restore_carry(in_root: str, out_root: str, symbol: str, in_gran: str, gran: str, ymd: str,
+                  threshold: float):
+    """
+    직전 날짜 결과 파일의 상태로 이월 행 복원. 반환: (이월 행 DF | None, offset)
+    직전 결과가 없거나, 임계값이 다르거나, 필요한 입력이 없으면 (None, 0.0) → 새 스트림
+    """
+    prev_out = day_path(out_root, symbol, gran, prev_ymd(ymd))
+    if not os.path.exists(prev_out):
+        return None, 0.0
+    state = read_state(prev_out) or {}
+    if state.get("threshold") != threshold:
+        return None, 0.0
+    offset = float(state.get("offset", 0.0))
+    carry_from = state.get("carry_from")
+    if carry_from is None:
+        return None, offset
+    parts, d = [], ymd_of_ms(int(carry_from))
+    while d <= prev_ymd(ymd):
+        p = day_path(in_root, symbol, in_gran, d)
+        if not os.path.exists(p):
+            print(f"[{symbol}] {ymd} carry input {p} missing → new stream")
+            return None, 0.0
+        parts.append(pl.scan_parquet(p).filter(pl.col("open_time") >= int(carry_from)))
+        d = (datetime.strptime(d, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    return pl.concat(parts, how="vertical").collect(), offset
+
+
+def auto_threshold(in_root: str, symbol: str, in_gran: str, days: list, metric: str, bars_per_day: int) -> float:
+    """선택 기간 일별 metric 합계의 중앙값 / bars_per_day"""
+    totals = [pl.scan_parquet(day_path(in_root, symbol, in_gran, d)).select(pl.col(metric).cast(pl.Float64).sum())
+              .collect().item() for d in days]
+    totals = [t for t in totals if t]
+    if not totals:
+        raise ValueError(f"[{symbol}] {metric} is empty over the selected days")
+    return float(np.median(totals)) / bars_per_day
+
+
+def build_symbol(in_root: str, out_root: str, symbol: str, in_gran: str, gran: str,
+                 days: list, todo: set, kind: str, threshold: float):
+    metric = BAR_METRICS[kind]
+    carry, offset, last = None, 0.0, None
+    for ymd in days:
+        out_path = day_path(out_root, symbol, gran, ymd)
+        if ymd not in todo:
+            carry, last = None, None  # 기존 결과 → 다음 날짜는 파일 상태에서 복원
+            continue
+        if last != prev_ymd(ymd):
+            carry, offset = restore_carry(in_root, out_root, symbol, in_gran, gran, ymd, threshold)
+
+        df_day = pl.read_parquet(day_path(in_root, symbol, in_gran, ymd)).sort("open_time")
+        df = pl.concat([carry, df_day], how="vertical_relaxed") if carry is not None and carry.height else df_day
+        bars, carry, carry_offset = build_bars(df, metric, threshold, offset)
+
+        state = {"kind": kind, "metric": metric, "threshold": threshold, "offset": carry_offset,
+                 "carry_from": int(carry["open_time"][0]) if carry.height else None}
+        write_bars(bars, out_path, state)
+        offset, last = carry_offset, ymd
+        print(f"[{symbol}] {ymd} → {len(bars)} bars  (1s rows={df_day.height}, carry={carry.height})  {out_path}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build volume / dollar / tick bars from 1s klines partitions")
+    ap.add_argument("--symbols", type=str, required=True, help="Comma-separated symbols")
+    ap.add_argument("--kind", type=str, default="dollar", choices=sorted(BAR_METRICS),
+                    help="volume: base volume, dollar: quote_volume, tick: num_trades")
+    ap.add_argument("--threshold", type=float, default=0.0, help="Metric per bar (fixed for all symbols)")
+    ap.add_argument("--bars-per-day", type=int, default=0,
+                    help="Per-symbol threshold = median daily metric over the selected days / N")
+    ap.add_argument("--start", type=str, default="", help="YYYY-MM-DD inclusive (optional)")
+    ap.add_argument("--end",   type=str, default="", help="YYYY-MM-DD inclusive (optional)")
+    ap.add_argument("--force", action="store_true", help="Rebuild existing days (and allow a new threshold)")
+    ap.add_argument("--in-root",  type=str, default="data/ohlcv/binance-spot", help="입력 루트")
+    ap.add_argument("--out-root", type=str, default="", help="출력 루트(기본: --in-root)")
+    ap.add_argument("--in-granularity", type=str, default="1s", help="입력 하위 폴더명")
+    ap.add_argument("--granularity", type=str, default="",
+                    help="출력 하위 폴더명(기본: {kind}-{threshold} 또는 {kind}-bpd{N})")
+    args = ap.parse_args(argv)
+
+    if (args.threshold > 0) == (args.bars_per_day > 0):
+        ap.error("give exactly one of --threshold or --bars-per-day")
+    out_root = args.out_root or args.in_root
+    gran = args.granularity or default_granularity(args.kind, args.threshold, args.bars_per_day)
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+
+    for sym in symbols:
+        files = sorted(glob.glob(os.path.join(args.in_root, sym, args.in_granularity, "*.parquet")))
+        days = [ymd_from_fp(fp) for fp in files
+                if (not args.start or ymd_from_fp(fp) >= args.start) and (not args.end or ymd_from_fp(fp) <= args.end)]
+        todo = {d for d in days if args.force or not os.path.exists(day_path(out_root, sym, gran, d))}
+        if not todo:
+            print(f"[{sym}] nothing to build ({len(days)} day(s) exist)")
+            continue
+
+        _load_heavy()
+        out_dir = os.path.join(out_root, sym, gran)
+        spec = read_spec(out_dir)
+        want = {"kind": args.kind, "metric": BAR_METRICS[args.kind], "source": args.in_granularity}
+        if spec is not None and {k: spec.get(k) for k in want} != want and not args.force:
+            print(f"[{sym}] ERROR {out_dir} holds {spec}; use another --granularity or --force", file=sys.stderr)
+            continue
+        if spec is not None and not args.force:
+            threshold = float(spec["threshold"])
+            if args.threshold > 0 and threshold != args.threshold:
+                print(f"[{sym}] ERROR {out_dir} threshold={threshold} != {args.threshold}; use --force",
+                      file=sys.stderr)
+                continue
+        elif args.threshold > 0:
+            threshold = args.threshold
+        else:
+            threshold = auto_threshold(args.in_root, sym, args.in_granularity, days, BAR_METRICS[args.kind],
+                                       args.bars_per_day)
+        if spec is None or args.force:
+            write_spec(out_dir, {**want, "threshold": threshold, "bars_per_day": args.bars_per_day or None})
+        print(f"[{sym}] {args.kind} bars threshold={threshold:g} → {out_dir}  ({len(todo)} day(s) to build)")
+
+        try:
+            build_symbol(args.in_root, out_root, sym, args.in_granularity, gran, days, todo, args.kind, threshold)
+        except KeyboardInterrupt:
+            print("\nInterrupted."); sys.exit(1)
+        except Exception as e:
+            print(f"[{sym}] ERROR: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import os, sys, time, argparse, tempfile, shutil
+from __future__ import annotations
+
+import os, sys, time, json, argparse, tempfile, shutil
 from datetime import datetime, timezone, timedelta, date
 from typing import Dict, Any, List
 
-import requests
-import polars as pl
+# ===== 프로젝트 루트 경로 주입 =====
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from quant_pipeline import telemetry  # noqa: E402
+from quant_pipeline.filelock import FileLock  # noqa: E402
+
+# requests / polars 는 실제로 받을 날짜가 생겼을 때 로드 (전부 skip 인 실행은 빠르게 종료)
+requests = None
+pl = None
+
+def _load_heavy():
+    global requests, pl
+    if pl is not None:
+        return
+    import requests as _requests
+    import polars as _pl
+    requests, pl = _requests, _pl
 
 BINANCE_API = "https://api.binance.com"
 KLINES_PATH = "/api/v3/klines"  # spot
+DAY_ROW_GROUP_ROWS = 8192       # 일자 파일 row group 크기 (1s 기준 하루 ≈ 11개)
+SPILL_PAGES = 20                # 이 페이지 수마다 part 1개 + 체크포인트 1회 (중단 시 최대 이만큼 다시 받음)
 
 # ---------- utils ----------
 
@@ -33,14 +54,16 @@ def atomic_replace(src_path: str, dst_path: str):
         if os.path.exists(src_path):
             os.remove(src_path)
 
-def atomic_write_parquet(df: pl.DataFrame, out_path: str, compression: str = "zstd", level: int = 5):
+def atomic_write_parquet(df: pl.DataFrame, out_path: str, compression: str = "zstd", level: int = 5,
+                         row_group_size: int = None):
     out_dir = os.path.abspath(os.path.dirname(out_path))
     ensure_dir(out_dir)
     tmp = tempfile.NamedTemporaryFile("wb", suffix=".parquet", delete=False, dir=out_dir)
     tmp_path = tmp.name
     tmp.close()
     try:
-        df.write_parquet(tmp_path, compression=compression, compression_level=level)
+        df.write_parquet(tmp_path, compression=compression, compression_level=level,
+                         row_group_size=row_group_size)
         atomic_replace(tmp_path, out_path)
     except Exception:
         if os.path.exists(tmp_path):
@@ -92,31 +115,182 @@ def interval_to_ms(interval: str) -> int:
 
 # ---------- Binance API ----------
 
+KLINES_WEIGHT = 2  # /api/v3/klines request weight
+LEASE_REQUESTS = 10  # 공유 예산에서 한 번에 빌려 오는 요청 수 (상태 파일 갱신 = 요청 10회당 1번)
+DEFAULT_WEIGHT_STATE = os.path.join(tempfile.gettempdir(), "quant-pipeline-binance-weight.json")
+
 class RateLimiter:
-    def __init__(self, target_per_minute: int = 5000, safety_margin: int = 200):
+    """
+    선제적 token-bucket weight 스케줄러.
+    - 요청 전 acquire(weight)로 예산을 먼저 차감 (분당 target-margin, 초당 균등 충전)
+    - 응답 헤더 X-MBX-USED-WEIGHT-1M 로 잔여 토큰을 서버 값에 맞춤
+    - 429/418: Retry-After 를 존중해 전체 공유 pause
+    - state_path 가 있으면 같은 호스트의 여러 프로세스가 파일(잠금)로 예산 공유
+      공유 상태는 lease(요청 lease_requests 회분) 단위로 빌려 와 로컬에서 차감 → 파일 갱신은 lease 마다 1번,
+      헤더 보정은 다음 lease 때 함께 반영 (429/418 pause 만 즉시 공유)
+    """
+    def __init__(self, target_per_minute: int = 5000, safety_margin: int = 200,
+                 state_path: str = None, lease_requests: int = LEASE_REQUESTS):
         self.target = target_per_minute
         self.margin = safety_margin
+        self.capacity = max(1, target_per_minute - safety_margin)
+        self.rate = self.capacity / 60.0  # tokens per second
+        self.state_path = state_path
         self.backoff = 1.0
+        self.lease_weight = max(1, lease_requests) * KLINES_WEIGHT
+        self._lease = 0.0        # 빌려 온 미사용 토큰
+        self._server_cap = None  # (헤더 기준 남은 토큰, 시각): 다음 공유 갱신 때 반영
+        self._local = {"tokens": float(self.capacity), "ts": time.time(), "pause_until": 0.0}
+
+    # --- shared state ---
+    def _load(self) -> Dict[str, float]:
+        if not self.state_path:
+            return dict(self._local)
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                st = json.load(f)
+            return {"tokens": float(st["tokens"]), "ts": float(st["ts"]),
+                    "pause_until": float(st.get("pause_until", 0.0))}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {"tokens": float(self.capacity), "ts": time.time(), "pause_until": 0.0}
+    def _save(self, st: Dict[str, float]):
+        if not self.state_path:
+            self._local = st
+            return
+        tmp = self.state_path + f".{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(st, f)
+        os.replace(tmp, self.state_path)
+    def _update(self, fn):
+        """잠금 하에서 상태를 읽고(충전 반영) fn(st, now)로 갱신 후 저장. fn의 반환값 전달"""
+        if self.state_path:
+            ensure_dir(os.path.dirname(os.path.abspath(self.state_path)))
+            with FileLock(self.state_path + ".lock"):
+                return self._update_locked(fn)
+        return self._update_locked(fn)
+    def _update_locked(self, fn):
+        st = self._load()
+        now = time.time()
+        st["tokens"] = min(float(self.capacity), st["tokens"] + max(0.0, now - st["ts"]) * self.rate)
+        st["ts"] = now
+        if self._server_cap is not None:
+            # 내려서만 맞춤: 서버 값은 응답 시점 기준이라 다른 프로세스가 이미 차감한(진행 중) 요청을 모름
+            cap, t = self._server_cap
+            st["tokens"] = min(st["tokens"], cap + max(0.0, now - t) * self.rate)
+            self._server_cap = None
+        res = fn(st, now)
+        self._save(st)
+        return res
+
+    # --- API ---
+    def acquire(self, weight: int = KLINES_WEIGHT):
+        """weight 만큼 예산 확보될 때까지 대기 후 차감 (빌려 온 lease 가 있으면 공유 상태를 건드리지 않음)"""
+        if self._lease >= weight:
+            self._lease -= weight
+            telemetry.get().inc("weight_reserved_total", weight)
+            return
+        def take(st, now):
+            if st["pause_until"] > now:
+                return st["pause_until"] - now
+            if st["tokens"] >= weight:
+                grab = max(float(weight), min(st["tokens"], float(self.lease_weight)))
+                st["tokens"] -= grab
+                self._lease = grab - weight
+                return 0.0
+            return (weight - st["tokens"]) / self.rate
+        while True:
+            wait = self._update(take)
+            if wait <= 0:
+                telemetry.get().inc("weight_reserved_total", weight)
+                return
+            wait = min(wait, 60.0)
+            telemetry.get().inc("rate_limit_wait_seconds_total", wait)
+            time.sleep(wait)
     def handle_headers(self, headers: Dict[str, str]):
+        """서버가 보고한 분당 사용 weight로 잔여 토큰 보정"""
         key = next((k for k in headers.keys() if k.lower() == "x-mbx-used-weight-1m"), None)
         if not key: return
         try:
             used = int(headers[key])
-            if used >= (self.target - self.margin):
-                time.sleep(1.5)
-        except: pass
-    def on_429(self):
-        time.sleep(self.backoff)
+        except (TypeError, ValueError):
+            return
+        telemetry.get().set("weight_used_1m", used)
+        left = float(self.capacity - used)
+        self._lease = max(0.0, min(self._lease, left))
+        if self._server_cap is None or left < self._server_cap[0]:
+            self._server_cap = (left, time.time())
+    def on_429(self, headers: Dict[str, str] = None):
+        """429/418: Retry-After 우선, 없으면 지수 백오프. pause는 공유"""
+        retry_after = None
+        if headers:
+            key = next((k for k in headers.keys() if k.lower() == "retry-after"), None)
+            if key:
+                try:
+                    retry_after = float(headers[key])
+                except (TypeError, ValueError):
+                    retry_after = None
+        delay = retry_after if retry_after is not None else self.backoff
+        tm = telemetry.get()
+        tm.inc("rate_limit_pauses_total", retry_after=("yes" if retry_after is not None else "no"))
+        tm.inc("rate_limit_pause_seconds_total", delay)
+        if retry_after is None:
+            self.backoff = min(self.backoff * 2, 30.0)
+        def pause(st, now):
+            st["pause_until"] = max(st["pause_until"], now + delay)
+            st["tokens"] = min(st["tokens"], 0.0)
+        self._lease = 0.0
+        self._update(pause)
+        time.sleep(delay)
+    def on_error(self):
+        """네트워크/전송 오류: 이 프로세스만 지수 백오프 (공유 pause 없음 → 다른 프로세스는 계속 진행)"""
+        delay = self.backoff
         self.backoff = min(self.backoff * 2, 30.0)
+        time.sleep(delay)
     def reset(self):
         self.backoff = 1.0
 
-def fetch_klines(sess: requests.Session, symbol: str, interval: str,
-                 start_ms: int, end_ms: int, limit: int, rl: RateLimiter) -> List[List[Any]]:
-    url = BINANCE_API + KLINES_PATH
-    all_rows: List[List[Any]] = []
+def klines_request(sess: requests.Session, url: str, params: dict, rl: RateLimiter, symbol: str) -> list:
+    """klines 요청 1회(재시도 / weight 예산 / 429·418 처리 포함) → rows"""
+    tm = telemetry.get()
+    for attempt in range(8):
+        if attempt:
+            tm.inc("klines_retries_total", symbol=symbol)
+        try:
+            rl.acquire(KLINES_WEIGHT)
+            t0 = time.perf_counter()
+            r = sess.get(url, params=params, timeout=20)
+            tm.observe("klines_request_seconds", time.perf_counter() - t0)
+            tm.inc("klines_requests_total", symbol=symbol, status=r.status_code)
+            if r.status_code == 200:
+                rl.handle_headers(r.headers); rl.reset()
+                return r.json()
+            elif r.status_code in (418, 429):
+                if r.status_code == 418:
+                    print(f"[{symbol}] WARNING: HTTP 418 (IP ban) Retry-After={r.headers.get('Retry-After')}", file=sys.stderr)
+                rl.on_429(r.headers)
+            elif r.status_code in (400, 404):
+                # 잘못된 심볼/파라미터: 재시도해도 같은 결과
+                raise RuntimeError(f"klines HTTP {r.status_code}: {symbol} {r.text[:200]}")
+            elif 400 <= r.status_code < 500:
+                # 403(WAF) 등 일시적일 수 있는 4xx → 이 프로세스만 백오프 후 재시도
+                print(f"[{symbol}] WARNING: HTTP {r.status_code} → backoff and retry", file=sys.stderr)
+                rl.on_error()
+            else:
+                time.sleep(0.8)
+        except requests.RequestException as e:
+            tm.inc("klines_requests_total", symbol=symbol, status="error")
+            tm.event("klines_error", symbol=symbol, start_ms=params.get("startTime"), error=str(e))
+            rl.on_error()
+    raise RuntimeError(f"klines request failed repeatedly: {symbol} {params.get('interval')} "
+                       f"{params.get('startTime')}-{params.get('endTime')}")
+
+def iter_klines(sess: requests.Session, symbol: str, interval: str,
+                start_ms: int, end_ms: int, limit: int, rl: RateLimiter,
+                api_base: str = BINANCE_API):
+    """페이지 단위 generator: 받은 klines 페이지(rows)를 하나씩 yield (메모리 = 1 페이지)"""
+    url = api_base.rstrip("/") + KLINES_PATH
     cur = start_ms
-    step_ms = interval_to_ms(interval) * limit
+    tm = telemetry.get()
 
     while cur <= end_ms:
         params = {
@@ -126,28 +300,21 @@ def fetch_klines(sess: requests.Session, symbol: str, interval: str,
             "endTime": end_ms,
             "limit": limit,
         }
-        for _ in range(8):
-            try:
-                r = sess.get(url, params=params, timeout=20)
-                if r.status_code == 200:
-                    rl.handle_headers(r.headers); rl.reset()
-                    rows = r.json()
-                    if not rows:
-                        cur = min(cur + step_ms, end_ms + 1)
-                        break
-                    all_rows.extend(rows)
-                    last_close = int(rows[-1][6])
-                    cur = max(last_close + 1, cur + 1)
-                    break
-                elif r.status_code in (418, 429):
-                    rl.on_429()
-                else:
-                    time.sleep(0.8)
-            except requests.RequestException:
-                rl.on_429()
-        else:
-            raise RuntimeError(f"klines request failed repeatedly: {symbol} {interval} {cur}-{end_ms}")
+        rows = klines_request(sess, url, params, rl, symbol)
+        if not rows:
+            # [cur, end_ms] 안의 가장 이른 kline 부터 돌려주므로 빈 페이지 = 남은 구간 전체가 비어 있음
+            break
+        last_close = int(rows[-1][6])
+        cur = max(last_close + 1, cur + 1)
+        tm.inc("klines_rows_total", len(rows), symbol=symbol)
+        yield rows
 
+def fetch_klines(sess: requests.Session, symbol: str, interval: str,
+                 start_ms: int, end_ms: int, limit: int, rl: RateLimiter,
+                 api_base: str = BINANCE_API) -> List[List[Any]]:
+    all_rows: List[List[Any]] = []
+    for rows in iter_klines(sess, symbol, interval, start_ms, end_ms, limit, rl, api_base=api_base):
+        all_rows.extend(rows)
     return all_rows
 
 def rows_to_df(symbol: str, rows: List[List[Any]]) -> pl.DataFrame:
@@ -176,50 +343,238 @@ def rows_to_df(symbol: str, rows: List[List[Any]]) -> pl.DataFrame:
         pl.lit(symbol).alias("symbol"),
     ])
 
-# ---------- per-day ingest (no checkpoints) ----------
+# ---------- symbol metadata (first available kline) ----------
+
+SYMBOL_META_FILE = "_symbols_meta.json"  # out_root 바로 아래 (심볼 폴더와 겹치지 않게 파일)
+
+def read_symbol_meta(out_root: str) -> dict:
+    """{SYMBOL: {interval: 첫 kline open_time(ms)}}"""
+    p = os.path.join(out_root, SYMBOL_META_FILE)
+    if not os.path.exists(p):
+        return {}
+    try:
+        with open(p, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_symbol_meta(out_root: str, meta: dict):
+    ensure_dir(out_root)
+    p = os.path.join(out_root, SYMBOL_META_FILE)
+    tmp = f"{p}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2, sort_keys=True)
+    atomic_replace(tmp, p)
+
+def first_kline_ms(sess: requests.Session, symbol: str, interval: str, rl: RateLimiter,
+                   api_base: str = BINANCE_API):
+    """startTime=0, limit=1 → 거래소가 가진 가장 이른 kline 의 open_time (없으면 None). 요청 1회"""
+    url = api_base.rstrip("/") + KLINES_PATH
+    rows = klines_request(sess, url, {"symbol": symbol, "interval": interval, "startTime": 0, "limit": 1},
+                          rl, symbol)
+    telemetry.get().inc("listing_probes_total", symbol=symbol)
+    return int(rows[0][0]) if rows else None
+
+def first_available_day(out_root: str, sess: requests.Session, symbol: str, interval: str,
+                        rl: RateLimiter, api_base: str = BINANCE_API):
+    """
+    심볼의 첫 kline 날짜(UTC). 캐시({out_root}/_symbols_meta.json)에 없으면 1회 조회 후 기록
+    kline 이 아직 없으면 None (캐시하지 않음 → 다음 실행에서 다시 확인)
+    """
+    meta = read_symbol_meta(out_root)
+    ms = meta.get(symbol, {}).get(interval)
+    if ms is None:
+        ms = first_kline_ms(sess, symbol, interval, rl, api_base=api_base)
+        if ms is None:
+            return None
+        meta = read_symbol_meta(out_root)  # 다른 프로세스가 그사이 쓴 항목 유지
+        meta.setdefault(symbol, {})[interval] = int(ms)
+        write_symbol_meta(out_root, meta)
+    return ms_to_utc(int(ms)).date()
+
+# ---------- per-day ingest (page spill + checkpoint) ----------
+
+def day_out_path(out_root: str, symbol: str, granularity: str, d: date) -> str:
+    # out_root/SYMBOL/GRAN/YYYY-MM-DD.parquet
+    return os.path.join(out_root, symbol, granularity, f"{d.strftime('%Y-%m-%d')}.parquet")
+
+def spill_dir_for(out_path: str) -> str:
+    # out_root/SYMBOL/GRAN/.YYYY-MM-DD.partial/ (part-NNNNN.parquet + checkpoint.json)
+    d, fn = os.path.split(out_path)
+    return os.path.join(d, "." + fn.replace(".parquet", "") + ".partial")
+
+def remove_stale_spill(out_path: str):
+    """일자 파일이 이미 있으면 남은 spill 폴더는 쓸모없음(병합 후 정리 전에 중단된 경우) → 삭제"""
+    spill = spill_dir_for(out_path)
+    if os.path.isdir(spill):
+        shutil.rmtree(spill, ignore_errors=True)
+
+def read_checkpoint(spill_dir: str, interval: str, s_ms: int, e_ms: int):
+    """유효한 체크포인트 반환(없거나 다른 설정이면 None)"""
+    try:
+        with open(os.path.join(spill_dir, "checkpoint.json"), "r", encoding="utf-8") as f:
+            ck = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if ck.get("interval") != interval or ck.get("start_ms") != s_ms or ck.get("end_ms") != e_ms:
+        return None
+    return ck
+
+def write_checkpoint(spill_dir: str, ck: Dict[str, Any]):
+    tmp = os.path.join(spill_dir, "checkpoint.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ck, f)
+    atomic_replace(tmp, os.path.join(spill_dir, "checkpoint.json"))
+
+def merge_spill_parts(spill_dir: str, n_parts: int, out_path: str, s_ms: int, e_ms: int) -> int:
+    """
+    part-00000.. 을 순서대로 하나씩 읽어 일자 parquet 로 스트리밍 병합 (메모리 = row group 1개 + part 1개)
+    part 는 next_ms 순서로 기록되어 시간순·비중복 → 직전에 쓴 open_time 이하 행만 제거하면 됨
+    반환: 기록한 행 수
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    out_dir = os.path.abspath(os.path.dirname(out_path))
+    ensure_dir(out_dir)
+    tmp = tempfile.NamedTemporaryFile("wb", suffix=".parquet", delete=False, dir=out_dir)
+    tmp_path = tmp.name
+    tmp.close()
+    writer, buf, buf_rows, total, last_ot = None, [], 0, 0, None
+    try:
+        def flush(min_rows: int):
+            nonlocal buf, buf_rows
+            while buf_rows >= min_rows and buf_rows > 0:
+                tbl = pa.concat_tables(buf)
+                n = min(DAY_ROW_GROUP_ROWS, tbl.num_rows)
+                writer.write_table(tbl.slice(0, n), row_group_size=n)
+                rest = tbl.slice(n)
+                buf, buf_rows = ([rest] if rest.num_rows else []), rest.num_rows
+        for i in range(n_parts):
+            df = pl.read_parquet(os.path.join(spill_dir, f"part-{i:05d}.parquet"))
+            df = df.filter((pl.col("open_time") >= s_ms) & (pl.col("close_time") <= e_ms))
+            if last_ot is not None:
+                df = df.filter(pl.col("open_time") > last_ot)
+            df = df.unique(subset=["open_time"], keep="last").sort("open_time")
+            tbl = df.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, tbl.schema, compression="zstd", compression_level=5)
+            if df.height == 0:
+                continue
+            last_ot = int(df["open_time"][-1])
+            buf.append(tbl)
+            buf_rows += tbl.num_rows
+            total += tbl.num_rows
+            flush(DAY_ROW_GROUP_ROWS)
+        if writer is None:
+            writer = pq.ParquetWriter(tmp_path, rows_to_df("", []).to_arrow().schema,
+                                      compression="zstd", compression_level=5)
+        flush(1)
+        writer.close()
+        writer = None
+        atomic_replace(tmp_path, out_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return total
 
 def ingest_one_day(symbol: str, interval: str, d: date, out_root: str,
                    limit: int, target_weight_per_minute: int, force: bool,
-                   granularity: str):
-    # out_root/SYMBOL/GRAN/YYYY-MM-DD.parquet
-    out_dir = os.path.join(out_root, symbol, granularity); ensure_dir(out_dir)
-    out_path = os.path.join(out_dir, f"{d.strftime('%Y-%m-%d')}.parquet")
+                   granularity: str, rl: RateLimiter = None, sess: requests.Session = None,
+                   api_base: str = BINANCE_API):
+    out_path = day_out_path(out_root, symbol, granularity, d)
     if os.path.exists(out_path) and not force:
+        remove_stale_spill(out_path)
         print(f"[{symbol}] {d} exists → skip"); return
+    ensure_dir(os.path.dirname(out_path))
+    _load_heavy()
 
     day_start = start_of_day_utc(d); day_end = end_of_day_utc(d)
     s_ms, e_ms = utc_to_ms(day_start), utc_to_ms(day_end)
 
-    print(f"[{symbol}] fetching {interval} for {d} (UTC {day_start} ~ {day_end})")
-    rl = RateLimiter(target_per_minute=target_weight_per_minute, safety_margin=200)
-    sess = requests.Session()
-
-    rows = fetch_klines(sess, symbol, interval, s_ms, e_ms, limit, rl)
-    if not rows:
+    if rl is None:
+        rl = RateLimiter(target_per_minute=target_weight_per_minute, safety_margin=200)
+    if sess is None:
+        sess = requests.Session()
+
+    tm = telemetry.get()
+    t_day = time.perf_counter()
+
+    # 1) 체크포인트가 있으면 이어받기, 아니면 새 spill 폴더
+    spill = spill_dir_for(out_path)
+    if force and os.path.exists(spill):
+        shutil.rmtree(spill, ignore_errors=True)  # --force: 남은 체크포인트도 무시하고 처음부터
+    ck = read_checkpoint(spill, interval, s_ms, e_ms)
+    if ck is None:
+        if os.path.exists(spill):
+            shutil.rmtree(spill, ignore_errors=True)
+        ensure_dir(spill)
+        ck = {"interval": interval, "start_ms": s_ms, "end_ms": e_ms,
+              "next_ms": s_ms, "parts": 0, "rows": 0}
+        write_checkpoint(spill, ck)
+        print(f"[{symbol}] fetching {interval} for {d} (UTC {day_start} ~ {day_end})")
+    else:
+        print(f"[{symbol}] resuming {interval} for {d} from {ms_to_utc(ck['next_ms'])} "
+              f"(parts={ck['parts']}, rows={ck['rows']})")
+        tm.inc("fetch_resumes_total", symbol=symbol)
+
+    # 2) SPILL_PAGES 페이지마다 spill chunk 저장 → 체크포인트 갱신 (chunk가 먼저 원자적으로 기록됨)
+    pending, next_ms = [], ck["next_ms"]
+    def spill_pending():
+        if not pending:
+            return
+        part_path = os.path.join(spill, f"part-{ck['parts']:05d}.parquet")
+        atomic_write_parquet(rows_to_df(symbol, [r for rows in pending for r in rows]), part_path,
+                             compression="zstd", level=1)
+        ck["parts"] += 1
+        ck["rows"] += sum(len(rows) for rows in pending)
+        ck["next_ms"] = next_ms
+        write_checkpoint(spill, ck)
+        pending.clear()
+    for rows in iter_klines(sess, symbol, interval, ck["next_ms"], e_ms, limit, rl, api_base=api_base):
+        pending.append(rows)
+        next_ms = max(int(rows[-1][6]) + 1, next_ms + 1)
+        if len(pending) >= SPILL_PAGES:
+            spill_pending()
+    spill_pending()
+
+    if ck["parts"] == 0:
+        shutil.rmtree(spill, ignore_errors=True)
+        tm.inc("fetch_days_total", symbol=symbol, result="empty")
+        tm.event("fetch_day", symbol=symbol, date=d.isoformat(), rows=0,
+                 seconds=round(time.perf_counter() - t_day, 3))
         print(f"[{symbol}] WARNING: no rows for {d}"); return
 
-    df = rows_to_df(symbol, rows)
-    df = df.filter((pl.col("open_time") >= s_ms) & (pl.col("close_time") <= e_ms))
-    df = df.unique(subset=["open_time"], keep="last").sort("open_time")
+    # 3) chunk 스트리밍 병합 → 일자 parquet (원자적 교체) 후 spill 정리
+    #    작은 row group → 다음 날짜 워밍업 시 꼬리만 읽을 수 있음
+    got = merge_spill_parts(spill, ck["parts"], out_path, s_ms, e_ms)
 
     # (info) 기대 개수 안내
     try:
         iv_ms = interval_to_ms(interval)
         expected = int(((e_ms - s_ms + 1) // iv_ms))
-        got = df.height
         if expected and got != expected:
             print(f"[{symbol}] NOTE: {d} expected≈{expected}, got={got}")
     except Exception:
         pass
 
-    atomic_write_parquet(df, out_path, compression="zstd", level=5)
-    print(f"[{symbol}] saved {out_path}  rows={df.height}")
+    shutil.rmtree(spill, ignore_errors=True)
+    print(f"[{symbol}] saved {out_path}  rows={got}")
+
+    secs = time.perf_counter() - t_day
+    nbytes = os.path.getsize(out_path)
+    tm.inc("fetch_days_total", symbol=symbol, result="saved")
+    tm.inc("bytes_written_total", nbytes)
+    tm.observe("fetch_day_seconds", secs)
+    tm.event("fetch_day", symbol=symbol, date=d.isoformat(), rows=got, parts=ck["parts"],
+             seconds=round(secs, 3), bytes=nbytes)
 
 # ---------- CLI ----------
 
-def main():
+def main(argv=None):
     ap = argparse.ArgumentParser(
-        description="Per-day Binance Spot klines (no checkpoints). End date is capped to yesterday(UTC) unless --allow-today. You can also fix the reference time via --now."
+        description="Per-day Binance Spot klines (page spill + resumable checkpoints). End date is capped to yesterday(UTC) unless --allow-today. You can also fix the reference time via --now."
     )
     ap.add_argument("--symbols", type=str, required=True, help="Comma-separated symbols, e.g., BTCUSDT,ETHUSDT")
     ap.add_argument("--interval", type=str, default="1s", help="e.g., 1s,5s,10s,30s,1m,5m,1h")
@@ -229,10 +584,16 @@ def main():
     ap.add_argument("--granularity", type=str, default="1s", help="Subfolder under each symbol (e.g., 1s)")
     ap.add_argument("--limit", type=int, default=1000, help="klines page size (<=1000)")
     ap.add_argument("--weight", type=int, default=5000, help="Target used-weight per minute")
+    ap.add_argument("--api-base", type=str, default=BINANCE_API,
+                    help="REST base URL (e.g., a local mock server for benchmarks)")
+    ap.add_argument("--weight-state", type=str, default=DEFAULT_WEIGHT_STATE,
+                    help="Weight budget file shared by fetcher processes on this host. Empty: per-process budget")
     ap.add_argument("--force", action="store_true", help="Overwrite even if the daily file exists")
     ap.add_argument("--allow-today", action="store_true", help="Do NOT cap end date to yesterday(UTC)")
     ap.add_argument("--now", type=str, default=None, help="Reference UTC time (ISO). e.g., 2024-10-04T12:00:00Z")
-    args = ap.parse_args()
+    ap.add_argument("--metrics-jsonl", type=str, default=None, help="Append structured JSON-lines events to this file")
+    ap.add_argument("--metrics-prom", type=str, default=None, help="Write Prometheus textfile metrics to this path")
+    args = ap.parse_args(argv)
 
     # 기준 시각(now_utc)
     if args.now:
@@ -274,25 +635,70 @@ def main():
     symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
     gran = args.granularity.strip()
 
-    cur = start_d
-    while cur <= end_d:
-        for sym in symbols:
-            try:
-                ingest_one_day(
-                    symbol=sym,
-                    interval=args.interval,
-                    d=cur,
-                    out_root=args.out,
-                    limit=args.limit,
-                    target_weight_per_minute=args.weight,
-                    force=args.force,
-                    granularity=gran
-                )
-            except KeyboardInterrupt:
-                print("\nInterrupted."); sys.exit(1)
-            except Exception as e:
-                print(f"[{sym}] ERROR {cur}: {e}", file=sys.stderr)
-        cur += timedelta(days=1)
+    # 프로세스 전체(및 같은 호스트의 다른 fetcher)에서 하나의 weight 예산 공유
+    rl = RateLimiter(target_per_minute=args.weight, safety_margin=200,
+                     state_path=(args.weight_state or None))
+    sess = None  # 첫 실제 수집 시 생성
+
+    tm = telemetry.configure(jsonl_path=args.metrics_jsonl, prom_path=args.metrics_prom, stage="fetch")
+    tm.event("run_start", symbols=symbols, interval=args.interval,
+             start=start_d.isoformat(), end=end_d.isoformat())
+    first_days = {}  # 심볼 → 첫 kline 날짜 (None: 아직 데이터 없음). 받을 날짜가 생긴 심볼만 조회
+    try:
+        cur = start_d
+        while cur <= end_d:
+            for sym in symbols:
+                if not args.force and os.path.exists(day_out_path(args.out, sym, gran, cur)):
+                    remove_stale_spill(day_out_path(args.out, sym, gran, cur))
+                    print(f"[{sym}] {cur} exists → skip")
+                    tm.inc("fetch_days_total", symbol=sym, result="skipped")
+                    continue
+                if sess is None:
+                    _load_heavy()
+                    sess = requests.Session()
+                if sym not in first_days:
+                    try:
+                        first_days[sym] = first_available_day(args.out, sess, sym, args.interval, rl,
+                                                              api_base=args.api_base)
+                    except Exception as e:
+                        # 결과는 _symbols_meta.json 에 기록하지 않음 → 다음 실행에서 다시 조회
+                        print(f"[{sym}] WARNING: first {args.interval} kline lookup failed ({e}) "
+                              f"→ not clamping {sym} this run", file=sys.stderr)
+                        tm.inc("listing_probe_failures_total", symbol=sym)
+                        tm.event("listing_probe_failed", symbol=sym, interval=args.interval, error=str(e))
+                        first_days[sym] = start_d
+                    fd = first_days[sym]
+                    if fd is None:
+                        print(f"[{sym}] no {args.interval} klines on the exchange yet → skip symbol")
+                    elif fd > cur:
+                        print(f"[{sym}] first {args.interval} kline on {fd} → skip days before it")
+                fd = first_days[sym]
+                if fd is None or cur < fd:
+                    tm.inc("fetch_days_total", symbol=sym, result="pre_listing")
+                    continue
+                try:
+                    ingest_one_day(
+                        symbol=sym,
+                        interval=args.interval,
+                        d=cur,
+                        out_root=args.out,
+                        limit=args.limit,
+                        target_weight_per_minute=args.weight,
+                        force=args.force,
+                        granularity=gran,
+                        rl=rl,
+                        sess=sess,
+                        api_base=args.api_base
+                    )
+                except KeyboardInterrupt:
+                    print("\nInterrupted."); sys.exit(1)
+                except Exception as e:
+                    print(f"[{sym}] ERROR {cur}: {e}", file=sys.stderr)
+                    tm.inc("fetch_days_total", symbol=sym, result="error")
+                    tm.event("fetch_error", symbol=sym, date=cur.isoformat(), error=str(e))
+            cur += timedelta(days=1)
+    finally:
+        tm.close()
 
 if __name__ == "__main__":
     main()
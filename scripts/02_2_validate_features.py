@@ -1,8 +1,15 @@
 # scripts/02_2_validate_features.py
-import os, sys, json
+import os, sys, json, time, argparse
 import pandas as pd
 import numpy as np
 
+# ===== 프로젝트 루트 경로 주입 =====
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from quant_pipeline import telemetry  # noqa: E402
+
 def load_df(path: str) -> pd.DataFrame:
     try:
         return pd.read_parquet(path)
@@ -10,6 +17,7 @@ def load_df(path: str) -> pd.DataFrame:
         return pd.read_parquet(path, engine="pyarrow")
 
 def check_file(path: str, first_n: int = 200):
+    t0 = time.perf_counter()
     df = load_df(path)
     rep = {}
     rep["path"] = path
@@ -53,6 +61,31 @@ def check_file(path: str, first_n: int = 200):
 
     print(json.dumps(rep, ensure_ascii=False, indent=2))
 
+    tm = telemetry.get()
+    if tm.enabled:
+        secs = time.perf_counter() - t0
+        tm.inc("validate_files_total")
+        tm.inc("validate_rows_total", int(df.shape[0]))
+        tm.observe("validate_file_seconds", secs)
+        tm.event("validate_file", path=path, rows=int(df.shape[0]), cols=int(df.shape[1]),
+                 open_time_1s_rate=rep["open_time_1s_rate"], all_null_cols=len(rep["all_null_cols"]),
+                 max_null_rate=float(null_rate_all.iloc[0]) if len(null_rate_all) else 0.0,
+                 seconds=round(secs, 3))
+    return rep
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Feature parquet sanity report (shape, open_time spacing, null rates)")
+    ap.add_argument("paths", nargs="*", help="feature parquet files (none: nothing to do)")
+    ap.add_argument("--metrics-jsonl", type=str, default=None, help="Append structured JSON-lines events to this file")
+    ap.add_argument("--metrics-prom", type=str, default=None, help="Write Prometheus textfile metrics to this path")
+    args = ap.parse_args(argv)
+
+    tm = telemetry.configure(jsonl_path=args.metrics_jsonl, prom_path=args.metrics_prom, stage="validate")
+    try:
+        for p in args.paths:
+            check_file(p)
+    finally:
+        tm.close()
+
 if __name__ == "__main__":
-    for p in sys.argv[1:]:
-        check_file(p)
+    main()
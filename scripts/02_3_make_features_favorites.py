@@ -19,10 +19,16 @@
   python scripts/02_3_make_features_favorites.py --force --warmup 2000
 """
 
+import os
 import sys
 import argparse
-import subprocess
-from pathlib import Path
+
+# ===== 프로젝트 루트 경로 주입 =====
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from quant_pipeline.cli import run_script  # noqa: E402
 
 # 1) 즐겨찾기 (SUI 제외)
 FAVORITES = [
@@ -42,14 +48,13 @@ GRANULARITY = "1s"  # 하위 폴더명
 IN_ROOT  = "data/ohlcv/binance-spot"
 OUT_ROOT = "data/features_all/binance-spot"
 
-# 5) 호출 스크립트 경로
-THIS_DIR = Path(__file__).parent
-MAKE_FEATS = THIS_DIR / "02_make_features_all.py"
+# 5) 호출 스크립트 (같은 프로세스에서 main(argv) 호출)
+MAKE_FEATS = "02_make_features_all.py"
 
 
-def build_cmd(with_custom: bool, force_overwrite: bool, warmup_rows: int|None):
+def build_cmd(with_custom: bool, force_overwrite: bool, warmup_rows: int|None,
+              recompute: bool = False, batch: bool = False):
     cmd = [
-        sys.executable, str(MAKE_FEATS),
         "--symbols", SYMBOLS,
         "--start", START_DATE,
         "--end", END_DATE,
@@ -63,33 +68,47 @@ def build_cmd(with_custom: bool, force_overwrite: bool, warmup_rows: int|None):
         cmd.remove("--with-custom")
     if force_overwrite:
         cmd.append("--force")
+    if recompute:
+        cmd.append("--recompute")
+    if batch:
+        cmd.append("--batch")
     if isinstance(warmup_rows, int) and warmup_rows >= 0:
         cmd += ["--warmup", str(warmup_rows)]
     return cmd
 
 
-def main():
+def main(argv=None):
     ap = argparse.ArgumentParser(description="Make features for favorite symbols over a fixed date range.")
     ap.add_argument("--no-custom", action="store_true", help="커스텀 피처 제외(기본은 포함).")
     ap.add_argument("--force", action="store_true", help="기존 결과 덮어쓰기.")
+    ap.add_argument("--recompute", action="store_true", help="스펙 diff 기반 증분 재계산(추가/변경 지표만).")
     ap.add_argument("--warmup", type=int, default=None, help="워밍업 행 수(미지정 시 자동).")
-    args = ap.parse_args()
+    ap.add_argument("--batch", action="store_true", help="날짜별로 전 심볼을 2-D 로 묶어 계산.")
+    ap.add_argument("--custom-features", type=str, default="", help="커스텀 피처 이름(콤마 구분). 미지정 시 기본 세트.")
+    ap.add_argument("--metrics-jsonl", type=str, default=None, help="구조화 이벤트(JSON-lines) 출력 파일.")
+    ap.add_argument("--metrics-prom", type=str, default=None, help="Prometheus textfile 출력 경로.")
+    args = ap.parse_args(argv)
 
     with_custom = (not args.no_custom)
     force_overwrite = args.force
     warmup_rows = args.warmup
 
-    cmd = build_cmd(with_custom, force_overwrite, warmup_rows)
+    cmd = build_cmd(with_custom, force_overwrite, warmup_rows, recompute=args.recompute, batch=args.batch)
+    if args.custom_features and with_custom:
+        cmd += ["--custom-features", args.custom_features]
+    if args.metrics_jsonl:
+        cmd += ["--metrics-jsonl", args.metrics_jsonl]
+    if args.metrics_prom:
+        cmd += ["--metrics-prom", args.metrics_prom]
 
-    print("[features-favorites] Running:\n ", " ".join(cmd))
+    print("[features-favorites] Running:\n ", MAKE_FEATS, " ".join(cmd))
     print(f"[features-favorites] symbols={SYMBOLS}")
     print(f"[features-favorites] range={START_DATE}..{END_DATE} (UTC, inclusive)")
     print(f"[features-favorites] in_root={IN_ROOT}  out_root={OUT_ROOT}  granularity={GRANULARITY}")
-    print(f"[features-favorites] with_custom={with_custom}  force={force_overwrite}  warmup={warmup_rows}")
+    print(f"[features-favorites] with_custom={with_custom}  force={force_overwrite}  warmup={warmup_rows}  recompute={args.recompute}")
 
-    rc = subprocess.run(cmd).returncode
-    sys.exit(rc)
+    return run_script(MAKE_FEATS, cmd)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
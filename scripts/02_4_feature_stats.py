@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+피처 통계 저장소 조회 / 백필 / compaction (features/stats_store.py)
+
+- 조회: 심볼/날짜 범위의 컬럼별 count, null_rate, mean, std, min, max, 분위수
+        (피처 파일은 읽지 않음 — 일자 요약만 병합)
+- --backfill: 통계가 없는 기존 피처 파일에서 일자 요약 생성 (1회성)
+- --compact: 일자 요약 파일을 심볼별 파일 하나로 병합
+
+사용 예)
+  python scripts/02_4_feature_stats.py --symbols BTCUSDT,ETHUSDT --start 2023-10-01 --end 2025-09-30 ^
+    --columns RSI_14,LOGRET_1 --csv data/norm_stats.csv
+  python scripts/02_4_feature_stats.py --symbols BTCUSDT --backfill
+"""
+
+import os
+import sys
+import glob
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import polars as pl  # noqa: E402
+
+from features.stats_store import (  # noqa: E402
+    day_path, write_day_stats, compact_stats, compact_path, query_stats, load_stats,
+)
+
+
+def backfill(features_root: str, stats_root: str, symbol: str, gran: str, start: str, end: str) -> int:
+    """통계가 없는 날짜만 피처 파일에서 요약 생성. 반환: 생성한 일자 수"""
+    pattern = os.path.join(features_root, symbol, gran, "*.parquet") if gran else os.path.join(features_root, symbol, "*.parquet")
+    files = sorted(glob.glob(pattern))
+    have = set()
+    if os.path.exists(compact_path(stats_root, symbol, gran)):
+        have = set(pl.read_parquet(compact_path(stats_root, symbol, gran), columns=["date"])["date"].unique().to_list())
+    n = 0
+    for fp in files:
+        ymd = os.path.basename(fp).replace(".parquet", "")
+        if (start and ymd < start) or (end and ymd > end):
+            continue
+        if ymd in have or os.path.exists(day_path(stats_root, symbol, gran, ymd)):
+            continue
+        write_day_stats(stats_root, symbol, gran, ymd, pl.read_parquet(fp))
+        print(f"[{symbol}] {ymd} stats backfilled")
+        n += 1
+    return n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Query / backfill / compact the per-day feature statistics store")
+    ap.add_argument("--symbols", type=str, required=True, help="Comma-separated symbols")
+    ap.add_argument("--start", type=str, default="", help="YYYY-MM-DD inclusive (optional)")
+    ap.add_argument("--end",   type=str, default="", help="YYYY-MM-DD inclusive (optional)")
+    ap.add_argument("--columns", type=str, default="", help="Comma-separated feature columns (empty: all)")
+    ap.add_argument("--quantiles", type=str, default="0.01,0.05,0.25,0.5,0.75,0.95,0.99",
+                    help="Comma-separated quantile levels (empty: none)")
+    ap.add_argument("--per-symbol", action="store_true", help="Combine each symbol separately")
+    ap.add_argument("--daily", action="store_true", help="Print per-day rows (drift view) instead of combining")
+    ap.add_argument("--csv", type=str, default="", help="Write the result to this CSV instead of printing")
+    ap.add_argument("--backfill", action="store_true", help="Build missing day stats from existing feature files")
+    ap.add_argument("--compact", action="store_true", help="Merge day stats files into one file per symbol")
+    ap.add_argument("--stats-root", type=str, default="data/features_stats/binance-spot", help="통계 루트")
+    ap.add_argument("--features-root", type=str, default="data/features_all/binance-spot", help="피처 루트(--backfill)")
+    ap.add_argument("--granularity", type=str, default="1s", help="하위 폴더명(예: 1s). 빈 문자열이면 생략")
+    args = ap.parse_args(argv)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    gran = (args.granularity or "").strip()
+
+    if args.backfill:
+        for sym in symbols:
+            n = backfill(args.features_root, args.stats_root, sym, gran, args.start, args.end)
+            print(f"[{sym}] backfilled {n} day(s)")
+    if args.backfill or args.compact:
+        for sym in symbols:
+            n = compact_stats(args.stats_root, sym, gran)
+            if n:
+                print(f"[{sym}] stats compacted ({n} day file(s))")
+        return
+
+    columns = [c.strip() for c in args.columns.split(",") if c.strip()] or None
+    if args.daily:
+        out = load_stats(args.stats_root, symbols, start=args.start, end=args.end, gran=gran, columns=columns)
+        out = out.drop("q").sort(["symbol", "column", "date"])
+    else:
+        qs = tuple(float(q) for q in args.quantiles.split(",") if q.strip())
+        out = query_stats(args.stats_root, symbols, start=args.start, end=args.end, gran=gran,
+                          columns=columns, quantiles=qs, per_symbol=args.per_symbol)
+    if out.height == 0:
+        print("no stats found (run 02_make_features_all.py or --backfill first)")
+        return 1
+
+    if args.csv:
+        d = os.path.dirname(os.path.abspath(args.csv))
+        os.makedirs(d, exist_ok=True)
+        out.write_csv(args.csv)
+        print(f"saved {args.csv}  rows={out.height}")
+    else:
+        with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200):
+            print(out)
+
+
+if __name__ == "__main__":
+    main()
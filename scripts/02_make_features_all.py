@@ -7,7 +7,16 @@ data/features_all/binance-spot/{SYMBOL}/{GRAN}/YYYY-MM-DD.parquet
 
 - pandas-ta 대형 세트(dict 리스트) + (옵션) 바이낸스 커스텀
 - ▶ 워밍업: 이전 날짜 파일에서 필요한 행수만큼 이어붙여 계산 후, 그날만 잘라 저장
+  (이전 파일은 뒤쪽 row group만 읽음)
+- ▶ --range: 연속 날짜를 하나의 스트림으로 처리(직전 날짜 꼬리를 메모리로 전달, 입력 1회 읽기)
+- ▶ --batch: 같은 날짜의 여러 심볼을 (time x symbol) 2-D 로 쌓아 가능한 지표를 한 번에 계산
 - 이미 결과가 존재하면 스킵(--force로 덮어쓰기)
+- ▶ 스펙 기록: 결과 parquet 메타데이터에 스펙 해시→생성 컬럼 저장
+  --recompute: 기존 파일과 현재 스펙 diff → 추가/변경분만 계산, 삭제분 drop 후 재기록
+- ▶ --sample-stride / --sample-times: 샘플 시점 행만 계산·저장 ({GRAN}_s{N} 폴더)
+  상태형 지표는 전체 시계열, 유한 창 지표는 샘플별 lookback 구간만 계산 (features/sampled_bridge.py)
+- ▶ 피처 통계(옵션): --stats-root 를 주면 저장하는 날짜마다 컬럼별 병합 가능 요약을 기록 (features/stats_store.py)
+  실행 끝에 심볼별 파일 하나로 compaction
 
 사용 예)
   python scripts/02_make_features_all.py ^
@@ -19,6 +28,8 @@ data/features_all/binance-spot/{SYMBOL}/{GRAN}/YYYY-MM-DD.parquet
     --out-root data/features_all/binance-spot
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import glob
@@ -27,16 +38,36 @@ import shutil
 from datetime import datetime, timezone, timedelta
 import time
 
-import polars as pl
-
 # ===== 프로젝트 루트 경로 주입 =====
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from features.ta_bridge import run_pandasta_on_polars  # noqa: E402
 from features.strategies_all import full_ohlcv_specs   # noqa: E402
-from features.custom import add_binance_custom         # noqa: E402
+from quant_pipeline import telemetry                   # noqa: E402
+from features.spec_hash import (                       # noqa: E402
+    spec_hash, specs_by_hash, diff_specs, read_spec_meta, write_parquet_with_specs,
+)
+
+# --range 한 번에 계산할 날짜 수 기본값: 1 = 일자별 모드와 같은 결과
+# (>1 이면 누적/상태형 지표(OBV 등)가 묶음 안 위치에 따라 달라짐 → 스펙 기록에 range_days 를 남김)
+RANGE_DAYS_DEFAULT = 1
+
+# ===== 무거운 의존성(polars / pandas / pandas-ta)은 실제 계산 직전에 로드 =====
+# (모든 결과가 이미 있는 "할 일 없음" 실행은 이 모듈들을 import 하지 않음)
+pl = None
+run_pandasta_on_polars = None
+add_binance_custom = None
+
+
+def _load_heavy():
+    global pl, run_pandasta_on_polars, add_binance_custom
+    if pl is not None:
+        return
+    import polars
+    from features.ta_bridge import run_pandasta_on_polars as _run
+    from features.custom import add_binance_custom as _custom
+    pl, run_pandasta_on_polars, add_binance_custom = polars, _run, _custom
 
 
 def ensure_dir(path: str):
@@ -109,83 +140,560 @@ def out_path_for(out_root: str, symbol: str, gran: str, ymd: str) -> str:
     return os.path.join(out_root, symbol, gran, f"{ymd}.parquet") if gran else os.path.join(out_root, symbol, f"{ymd}.parquet")
 
 
+def read_tail(path: str, n: int) -> pl.DataFrame:
+    """parquet 파일의 마지막 n행만 읽음 (필요한 뒤쪽 row group만 디코딩)"""
+    import pyarrow.parquet as pq
+    pf = pq.ParquetFile(path)
+    md = pf.metadata
+    groups, rows = [], 0
+    for i in range(md.num_row_groups - 1, -1, -1):
+        groups.insert(0, i)
+        rows += md.row_group(i).num_rows
+        if rows >= n:
+            break
+    df = pl.from_arrow(pf.read_row_groups(groups))
+    return df.tail(n) if n < len(df) else df
+
+
 def load_with_warmup(in_root: str, symbol: str, gran: str, ymd: str, warmup_rows: int) -> pl.DataFrame:
     """
     해당 일자의 DF를 로드하되, 직전 날짜 파일에서 warmup_rows만큼 이어붙여 반환.
     이전 파일이 없으면 그 일자만 반환.
     """
     cur_path = in_path_for(in_root, symbol, gran, ymd)
-    df_cur = pl.read_parquet(cur_path)
-
-    if warmup_rows <= 0:
-        return df_cur
-
-    prev_path = in_path_for(in_root, symbol, gran, prev_ymd(ymd))
-    if os.path.exists(prev_path):
-        df_prev = pl.read_parquet(prev_path)
-        if warmup_rows < len(df_prev):
-            df_prev = df_prev.tail(warmup_rows)
-        df = pl.concat([df_prev, df_cur], how="vertical", rechunk=True)
-        return df
-    else:
-        return df_cur
+    with telemetry.get().timer("features_stage_seconds", stage="load"):
+        df_cur = pl.read_parquet(cur_path)
 
+        if warmup_rows <= 0:
+            return df_cur
 
-def slice_to_day(df: pl.DataFrame, ymd: str) -> pl.DataFrame:
-    """open_time(ms)를 UTC로 변환해 해당 날짜 구간만 필터링"""
+        prev_path = in_path_for(in_root, symbol, gran, prev_ymd(ymd))
+        if os.path.exists(prev_path):
+            df_prev = read_tail(prev_path, warmup_rows)
+            df = pl.concat([df_prev, df_cur], how="vertical", rechunk=True)
+            return df
+        else:
+            return df_cur
+
+
+def day_bounds_ms(ymd: str):
+    """해당 날짜(UTC)의 [시작, 끝] ms"""
     day = datetime.strptime(ymd, "%Y-%m-%d").replace(tzinfo=timezone.utc)
     start_ms = int(day.timestamp() * 1000)
     end_ms   = int((day + timedelta(days=1)).timestamp() * 1000) - 1
-    return df.filter((pl.col("open_time") >= start_ms) & (pl.col("open_time") <= end_ms))
+    return start_ms, end_ms
+
+
+def slice_to_day(df: pl.DataFrame, ymd: str) -> pl.DataFrame:
+    """
+    해당 날짜(UTC) 구간만 필터링. 우선순위: sample_time > close_time > open_time
+    (volume/dollar/tick 바는 전날 열려 당일 마감될 수 있음 — 바 파일은 마감 날짜로 분할됨.
+     샘플 모드의 자정 샘플은 전날 마지막 바(close_time = 자정-1)를 쓰므로 sample_time 기준)
+    """
+    start_ms, end_ms = day_bounds_ms(ymd)
+    col = next(c for c in ("sample_time", "close_time", "open_time") if c in df.columns)
+    return df.filter((pl.col(col) >= start_ms) & (pl.col(col) <= end_ms))
+
+
+def custom_spec(windows=(60, 300, 900), names=None) -> dict:
+    """커스텀 피처 묶음의 스펙(윈도우 + 선택 피처 + 선택 피처 구현 해시) → 코드 수정도 변경으로 감지"""
+    from features.custom import impl_hash
+    return {"kind": "binance_custom", "windows": list(windows),
+            "names": sorted(names) if names else "default",
+            "src": impl_hash(names)}
+
+
+def current_specs(ta_list: list, with_custom: bool, custom_names: tuple = None) -> dict:
+    """현재 설정의 {hash: spec} (지표 + 커스텀)"""
+    specs = list(ta_list)
+    if with_custom:
+        specs.append(custom_spec(names=custom_names))
+    return specs_by_hash(specs)
+
+
+def spec_meta_from(ta_list: list, col_map: dict) -> dict:
+    """{스펙 인덱스: [컬럼]} → 파일 메타 {hash: {"spec", "cols"}}"""
+    meta = {}
+    for i, spec in enumerate(ta_list):
+        # 컬럼을 만들지 못한(실패/스킵) 스펙은 기록하지 않음 → 다음 --recompute 에서 다시 시도
+        if isinstance(spec, dict) and "kind" in spec and col_map.get(i):
+            meta.setdefault(spec_hash(spec), {"spec": spec, "cols": col_map[i]})
+    return meta
+
+
+def tag_range_days(meta: dict, range_days: int) -> dict:
+    """
+    range_days>1 로 계산한 결과의 스펙 기록: 각 스펙에 range_days 를 넣어 해시를 바꿈
+    → 이후 --recompute 가 일자별 스펙과 다르다고 보고 일자별 결과로 다시 계산
+    """
+    if range_days <= 1:
+        return meta
+    out = {}
+    for v in meta.values():
+        spec = {**v["spec"], "range_days": range_days}
+        out[spec_hash(spec)] = {"spec": spec, "cols": v["cols"]}
+    return out
+
+
+def add_custom_with_meta(df_feat: pl.DataFrame, meta: dict, custom_names: tuple = None) -> pl.DataFrame:
+    """바이낸스 커스텀 추가 + meta에 생성 컬럼 기록"""
+    before = set(df_feat.columns)
+    df_feat = add_binance_custom(df_feat, windows=(60, 300, 900), names=custom_names)
+    spec = custom_spec(names=custom_names)
+    meta[spec_hash(spec)] = {"spec": spec, "cols": [c for c in df_feat.columns if c not in before]}
+    return df_feat
+
+
+def compute_features(df_in: pl.DataFrame, ta_name: str, ta_list: list, with_custom: bool,
+                     custom_names: tuple = None):
+    """
+    지표(+커스텀) 계산. 반환: (결과 DF, {hash: {"spec", "cols"}})
+    """
+    tm = telemetry.get()
+    col_map = {}
+    df_feat = df_in
+    if ta_list:
+        with tm.timer("features_stage_seconds", stage="ta"):
+            df_feat = run_pandasta_on_polars(df_in, ta_list=ta_list, name=ta_name, col_map=col_map)
+    meta = spec_meta_from(ta_list, col_map)
+
+    if with_custom:
+        with tm.timer("features_stage_seconds", stage="custom"):
+            df_feat = add_custom_with_meta(df_feat, meta, custom_names)
+    return df_feat, meta
+
+
+def compute_features_sampled(df_in: pl.DataFrame, ymd: str, ta_name: str, ta_list: list, with_custom: bool,
+                             custom_names: tuple, sample: dict):
+    """
+    샘플 모드 계산: 그날의 샘플 행만 반환(+ sample_time). 반환: (결과 DF, {hash: {"spec", "cols"}})
+    sample: {"stride_ms" | "times", "gran", "window_ok"} — window_ok 는 첫 호출에서 검증 후 채움
+    """
+    from features.sampled_bridge import (
+        run_sampled_on_polars, sample_positions, verify_window_specs, bar_close_times,
+    )
+    tm = telemetry.get()
+    df_in = df_in.sort("open_time")
+    lo, hi = day_bounds_ms(ymd)
+    pos, ts = sample_positions(bar_close_times(df_in), lo, hi,
+                               stride_ms=sample.get("stride_ms"), times=sample.get("times"))
+
+    if sample.get("window_ok") is None and ta_list:
+        sample["window_ok"] = verify_window_specs(df_in, ta_list)
+        print(f"[sample] lookback-segment path verified for {len(sample['window_ok'])} specs; "
+              f"{len(ta_list) - len(sample['window_ok'])} over the full series")
+
+    col_map = {}
+    df_feat = df_in[pos]
+    if ta_list:
+        split = {}
+        with tm.timer("features_stage_seconds", stage="ta"):
+            df_feat = run_sampled_on_polars(df_in, ta_list, pos, name=ta_name,
+                                            window_ok=sample.get("window_ok"), col_map=col_map, stats=split)
+        tm.inc("features_sample_rows_total", split["segment_rows"], path="segment")
+        tm.inc("features_sample_rows_total", split["full_rows"], path="full")
+        if not sample.get("split_logged"):
+            sample["split_logged"] = True
+            print(f"[sample] {ymd}: {len(pos)} samples; {split['segment_specs']} specs over "
+                  f"{split['segment_rows']} segment rows, {split['full_specs']} specs over "
+                  f"{split['full_rows']} full rows")
+    meta = spec_meta_from(ta_list, col_map)
+
+    if with_custom:
+        with tm.timer("features_stage_seconds", stage="custom"):
+            full = add_custom_with_meta(df_in, meta, custom_names)
+            new_cols = [c for c in full.columns if c not in df_in.columns and c not in df_feat.columns]
+            df_feat = df_feat.with_columns(full[pos].select(new_cols).get_columns())
+    return df_feat.with_columns(pl.Series("sample_time", ts, dtype=pl.Int64)), meta
+
+
+def recompute_one(in_root: str, out_path: str, symbol: str, gran: str, ymd: str,
+                  ta_name: str, ta_list: list, with_custom: bool, warmup_rows: int,
+                  stored: dict, stats_root: str = None, custom_names: tuple = None,
+                  out_gran: str = None) -> bool:
+    """
+    기존 결과 파일의 스펙 기록과 현재 스펙을 diff → 추가/변경 스펙만 계산, 삭제 스펙 컬럼 drop.
+    반환: 파일을 다시 썼으면 True
+    """
+    # 예전 버전이 실패 스펙을 cols=[] 로 기록한 경우 → 기록 없음으로 보고 다시 시도
+    stored = {h: v for h, v in stored.items() if v.get("cols")}
+    cur = current_specs(ta_list, with_custom, custom_names)
+    added, removed = diff_specs(stored, cur)
+    if not with_custom:
+        # --with-custom 없이 재계산해도 기존 커스텀 컬럼은 유지
+        removed = [h for h in removed if stored[h].get("spec", {}).get("kind") != "binance_custom"]
+    if not added and not removed:
+        print(f"[{symbol}] {ymd} specs up-to-date → skip")
+        return False
+
+    _load_heavy()
+    df_old = pl.read_parquet(out_path)
+    meta = {h: v for h, v in stored.items() if h not in removed}
+    # 남는 스펙이 같은 이름 컬럼을 만들면 유지
+    kept_cols = {c for v in meta.values() for c in v.get("cols", [])}
+    drop_cols = {c for h in removed for c in stored[h].get("cols", [])} - kept_cols
+
+    df_new = None
+    if added:
+        add_ta = [cur[h] for h in added if cur[h].get("kind") != "binance_custom"]
+        add_custom = any(cur[h].get("kind") == "binance_custom" for h in added)
+        df_in = load_with_warmup(in_root, symbol, gran, ymd, warmup_rows=warmup_rows)
+        df_feat, meta_new = compute_features(df_in, ta_name, add_ta, add_custom, custom_names)
+        failed = [h for h in added if h not in meta_new]
+        if failed and len(failed) == len(added) and not removed:
+            print(f"[{symbol}] {ymd} {len(failed)} added spec(s) produced no columns → unchanged")
+            return False
+        meta.update(meta_new)
+        new_cols = [c for h in added for c in meta_new.get(h, {}).get("cols", [])]
+        df_new = slice_to_day(df_feat, ymd).select(["open_time", *new_cols])
+        # 동일 이름 컬럼이 남아 있으면 새 값으로 교체
+        drop_cols |= {c for c in new_cols if c in df_old.columns}
+
+    df_out = df_old.drop([c for c in df_old.columns if c in drop_cols])
+    if df_new is not None:
+        df_out = df_out.join(df_new, on="open_time", how="left")
+
+    tmp_path = out_path + ".tmp"
+    with telemetry.get().timer("features_stage_seconds", stage="write"):
+        write_parquet_with_specs(df_out, tmp_path, meta, compression="zstd")
+        atomic_replace(tmp_path, out_path)
+    if stats_root:
+        write_stats(stats_root, symbol, out_gran or gran, ymd, df_out)
+    print(f"[{symbol}] {ymd} → recomputed +{len(added)}/-{len(removed)} specs  "
+          f"cols={len(df_out.columns)}  {out_path}")
+    tm = telemetry.get()
+    tm.inc("features_days_total", result="recomputed")
+    tm.event("features_recompute", symbol=symbol, date=ymd, added=len(added), removed=len(removed),
+             cols=len(df_out.columns), bytes=os.path.getsize(out_path))
+    return True
 
 
 def process_one(in_root: str, out_root: str, symbol: str, gran: str,
                 ymd: str, ta_name: str, ta_list: list,
-                with_custom: bool, force: bool, warmup_rows: int):
+                with_custom: bool, force: bool, warmup_rows: int,
+                recompute: bool = False, stats_root: str = None, custom_names: tuple = None,
+                sample: dict = None):
+    out_gran = sample["gran"] if sample else gran
     in_path  = in_path_for(in_root, symbol, gran, ymd)
-    out_path = out_path_for(out_root, symbol, gran, ymd)
-    ensure_dir(os.path.dirname(out_path))
+    out_path = out_path_for(out_root, symbol, out_gran, ymd)
 
     if not os.path.exists(in_path):
         print(f"[{symbol}] {ymd} input missing → skip")
+        telemetry.get().inc("features_days_total", result="missing_input")
         return
 
     if os.path.exists(out_path) and not force:
-        print(f"[{symbol}] {ymd} exists → skip")
-        return
+        if not recompute:
+            print(f"[{symbol}] {ymd} exists → skip")
+            telemetry.get().inc("features_days_total", result="skipped")
+            return
+        stored = read_spec_meta(out_path)
+        if stored is not None:
+            recompute_one(in_root, out_path, symbol, gran, ymd, ta_name, ta_list,
+                          with_custom, warmup_rows, stored, stats_root=stats_root,
+                          custom_names=custom_names, out_gran=out_gran)
+            return
+        print(f"[{symbol}] {ymd} no spec metadata → full rebuild")
 
+    _load_heavy()
+    ensure_dir(os.path.dirname(out_path))
     print(f"[{symbol}] {ymd} loading with warmup({warmup_rows}) from {in_path}")
     df_in = load_with_warmup(in_root, symbol, gran, ymd, warmup_rows=warmup_rows)
 
-    # 1) pandas-ta 지표 계산 (워밍업 포함)
-    df_feat = run_pandasta_on_polars(df_in, ta_list=ta_list, name=ta_name)
+    # 1) pandas-ta 지표 계산 (워밍업 포함) + 2) (선택) 바이낸스 커스텀
+    if sample:
+        df_feat, meta = compute_features_sampled(df_in, ymd, ta_name, ta_list, with_custom, custom_names, sample)
+    else:
+        df_feat, meta = compute_features(df_in, ta_name, ta_list, with_custom, custom_names)
 
-    # 2) (선택) 바이낸스 커스텀
-    if with_custom:
-        df_feat = add_binance_custom(df_feat, windows=(60, 300, 900))
+    # 3) 해당 날짜만 슬라이스해서 저장 (스펙 기록을 메타데이터로)
+    save_day(df_feat, symbol, ymd, out_path, meta, gran=out_gran, stats_root=stats_root)
+
+
+def write_stats(stats_root: str, symbol: str, gran: str, ymd: str, df_day: pl.DataFrame):
+    """하루치 결과의 컬럼별 요약 기록 (실패해도 피처 저장은 유지)"""
+    from features.stats_store import write_day_stats
+    try:
+        with telemetry.get().timer("features_stage_seconds", stage="stats"):
+            write_day_stats(stats_root, symbol, gran, ymd, df_day)
+    except Exception as e:
+        print(f"[{symbol}] {ymd} stats failed: {e}", file=sys.stderr)
 
-    # 3) 해당 날짜만 슬라이스해서 저장
+
+def save_day(df_feat: pl.DataFrame, symbol: str, ymd: str, out_path: str, meta: dict,
+             gran: str = "", stats_root: str = None):
+    tm = telemetry.get()
+    t0 = time.perf_counter()
     df_day = slice_to_day(df_feat, ymd)
     tmp_path = out_path + ".tmp"
-    df_day.write_parquet(tmp_path, compression="zstd")
+    write_parquet_with_specs(df_day, tmp_path, meta, compression="zstd")
     atomic_replace(tmp_path, out_path)
+    if stats_root:
+        write_stats(stats_root, symbol, gran, ymd, df_day)
     print(f"[{symbol}] {ymd} → saved {out_path}  rows={len(df_day)}  cols={len(df_day.columns)}")
 
+    if tm.enabled:
+        nbytes = os.path.getsize(out_path)
+        tm.observe("features_stage_seconds", time.perf_counter() - t0, stage="write")
+        tm.inc("features_days_total", result="saved")
+        tm.inc("features_rows_total", len(df_day))
+        tm.inc("bytes_written_total", nbytes)
+        tm.event("features_day", symbol=symbol, date=ymd, rows=len(df_day),
+                 cols=len(df_day.columns), bytes=nbytes)
+
+
+def process_range(in_root: str, out_root: str, symbol: str, gran: str,
+                  ymds: list, ta_name: str, ta_list: list,
+                  with_custom: bool, force: bool, warmup_rows: int,
+                  recompute: bool = False, range_days: int = RANGE_DAYS_DEFAULT, stats_root: str = None,
+                  custom_names: tuple = None):
+    """
+    연속 구간 모드: 심볼의 날짜들을 하나의 스트림으로 처리
+    - 직전 날짜 입력의 꼬리(warmup_rows)를 메모리에 들고 다음 날짜 워밍업에 사용 → 입력 파일은 한 번만 읽음
+    - 스트림이 끊긴 뒤 재시작할 때만 직전 파일의 뒤쪽 row group만 읽음
+    - range_days 일씩 이어붙여 한 번에 계산 후 날짜 경계로 잘라 저장 (워밍업 재계산이 묶음당 1회)
+      range_days=1(기본)이면 결과는 일자별 모드와 동일. >1 이면 묶음 안의 누적/상태형 지표가 날짜를 넘어
+      이어지고 묶음 경계에서 다시 시작 → 값이 묶음 위치에 따라 달라지므로 스펙 기록에 range_days 를 남김
+    - 읽을 수 없는 입력 날짜는 건너뛰고(오류 기록) 스트림을 끊음 → 나머지 날짜는 계속 처리
+    """
+    carry = None   # (ymd, 직전 날짜 입력의 꼬리 DF)
+    batch = []     # [(ymd, 입력 DF)]
 
-def main():
+    def flush():
+        nonlocal carry, batch
+        if not batch:
+            return
+        first = batch[0][0]
+        try:
+            warm = None
+            if warmup_rows > 0:
+                if carry is not None and carry[0] == prev_ymd(first):
+                    warm = carry[1]
+                else:
+                    prev_path = in_path_for(in_root, symbol, gran, prev_ymd(first))
+                    if os.path.exists(prev_path):
+                        try:
+                            warm = read_tail(prev_path, warmup_rows)
+                        except Exception as e:
+                            print(f"[{symbol}] WARNING {first}: cannot read warmup from {prev_path} ({e}) "
+                                  f"→ no warmup", file=sys.stderr)
+            parts = ([warm] if warm is not None else []) + [df for _, df in batch]
+            df_in = pl.concat(parts, how="vertical", rechunk=True) if len(parts) > 1 else parts[0]
+            print(f"[{symbol}] {first}..{batch[-1][0]} computing {len(batch)} day(s) "
+                  f"warmup={0 if warm is None else len(warm)}")
+
+            df_feat, meta = compute_features(df_in, ta_name, ta_list, with_custom, custom_names)
+            meta = tag_range_days(meta, len(batch))
+            for ymd, _ in batch:
+                save_day(df_feat, symbol, ymd, out_path_for(out_root, symbol, gran, ymd), meta,
+                         gran=gran, stats_root=stats_root)
+        except Exception as e:
+            print(f"[{symbol}] ERROR {first}..{batch[-1][0]}: {e}", file=sys.stderr)
+            telemetry.get().inc("features_days_total", len(batch), result="error")
+            carry, batch = None, []
+            return
+
+        last_ymd, last_df = batch[-1]
+        carry = (last_ymd, last_df.tail(warmup_rows)) if warmup_rows > 0 else None
+        batch = []
+
+    for ymd in ymds:
+        out_path = out_path_for(out_root, symbol, gran, ymd)
+        if os.path.exists(out_path) and not force:
+            # 기존 결과: 스트림을 끊고 일자별 경로(skip / --recompute)로 처리
+            flush()
+            carry = None
+            process_one(in_root, out_root, symbol, gran, ymd, ta_name, ta_list,
+                        with_custom=with_custom, force=force, warmup_rows=warmup_rows,
+                        recompute=recompute, stats_root=stats_root, custom_names=custom_names)
+            continue
+
+        _load_heavy()
+        ensure_dir(os.path.dirname(out_path))
+        if batch and batch[-1][0] != prev_ymd(ymd):
+            flush()  # 날짜 공백 → 새 스트림
+        if carry is not None and carry[0] != prev_ymd(ymd):
+            carry = None
+        try:
+            with telemetry.get().timer("features_stage_seconds", stage="load"):
+                df_day = pl.read_parquet(in_path_for(in_root, symbol, gran, ymd))
+        except Exception as e:
+            # 깨진/사라진 입력: 그 날짜만 건너뛰고 스트림을 끊음(다음 날짜는 워밍업 없이 새로 시작)
+            print(f"[{symbol}] ERROR {ymd}: cannot read input ({e}) → skip day", file=sys.stderr)
+            telemetry.get().inc("features_days_total", result="error")
+            flush()
+            carry = None
+            continue
+        batch.append((ymd, df_day))
+        if len(batch) >= max(1, range_days):
+            flush()
+    flush()
+
+
+def process_batch(in_root: str, out_root: str, symbols: list, gran: str,
+                  start: str, end: str, ta_name: str, ta_list: list,
+                  with_custom: bool, force: bool, warmup_rows: int,
+                  recompute: bool = False, stats_root: str = None, custom_names: tuple = None):
+    """
+    배치 모드: 날짜별로 여러 심볼의 OHLCV를 (time x symbol) 2-D 로 쌓아 지표 계산
+    - 2-D 커널이 있는 스펙은 전 심볼을 한 번에, 나머지는 심볼별 pandas-ta (features/batch_bridge.py)
+    - 커널은 첫 계산 전에 pandas-ta 결과와 비교해 일치하는 스펙만 사용 → 심볼별 결과는 단일 경로와 동일
+    """
+    by_day = {}
+    for sym in symbols:
+        for fp in list_input_files(in_root, sym, gran, start, end):
+            by_day.setdefault(ymd_from_fp(fp), []).append(sym)
+    if not by_day:
+        print("[batch] no files to process")
+        return
+
+    kernel_ok = None
+    for ymd in sorted(by_day):
+        todo = []
+        for sym in by_day[ymd]:
+            if os.path.exists(out_path_for(out_root, sym, gran, ymd)) and not force:
+                # 기존 결과: 일자별 경로(skip / --recompute)
+                process_one(in_root, out_root, sym, gran, ymd, ta_name, ta_list,
+                            with_custom=with_custom, force=force, warmup_rows=warmup_rows,
+                            recompute=recompute, stats_root=stats_root, custom_names=custom_names)
+                continue
+            todo.append(sym)
+        if not todo:
+            continue
+
+        _load_heavy()
+        from features.batch_bridge import run_batched_on_polars, verify_kernels
+
+        frames = {}
+        for sym in todo:
+            try:
+                frames[sym] = load_with_warmup(in_root, sym, gran, ymd, warmup_rows=warmup_rows)
+            except Exception as e:
+                print(f"[{sym}] ERROR {ymd}: {e}", file=sys.stderr)
+        if not frames:
+            continue
+
+        if kernel_ok is None:
+            kernel_ok = verify_kernels(next(iter(frames.values())), ta_list)
+            print(f"[batch] 2-D kernels verified for {len(kernel_ok)} specs; "
+                  f"{len(ta_list) - len(kernel_ok)} via per-symbol pandas-ta")
+
+        print(f"[batch] {ymd} computing {len(frames)} symbols: {','.join(frames)}")
+        col_maps = {}
+        try:
+            with telemetry.get().timer("features_stage_seconds", stage="ta_batch"):
+                res = run_batched_on_polars(frames, ta_list, name=ta_name, kernel_ok=kernel_ok, col_maps=col_maps)
+        except Exception as e:
+            print(f"[batch] ERROR {ymd}: {e}", file=sys.stderr)
+            continue
+
+        for sym, df_feat in res.items():
+            try:
+                meta = spec_meta_from(ta_list, col_maps.get(sym, {}))
+                if with_custom:
+                    df_feat = add_custom_with_meta(df_feat, meta, custom_names)
+                out_path = out_path_for(out_root, sym, gran, ymd)
+                ensure_dir(os.path.dirname(out_path))
+                save_day(df_feat, sym, ymd, out_path, meta, gran=gran, stats_root=stats_root)
+            except Exception as e:
+                print(f"[{sym}] ERROR {ymd}: {e}", file=sys.stderr)
+
+
+def list_input_files(in_root: str, sym: str, gran: str, start: str, end: str) -> list:
+    """입력 일자 파일 목록 (start/end: YYYY-MM-DD, 빈 문자열이면 제한 없음)"""
+    if gran:
+        pattern = os.path.join(in_root, sym, gran, "*.parquet")
+    else:
+        pattern = os.path.join(in_root, sym, "*.parquet")
+    files = sorted(glob.glob(pattern))
+
+    if start:
+        files = [fp for fp in files if ymd_from_fp(fp) >= start]
+    if end:
+        files = [fp for fp in files if ymd_from_fp(fp) <= end]
+    return files
+
+
+def compact_all_stats(stats_root: str, symbols: list, gran: str):
+    """
+    쌓인 일자 통계 파일 → 심볼별 파일로 병합. 일자 파일이 COMPACT_MIN_SHARDS 개 이상인 심볼만
+    (매 실행마다 병합 I/O 를 하지 않음, 조회는 병합 전에도 일자 파일을 함께 읽음)
+    일자 파일이 없으면 polars 도 로드하지 않음
+    """
+    if not any(glob.glob(out_path_for(stats_root, s, gran, "*")) for s in symbols):
+        return
+    from features.stats_store import compact_stats, COMPACT_MIN_SHARDS
+    for sym in symbols:
+        try:
+            n = compact_stats(stats_root, sym, gran, min_shards=COMPACT_MIN_SHARDS)
+            if n:
+                print(f"[{sym}] stats compacted ({n} day file(s))")
+        except Exception as e:
+            print(f"[{sym}] stats compaction failed: {e}", file=sys.stderr)
+
+
+def read_sample_times(path: str) -> list:
+    """이벤트 시각 파일(한 줄에 하나: epoch ms 또는 ISO 시각, 첫 컬럼만 사용) → ms 리스트"""
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for ln in f:
+            v = ln.strip().split(",")[0].strip()
+            if not v or v.startswith("#"):
+                continue
+            if v.isdigit():
+                out.append(int(v))
+                continue
+            try:
+                dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
+            except ValueError:
+                continue  # 헤더 등
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            out.append(int(dt.timestamp() * 1000))
+    return out
+
+
+def main(argv=None):
     ap = argparse.ArgumentParser(description="Make ALL indicators per day with warmup across days")
     ap.add_argument("--symbols", type=str, default="", help="Comma-separated symbols. Empty: auto-detect under --in-root")
     ap.add_argument("--start", type=str, default="", help="YYYY-MM-DD inclusive (optional)")
     ap.add_argument("--end",   type=str, default="", help="YYYY-MM-DD inclusive (optional)")
     ap.add_argument("--with-custom", action="store_true", help="Add Binance custom features")
+    ap.add_argument("--custom-features", type=str, default="",
+                    help="Comma-separated custom feature names (features/custom.py registry). Empty: default set")
     ap.add_argument("--force", action="store_true", help="Overwrite existing outputs")
+    ap.add_argument("--recompute", action="store_true",
+                    help="Existing outputs: compute only added/changed specs, drop removed ones")
     ap.add_argument("--warmup", type=int, default=-1, help="Warmup rows (override). Default: auto by indicators")
+    ap.add_argument("--range", action="store_true",
+                    help="Continuous range mode: walk each symbol's consecutive days as one stream")
+    ap.add_argument("--range-days", type=int, default=RANGE_DAYS_DEFAULT,
+                    help=f"Range mode: days computed per pass (default {RANGE_DAYS_DEFAULT} = same results as "
+                         f"daily mode; >1 makes stateful indicators depend on the chunk, recorded in spec metadata)")
+    ap.add_argument("--batch", action="store_true",
+                    help="Batched mode: stack all symbols of a day into time x symbol matrices")
+    ap.add_argument("--sample-stride", type=int, default=0,
+                    help="Sampled mode: evaluate and store only every N seconds (last bar with close_time <= grid time)")
+    ap.add_argument("--sample-times", type=str, default="",
+                    help="Sampled mode: file of event timestamps (epoch ms or ISO), one per line")
+    ap.add_argument("--sample-name", type=str, default="",
+                    help="Sampled output granularity folder (default: {gran}_s{N} or {gran}_ev-{file stem})")
+    ap.add_argument("--stats-root", type=str, default="",
+                    help="Per-day feature statistics root, e.g. data/features_stats/binance-spot (default: off)")
+    ap.add_argument("--metrics-jsonl", type=str, default=None, help="Append structured JSON-lines events to this file")
+    ap.add_argument("--metrics-prom", type=str, default=None, help="Write Prometheus textfile metrics to this path")
     # 경로 & 그라뉼러리티
     ap.add_argument("--in-root",  type=str, default="data/ohlcv/binance-spot", help="입력 루트")
     ap.add_argument("--out-root", type=str, default="data/features_all/binance-spot", help="출력 루트")
     ap.add_argument("--granularity", type=str, default="1s", help="하위 폴더명(예: 1s). 빈 문자열이면 생략")
 
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
+    if args.batch and args.range:
+        ap.error("--batch and --range cannot be combined")
+    if args.sample_stride and args.sample_times:
+        ap.error("--sample-stride and --sample-times cannot be combined")
+    if (args.sample_stride or args.sample_times) and (args.batch or args.range):
+        ap.error("sampled mode runs per day; drop --batch / --range")
 
     ta_name, ta_list = full_ohlcv_specs()
     warmup_rows = args.warmup if args.warmup >= 0 else max_window_from_specs(ta_list, custom_windows=(60, 300, 900))
@@ -193,6 +701,23 @@ def main():
     in_root  = args.in_root
     out_root = args.out_root
     gran     = (args.granularity or "").strip()
+    stats_root = (args.stats_root or "").strip() or None
+    custom_names = tuple(n.strip() for n in args.custom_features.split(",") if n.strip()) or None
+    sample = None
+    if args.sample_stride > 0:
+        sample = {"stride_ms": args.sample_stride * 1000, "times": None,
+                  "gran": args.sample_name or f"{gran or 'raw'}_s{args.sample_stride}", "window_ok": None}
+    elif args.sample_times:
+        stem = os.path.splitext(os.path.basename(args.sample_times))[0]
+        sample = {"stride_ms": None, "times": read_sample_times(args.sample_times),
+                  "gran": args.sample_name or f"{gran or 'raw'}_ev-{stem}", "window_ok": None}
+        print(f"[sample] {len(sample['times'])} event timestamps from {args.sample_times}")
+    if custom_names:
+        from features.custom import resolve_names
+        try:
+            resolve_names(custom_names)
+        except ValueError as e:
+            ap.error(str(e))
 
     # 심볼 결정
     symbols = ([s.strip().upper() for s in args.symbols.split(",") if s.strip()]
@@ -201,34 +726,72 @@ def main():
         print(f"No symbols found under {in_root}")
         sys.exit(1)
 
-    for sym in symbols:
-        # 입력 파일 목록 수집
-        if gran:
-            pattern = os.path.join(in_root, sym, gran, "*.parquet")
-        else:
-            pattern = os.path.join(in_root, sym, "*.parquet")
-        files = sorted(glob.glob(pattern))
-
-        if args.start:
-            files = [fp for fp in files if ymd_from_fp(fp) >= args.start]
-        if args.end:
-            files = [fp for fp in files if ymd_from_fp(fp) <= args.end]
-        if not files:
-            print(f"[{sym}] no files to process")
-            continue
-
-        for fp in files:
-            ymd = ymd_from_fp(fp)
+    tm = telemetry.configure(jsonl_path=args.metrics_jsonl, prom_path=args.metrics_prom, stage="features")
+    tm.event("run_start", symbols=symbols, start=args.start, end=args.end,
+             mode=("batch" if args.batch else "range" if args.range else "sampled" if sample else "daily"))
+    try:
+        if args.batch:
             try:
-                process_one(in_root, out_root, sym, gran, ymd,
-                            ta_name, ta_list,
-                            with_custom=args.with_custom,
-                            force=args.force,
-                            warmup_rows=warmup_rows)
+                process_batch(in_root, out_root, symbols, gran, args.start, args.end,
+                              ta_name, ta_list,
+                              with_custom=args.with_custom,
+                              force=args.force,
+                              warmup_rows=warmup_rows,
+                              recompute=args.recompute,
+                              stats_root=stats_root,
+                              custom_names=custom_names)
             except KeyboardInterrupt:
                 print("\nInterrupted."); sys.exit(1)
-            except Exception as e:
-                print(f"[{sym}] ERROR {ymd}: {e}", file=sys.stderr)
+            return
+
+        for sym in symbols:
+            # 입력 파일 목록 수집
+            files = list_input_files(in_root, sym, gran, args.start, args.end)
+            if not files:
+                print(f"[{sym}] no files to process")
+                continue
+
+            if args.range:
+                try:
+                    process_range(in_root, out_root, sym, gran, [ymd_from_fp(fp) for fp in files],
+                                  ta_name, ta_list,
+                                  with_custom=args.with_custom,
+                                  force=args.force,
+                                  warmup_rows=warmup_rows,
+                                  recompute=args.recompute,
+                                  range_days=args.range_days,
+                                  stats_root=stats_root,
+                                  custom_names=custom_names)
+                except KeyboardInterrupt:
+                    print("\nInterrupted."); sys.exit(1)
+                except Exception as e:
+                    print(f"[{sym}] ERROR range: {e}", file=sys.stderr)
+                    tm.event("features_error", symbol=sym, error=str(e))
+                continue
+
+            for fp in files:
+                ymd = ymd_from_fp(fp)
+                try:
+                    process_one(in_root, out_root, sym, gran, ymd,
+                                ta_name, ta_list,
+                                with_custom=args.with_custom,
+                                force=args.force,
+                                warmup_rows=warmup_rows,
+                                recompute=args.recompute,
+                                stats_root=stats_root,
+                                custom_names=custom_names,
+                                sample=sample)
+                except KeyboardInterrupt:
+                    print("\nInterrupted."); sys.exit(1)
+                except Exception as e:
+                    print(f"[{sym}] ERROR {ymd}: {e}", file=sys.stderr)
+                    tm.inc("features_days_total", result="error")
+                    tm.event("features_error", symbol=sym, date=ymd, error=str(e))
+    finally:
+        if stats_root:
+            compact_all_stats(stats_root, symbols, sample["gran"] if sample else gran)
+        tm.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+data/features_all/binance-spot/{SYMBOL}/{GRAN}/YYYY-MM-DD.parquet  ->  학습용 윈도우 memmap
+data/windows/{NAME}/{SYMBOL}/ (X.npy, open_time.npy, starts.npy, meta.json)
+
+- 선택 컬럼만 하루씩 읽어 (rows, K) float32 memmap 에 기록 (features/window_store.py)
+- starts.npy: 시간 공백 / NaN 워밍업 행을 포함하지 않는 윈도우 시작 행
+- 학습 쪽: WindowDataset(path)[i] → (window, K) view, 복사/디코딩 없음
+
+사용 예)
+  python scripts/05_export_windows.py ^
+    --symbols BTCUSDT,ETHUSDT --start 2024-01-01 --end 2024-06-30 ^
+    --columns close,RSI_14,LOGRET_1,rv_300 --window 300 --name rsi_lr_300
+"""
+
+import os
+import sys
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from features.window_store import export_windows  # noqa: E402
+
+
+def read_columns(arg: str) -> list:
+    """콤마 구분 목록 또는 @파일(한 줄에 한 컬럼)"""
+    if arg.startswith("@"):
+        with open(arg[1:], "r", encoding="utf-8") as f:
+            return [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+    return [c.strip() for c in arg.split(",") if c.strip()]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export fixed-length feature windows to memory-mapped arrays")
+    ap.add_argument("--symbols", type=str, required=True, help="Comma-separated symbols")
+    ap.add_argument("--start", type=str, default="", help="YYYY-MM-DD inclusive (optional)")
+    ap.add_argument("--end",   type=str, default="", help="YYYY-MM-DD inclusive (optional)")
+    ap.add_argument("--columns", type=str, required=True, help="Comma-separated feature columns or @file")
+    ap.add_argument("--window", type=int, default=300, help="Lookback rows per window")
+    ap.add_argument("--stride", type=int, default=1, help="Keep window starts every N steps (absolute time)")
+    ap.add_argument("--step-ms", type=int, default=1000, help="Expected open_time spacing; other gaps break windows")
+    ap.add_argument("--dtype", type=str, default="float32", choices=["float32", "float64"])
+    ap.add_argument("--name", type=str, default="default", help="Export name (sub-folder under --out-root)")
+    ap.add_argument("--force", action="store_true", help="Overwrite an existing export")
+    ap.add_argument("--in-root",  type=str, default="data/features_all/binance-spot", help="피처 루트")
+    ap.add_argument("--out-root", type=str, default="data/windows", help="출력 루트")
+    ap.add_argument("--granularity", type=str, default="1s", help="하위 폴더명(예: 1s). 빈 문자열이면 생략")
+    args = ap.parse_args(argv)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    columns = read_columns(args.columns)
+    if not columns:
+        ap.error("--columns is empty")
+    gran = (args.granularity or "").strip()
+
+    rc = 0
+    for sym in symbols:
+        out_dir = os.path.join(args.out_root, args.name, sym)
+        if os.path.exists(os.path.join(out_dir, "meta.json")) and not args.force:
+            print(f"[{sym}] {out_dir} exists → skip")
+            continue
+        try:
+            meta = export_windows(args.in_root, sym, gran, columns, args.window, out_dir,
+                                  start=args.start, end=args.end, step_ms=args.step_ms,
+                                  stride=args.stride, dtype=args.dtype)
+        except Exception as e:
+            print(f"[{sym}] ERROR: {e}", file=sys.stderr)
+            rc = 1
+            continue
+        print(f"[{sym}] → {out_dir}  rows={meta['rows']}  K={len(columns)}  "
+              f"windows={meta['n_windows']}  bad_rows={meta['bad_rows']}  days={len(meta['files'])}")
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
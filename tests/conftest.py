@@ -0,0 +1,8 @@
+# tests/conftest.py
+"""프로젝트 루트를 import 경로에 추가 (scripts/ 와 같은 방식)"""
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
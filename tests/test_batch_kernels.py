@@ -0,0 +1,61 @@
+# tests/test_batch_kernels.py
+"""
+배치 2-D 커널 ↔ 고정된 pandas-ta 버전 일치 확인
+pandas-ta 를 올렸을 때 커널이 조용히 pandas-ta 경로로 빠지는(verify_kernels 탈락) 것을 잡기 위한 테스트
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pl = pytest.importorskip("polars")
+pytest.importorskip("pandas_ta")
+
+from features.strategies_all import full_ohlcv_specs  # noqa: E402
+from features.batch_bridge import KERNELS, kernel_for, verify_kernels, run_batched_on_polars  # noqa: E402
+from features.ta_bridge import run_pandasta_on_polars  # noqa: E402
+
+
+def synth_ohlcv(rows: int, seed: int, flat: float = 0.0) -> pl.DataFrame:
+    """랜덤워크 1s OHLCV. flat > 0 이면 그 비율의 행을 O=H=L=C(거래 없는 봉처럼)로"""
+    rng = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0, 2e-4, rows))), 2)
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 1e-4, rows)) * close
+    high, low = np.maximum(open_, close) + spread, np.minimum(open_, close) - spread
+    m = rng.random(rows) < flat
+    open_, high, low = np.where(m, close, open_), np.where(m, close, high), np.where(m, close, low)
+    return pl.DataFrame({
+        "open_time": 1_700_000_000_000 + np.arange(rows, dtype=np.int64) * 1000,
+        "open": open_, "high": high, "low": low, "close": close, "volume": rng.gamma(2.0, 5.0, rows),
+    })
+
+
+def _kernel_specs():
+    _, ta_list = full_ohlcv_specs()
+    return [s for s in ta_list if kernel_for(s) is not None]
+
+
+def test_full_spec_list_covers_every_kernel():
+    kinds = {s["kind"] for s in _kernel_specs()}
+    assert kinds == set(KERNELS)
+
+
+@pytest.mark.parametrize("flat", [0.0, 0.3])
+def test_every_kernel_matches_pandas_ta(flat):
+    specs = _kernel_specs()
+    ok = verify_kernels(synth_ohlcv(3000, seed=1, flat=flat), specs)
+    failed = [specs[i] for i in range(len(specs)) if i not in ok]
+    assert failed == []
+
+
+def test_batched_equals_per_symbol():
+    specs = _kernel_specs()
+    frames = {"A": synth_ohlcv(1500, seed=2), "B": synth_ohlcv(1500, seed=3),
+              "C": synth_ohlcv(1500, seed=4)[5:]}   # 시작 시각이 다른 심볼 → 별도 묶음
+    got = run_batched_on_polars(frames, specs)
+    for s, df in frames.items():
+        exp = run_pandasta_on_polars(df, ta_list=specs)
+        assert got[s].columns == exp.columns
+        for c in exp.columns:
+            a = exp[c].cast(pl.Float64).to_numpy()
+            b = got[s][c].cast(pl.Float64).to_numpy()
+            assert np.allclose(a, b, rtol=1e-9, atol=1e-12, equal_nan=True), (s, c)
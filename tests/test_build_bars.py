@@ -0,0 +1,93 @@
+# tests/test_build_bars.py
+"""정보 바: 일자 분할 + 이월(메모리 / 결과 파일 상태 복원) = 이어 붙인 입력에서 한 번에 만든 바"""
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pl = pytest.importorskip("polars")
+pytest.importorskip("pyarrow")
+
+from polars.testing import assert_frame_equal  # noqa: E402
+
+from quant_pipeline.cli import load_script  # noqa: E402
+
+DAY0_MS = 1_727_740_800_000      # 2024-10-01 00:00 UTC
+DAYS = ["2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04"]
+STEP_S = 4                       # 4초마다 1행(하루 21600행) — 바 경계 계산엔 충분
+
+
+@pytest.fixture(scope="module")
+def bars_mod():
+    mod = load_script("01_3_build_bars.py")
+    mod._load_heavy()
+    return mod
+
+
+def synth_day(k: int, rng) -> pl.DataFrame:
+    n = 86_400 // STEP_S
+    t = DAY0_MS + k * 86_400_000 + np.arange(n, dtype=np.int64) * STEP_S * 1000
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    vol = rng.gamma(2.0, 5.0, n)
+    vol[rng.random(n) < 0.1] = 0.0            # 거래 없는 초
+    trades = rng.poisson(3, n).astype(np.int64)
+    return pl.DataFrame({
+        "open_time": t, "open": close, "high": close * 1.001, "low": close * 0.999, "close": close,
+        "volume": vol, "close_time": t + 999, "quote_volume": vol * close, "num_trades": trades,
+        "taker_buy_base": vol * 0.5, "taker_buy_quote": vol * close * 0.5,
+        "exchange": "binance-spot", "symbol": "T",
+    })
+
+
+@pytest.fixture(scope="module")
+def days():
+    rng = np.random.default_rng(11)
+    return [synth_day(k, rng) for k in range(len(DAYS))]
+
+
+# 임계값: 하루 수십 개 바 / 하루 합계보다 커서 한 바가 여러 날에 걸치는 경우
+CASES = [("volume", 5_000.0), ("volume", 400_000.0), ("tick", 2_000.0)]
+
+
+@pytest.mark.parametrize("kind,threshold", CASES)
+def test_daily_carry_equals_concatenated(bars_mod, days, kind, threshold):
+    metric = bars_mod.BAR_METRICS[kind]
+    whole, whole_carry, whole_off = bars_mod.build_bars(pl.concat(days), metric, threshold, 0.0)
+
+    out, carry, offset = [], None, 0.0
+    for df_day in days:
+        df = pl.concat([carry, df_day]) if carry is not None and carry.height else df_day
+        bars, carry, offset = bars_mod.build_bars(df, metric, threshold, offset)
+        out.append(bars)
+    assert whole.height > 0
+    assert_frame_equal(pl.concat(out), whole)
+    assert_frame_equal(carry, whole_carry)
+    # 한 번에 만든 쪽은 전체 누적합 위에서 빼므로 반올림 오차가 누적량 규모에 비례
+    total = float(pl.concat(days)[metric].sum())
+    assert offset == pytest.approx(whole_off, abs=1e-12 * total)
+
+
+@pytest.mark.parametrize("kind,threshold", CASES)
+def test_restart_from_file_state_equals_single_run(bars_mod, days, tmp_path, kind, threshold):
+    in_root = str(tmp_path / "in")
+    for d, df in zip(DAYS, days):
+        os.makedirs(os.path.join(in_root, "T", "1s"), exist_ok=True)
+        df.write_parquet(os.path.join(in_root, "T", "1s", f"{d}.parquet"))
+
+    def run(out_root, start, end):
+        bars_mod.main(["--symbols", "T", "--kind", kind, "--threshold", str(threshold),
+                       "--start", start, "--end", end, "--granularity", "bars",
+                       "--in-root", in_root, "--out-root", out_root])
+
+    # 한 번에 / 날짜를 나눠 여러 번 실행(두 번째부터는 직전 결과 파일 상태에서 이월 복원)
+    one, split = str(tmp_path / "one"), str(tmp_path / "split")
+    run(one, DAYS[0], DAYS[-1])
+    run(split, DAYS[0], DAYS[1])
+    run(split, DAYS[2], DAYS[2])
+    run(split, DAYS[3], DAYS[3])
+
+    metric = bars_mod.BAR_METRICS[kind]
+    whole, _, _ = bars_mod.build_bars(pl.concat(days), metric, threshold, 0.0)
+    read = lambda root: pl.concat([pl.read_parquet(bars_mod.day_path(root, "T", "bars", d)) for d in DAYS])
+    assert_frame_equal(read(one), whole)
+    assert_frame_equal(read(split), whole)
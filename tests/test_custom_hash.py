@@ -0,0 +1,20 @@
+# tests/test_custom_hash.py
+"""커스텀 피처 구현 해시: 선택된 피처의 구현/버전 변경만 반영"""
+import pytest
+
+pytest.importorskip("polars")
+
+from features import custom  # noqa: E402
+
+
+def test_impl_hash_tracks_only_selected_features(monkeypatch):
+    before_rv, before_vpin = custom.impl_hash(["rv"]), custom.impl_hash(["vpin"])
+    monkeypatch.setitem(custom.VERSIONS, "vpin", custom.VERSIONS["vpin"] + 1)
+    monkeypatch.setattr(custom, "_IMPL", {})
+    assert custom.impl_hash(["rv"]) == before_rv
+    assert custom.impl_hash(["vpin"]) != before_vpin
+
+
+def test_helpers_are_part_of_the_hash():
+    refs = {f.__name__ for f in custom._referenced_functions(custom.REGISTRY["kyle_lambda"][0])}
+    assert {"_r1", "_signed_quote"} <= refs
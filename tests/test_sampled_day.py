@@ -0,0 +1,39 @@
+# tests/test_sampled_day.py
+"""샘플 모드: 하루 샘플 수 (자정 샘플 = 전날 마지막 바 포함) 확인"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pl = pytest.importorskip("polars")
+pytest.importorskip("pandas_ta")
+
+from quant_pipeline.cli import load_script  # noqa: E402
+
+DAY_MS = 86_400_000
+
+
+def two_days_1s(ymd0_ms: int) -> pl.DataFrame:
+    rows = 2 * 86_400
+    rng = np.random.default_rng(0)
+    t = ymd0_ms + np.arange(rows, dtype=np.int64) * 1000
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 1e-4, rows)))
+    return pl.DataFrame({
+        "open_time": t, "open": close, "high": close * 1.0001, "low": close * 0.9999, "close": close,
+        "volume": rng.gamma(2.0, 5.0, rows), "close_time": t + 999,
+    })
+
+
+@pytest.mark.parametrize("stride_s", [60, 3600])
+def test_stride_samples_per_day(stride_s):
+    mod = load_script("02_make_features_all.py")
+    mod._load_heavy()
+    lo, _ = mod.day_bounds_ms("2024-10-02")
+    df_in = two_days_1s(lo - DAY_MS)   # 전날(워밍업) + 당일
+    sample = {"stride_ms": stride_s * 1000, "times": None, "gran": "1s_s", "window_ok": None}
+    df_feat, _ = mod.compute_features_sampled(df_in, "2024-10-02", "T", [{"kind": "sma", "length": 10}],
+                                              False, None, sample)
+    df_day = mod.slice_to_day(df_feat, "2024-10-02")
+    assert df_day.height == 86_400 // stride_s
+    st = df_day["sample_time"].to_numpy()
+    assert st[0] == lo and np.all(np.diff(st) == stride_s * 1000)
+    # 자정 샘플은 그 시각에 이미 마감된 전날 마지막 바
+    assert df_day["close_time"][0] == lo - 1
@@ -0,0 +1,64 @@
+# tests/test_stats_store.py
+"""통계 저장소: 일자 요약 병합(Chan) = 전체 단일 계산, 분위수 스케치 허용오차"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pl = pytest.importorskip("polars")
+
+from features import stats_store  # noqa: E402
+
+DAYS = ["2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04"]
+
+
+def synth_days(rows: int = 20_000) -> dict:
+    """일자마다 분포(평균/스케일/결측)가 다른 피처 두 개"""
+    rng = np.random.default_rng(7)
+    out = {}
+    for i, d in enumerate(DAYS):
+        a = rng.normal(loc=i * 0.5, scale=1.0 + i, size=rows)
+        b = rng.exponential(scale=2.0 + i, size=rows)
+        a[rng.random(rows) < 0.05 * i] = np.nan
+        b[:10 * i] = np.inf  # 비유한값도 결측으로 집계
+        out[d] = pl.DataFrame({"open_time": np.arange(rows, dtype=np.int64), "a": a, "b": b})
+    return out
+
+
+@pytest.fixture(scope="module")
+def merged(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp("stats"))
+    days = synth_days()
+    for d, df in days.items():
+        stats_store.write_day_stats(root, "T", "1s", d, df)
+    # 앞 이틀은 병합 파일, 뒤 이틀은 일자 파일 → 두 경로를 함께 읽음
+    stats_store.compact_stats(root, "T", "1s")
+    for d in DAYS[2:]:
+        stats_store.write_day_stats(root, "T", "1s", d, days[d])
+    out = stats_store.query_stats(root, ["T"], start=DAYS[0], end=DAYS[-1],
+                                  quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99))
+    return days, out
+
+
+@pytest.mark.parametrize("col", ["a", "b"])
+def test_merged_moments_equal_single_pass(merged, col):
+    days, out = merged
+    x = np.concatenate([df[col].to_numpy() for df in days.values()])
+    v = x[np.isfinite(x)]
+    row = out.filter(pl.col("column") == col).row(0, named=True)
+    assert row["count"] == v.size
+    assert row["null_count"] == x.size - v.size
+    assert row["mean"] == pytest.approx(v.mean(), rel=1e-12, abs=1e-12)
+    assert row["std"] == pytest.approx(v.std(ddof=1), rel=1e-12)
+    assert row["min"] == v.min() and row["max"] == v.max()
+
+
+@pytest.mark.parametrize("col", ["a", "b"])
+def test_sketch_quantiles_within_tolerance(merged, col):
+    days, out = merged
+    x = np.concatenate([df[col].to_numpy() for df in days.values()])
+    v = x[np.isfinite(x)]
+    row = out.filter(pl.col("column") == col).row(0, named=True)
+    tol = 1.0 / (stats_store.SKETCH_POINTS - 1)   # 스케치 격자 한 칸
+    for p in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+        # 값 오차 대신 순위 오차로 판정(분포 스케일과 무관)
+        rank = np.mean(v <= row[f"q{p:g}"])
+        assert abs(rank - p) < tol, (p, rank)
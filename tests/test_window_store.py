@@ -0,0 +1,108 @@
+# tests/test_window_store.py
+"""윈도우 저장소: 일자 경계에서 유효 시작 행 / 윈도우 shape / 내용"""
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pl = pytest.importorskip("polars")
+pytest.importorskip("pyarrow")
+
+from features import window_store  # noqa: E402
+from quant_pipeline.cli import load_script  # noqa: E402
+
+STEP_MS = 60_000                 # 1분 격자 → 하루 1440행
+DAY_ROWS = 86_400_000 // STEP_MS
+DAY0_MS = 1_727_740_800_000      # 2024-10-01 00:00 UTC
+DAYS = ["2024-10-01", "2024-10-02", "2024-10-03"]
+WINDOW = 30
+COLUMNS = ["a", "b"]
+
+
+def write_days(root: str) -> pl.DataFrame:
+    """
+    1일차: 앞 5행 NaN(워밍업), 2일차: 중간 1행 inf, 3일차: 앞 10분 결측(일자 경계의 시간 공백)
+    반환: 세 파일을 이어 붙인 DF (기대값 계산용)
+    """
+    rng = np.random.default_rng(3)
+    frames = []
+    for k, d in enumerate(DAYS):
+        t = DAY0_MS + k * 86_400_000 + np.arange(DAY_ROWS, dtype=np.int64) * STEP_MS
+        a, b = rng.normal(size=DAY_ROWS), rng.normal(size=DAY_ROWS)
+        if k == 0:
+            a[:5] = np.nan
+        if k == 1:
+            b[700] = np.inf
+        df = pl.DataFrame({"open_time": t, "a": a, "b": b})
+        if k == 2:
+            df = df.slice(10)
+        os.makedirs(os.path.join(root, "T", "1m"), exist_ok=True)
+        df.write_parquet(os.path.join(root, "T", "1m", f"{d}.parquet"))
+        frames.append(df)
+    return pl.concat(frames)
+
+
+def brute_starts(df: pl.DataFrame, window: int, stride: int = 1) -> np.ndarray:
+    t = df["open_time"].to_numpy()
+    x = df.select(COLUMNS).to_numpy().astype(np.float32)
+    ok = []
+    for s in range(len(t) - window + 1):
+        if not np.isfinite(x[s:s + window]).all():
+            continue
+        if np.any(np.diff(t[s:s + window]) != STEP_MS):
+            continue
+        if (t[s] // STEP_MS) % stride:
+            continue
+        ok.append(s)
+    return np.asarray(ok, dtype=np.int64)
+
+
+@pytest.fixture(scope="module")
+def feats(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp("features"))
+    return root, write_days(root)
+
+
+@pytest.mark.parametrize("stride", [1, 7])
+def test_export_starts_and_shapes_across_days(feats, tmp_path, stride):
+    root, df = feats
+    mod = load_script("05_export_windows.py")
+    rc = mod.main(["--symbols", "T", "--columns", ",".join(COLUMNS), "--window", str(WINDOW),
+                   "--stride", str(stride), "--step-ms", str(STEP_MS), "--name", "w",
+                   "--in-root", root, "--out-root", str(tmp_path), "--granularity", "1m"])
+    assert rc == 0
+    ds = window_store.WindowDataset(os.path.join(str(tmp_path), "w", "T"))
+
+    expect = brute_starts(df, WINDOW, stride)
+    assert np.array_equal(ds.starts, expect)
+    assert ds.meta["rows"] == df.height and ds.x.shape == (df.height, len(COLUMNS))
+
+    t = df["open_time"].to_numpy()
+    # 1일차 워밍업 NaN 직후가 첫 시작, 2→3일차 경계의 공백을 걸치는 윈도우는 없음
+    if stride == 1:
+        assert ds.starts[0] == 5
+        gap = 2 * DAY_ROWS       # 3일차 첫 행(공백 뒤)
+        assert not np.any((ds.starts < gap) & (ds.starts + WINDOW > gap))
+        assert gap in ds.starts
+        # 1→2일차 경계는 연속 → 경계를 걸치는 윈도우가 모두 있음
+        cross = np.arange(DAY_ROWS - WINDOW + 1, DAY_ROWS)
+        assert np.isin(cross, ds.starts).all()
+
+    x = df.select(COLUMNS).to_numpy().astype(np.float32)
+    for i in (0, len(ds) // 2, len(ds) - 1):
+        s = int(ds.starts[i])
+        assert ds[i].shape == (WINDOW, len(COLUMNS))
+        assert np.array_equal(ds[i], x[s:s + WINDOW])
+        assert ds.start_time(i) == t[s] and ds.end_time(i) == t[s + WINDOW - 1]
+    assert ds.batch([0, len(ds) - 1]).shape == (2, WINDOW, len(COLUMNS))
+
+
+def test_chunked_starts_match_single_chunk(feats):
+    _, df = feats
+    t = df["open_time"].to_numpy()
+    bad = ~np.isfinite(df.select(COLUMNS).to_numpy()).all(axis=1)
+    whole = np.concatenate(list(window_store._iter_valid_starts(bad, t, WINDOW, STEP_MS, chunk=len(t))))
+    # 청크 경계가 일자 경계/윈도우 안쪽에 걸리도록 작은 청크
+    for chunk in (17, DAY_ROWS, DAY_ROWS - 3):
+        parts = list(window_store._iter_valid_starts(bad, t, WINDOW, STEP_MS, chunk=chunk))
+        assert np.array_equal(np.concatenate(parts), whole)